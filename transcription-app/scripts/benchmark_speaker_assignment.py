@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'attribution des locuteurs (assign_speakers_to_transcription)
+sur des données synthétiques.
+
+Usage:
+    python scripts/benchmark_speaker_assignment.py [options]
+
+Options:
+    --segments N     Nombre de tours de parole et de segments (défaut: 100000)
+    --speakers N     Nombre de locuteurs (défaut: 4)
+    --linear-sample  Segments mesurés avec le parcours linéaire, extrapolé (défaut: 2000)
+
+Compare l'index numpy de DiarizationResult au parcours linéaire historique
+(O(N·M)). Le parcours linéaire est mesuré sur un échantillon puis extrapolé:
+à 100 000 segments il dépasse une heure.
+
+Example:
+    python scripts/benchmark_speaker_assignment.py --segments 100000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.core.diarizer import (  # noqa: E402
+    DiarizationResult,
+    SpeakerSegment,
+    assign_speakers_to_transcription,
+)
+from src.core.transcriber import TranscriptionResult, TranscriptionSegment  # noqa: E402
+
+
+def synthetic_meeting(num_segments: int, num_speakers: int) -> tuple[TranscriptionResult, DiarizationResult]:
+    """Réunion synthétique: tours de parole successifs et segments Whisper décalés."""
+    rng = np.random.default_rng(0)
+    bounds = np.cumsum(rng.uniform(0.5, 8.0, num_segments + 1))
+    speakers = rng.integers(0, num_speakers, num_segments)
+
+    diarization = DiarizationResult(
+        segments=[
+            SpeakerSegment(start=bounds[i], end=bounds[i + 1], speaker=f"SPEAKER_{speakers[i]:02d}")
+            for i in range(num_segments)
+        ],
+        num_speakers=num_speakers,
+    )
+
+    shift = rng.uniform(-1.0, 1.0, num_segments)
+    transcription = TranscriptionResult(
+        segments=[
+            TranscriptionSegment(start=max(0.0, bounds[i] + shift[i]), end=bounds[i + 1] + shift[i], text="")
+            for i in range(num_segments)
+        ],
+        language="fr",
+        language_probability=1.0,
+        duration=float(bounds[-1]),
+    )
+    return transcription, diarization
+
+
+def linear_speaker_for_range(diarization: DiarizationResult, start: float, end: float) -> str | None:
+    """Ancien algorithme: parcours de tous les tours de parole."""
+    overlaps: dict[str, float] = {}
+    for seg in diarization.segments:
+        overlap = min(end, seg.end) - max(start, seg.start)
+        if overlap > 0:
+            overlaps[seg.speaker] = overlaps.get(seg.speaker, 0) + overlap
+    if not overlaps:
+        return None
+    return max(overlaps.items(), key=lambda x: x[1])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'attribution des locuteurs")
+    parser.add_argument("--segments", type=int, default=100_000)
+    parser.add_argument("--speakers", type=int, default=4)
+    parser.add_argument("--linear-sample", type=int, default=2000)
+    args = parser.parse_args()
+
+    transcription, diarization = synthetic_meeting(args.segments, args.speakers)
+    print(f"\n{args.segments} tours de parole, {args.segments} segments, {args.speakers} locuteurs\n")
+
+    start = time.perf_counter()
+    assign_speakers_to_transcription(transcription, diarization)
+    indexed = time.perf_counter() - start
+
+    sample = transcription.segments[:args.linear_sample]
+    start = time.perf_counter()
+    linear_speakers = [linear_speaker_for_range(diarization, s.start, s.end) for s in sample]
+    linear = (time.perf_counter() - start) * args.segments / max(1, len(sample))
+
+    mismatches = sum(
+        1 for seg, speaker in zip(sample, linear_speakers, strict=True)
+        if speaker is not None and seg.speaker != speaker
+    )
+
+    print(f"{'Méthode':<30}{'Temps (s)':>12}")
+    print(f"{'Index numpy':<30}{indexed:>12.3f}")
+    print(f"{'Parcours linéaire (extrapolé)':<30}{linear:>12.1f}")
+    print(f"\nGain: {linear / indexed:.0f}x, écarts sur l'échantillon: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
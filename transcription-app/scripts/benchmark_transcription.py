@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark du facteur temps réel (RTF) de la transcription: mode séquentiel
+contre mode batched (BatchedInferencePipeline).
+
+Usage:
+    python scripts/benchmark_transcription.py AUDIO [options]
+
+Options:
+    --model NAME          Modèle Whisper (défaut: config.yaml)
+    --batch-sizes 4,8,16  Tailles de batch à mesurer en mode batched
+    --language CODE       Langue forcée (défaut: config.yaml)
+    --runs N              Nombre de mesures par configuration (défaut: 1)
+
+Le RTF est le temps de calcul divisé par la durée de l'audio: 0.25 signifie
+qu'une heure d'enregistrement est transcrite en 15 minutes. Le chargement du
+modèle et le décodage audio sont exclus de la mesure.
+
+Example:
+    python scripts/benchmark_transcription.py reunion.m4a --batch-sizes 4,8,16
+"""
+import argparse
+import logging
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.core.audio_processor import AudioProcessor  # noqa: E402
+from src.core.transcriber import Transcriber  # noqa: E402
+from src.utils.config import get_config  # noqa: E402
+
+
+def measure(transcriber: Transcriber, audio, language: str | None, runs: int) -> tuple[float, int]:
+    """Retourne (meilleur temps en secondes, nombre de segments)."""
+    best = float("inf")
+    segments = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = transcriber.transcribe(audio, language=language)
+        best = min(best, time.perf_counter() - start)
+        segments = len(result.segments)
+    return best, segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RTF séquentiel vs batched")
+    parser.add_argument("audio", type=Path)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--batch-sizes", default="4,8,16")
+    parser.add_argument("--language", default=None)
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    base_config = get_config().transcription
+    audio = AudioProcessor().decode(args.audio)
+    batch_sizes = [int(b) for b in args.batch_sizes.split(",") if b]
+
+    configs = [("sequential", replace(base_config, mode="sequential"))]
+    configs += [
+        (f"batched (batch_size={b})", replace(base_config, mode="batched", batch_size=b))
+        for b in batch_sizes
+    ]
+
+    transcriber = Transcriber(model_name=args.model, config=configs[0][1])
+    transcriber.load_model()
+
+    print(f"\nFichier: {args.audio.name} ({audio.duration:.1f}s)")
+    print(f"Modèle: {transcriber.model_name} ({base_config.compute_type}), "
+          f"{transcriber.cpu_threads} threads\n")
+    print(f"{'Mode':<28}{'Temps (s)':>12}{'RTF':>10}{'Segments':>10}{'Gain':>8}")
+
+    reference = None
+    for label, config in configs:
+        transcriber.config = config
+        elapsed, segments = measure(transcriber, audio, args.language, args.runs)
+        reference = reference or elapsed
+        print(
+            f"{label:<28}{elapsed:>12.1f}{elapsed / audio.duration:>10.3f}"
+            f"{segments:>10}{reference / elapsed:>7.2f}x"
+        )
+
+    transcriber.unload_model()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
 """
 Module de traitement audio: enregistrement, conversion, validation.
 """
+import json
 import logging
 import os
 import queue
+import subprocess
 import sys
 import threading
-from collections.abc import Callable
-from dataclasses import dataclass
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import numpy as np
@@ -22,6 +24,13 @@ from .exceptions import AudioCorruptedError, AudioDependencyError, AudioFormatEr
 
 logger = logging.getLogger(__name__)
 
+# Évite l'ouverture d'une console à chaque appel FFmpeg/ffprobe sous Windows
+SUBPROCESS_FLAGS = subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0
+
+# Cache des métadonnées audio: (chemin, mtime_ns, taille) -> infos
+_audio_info_cache: dict[tuple[str, int, int], dict] = {}
+_audio_info_cache_lock = threading.Lock()
+
 
 @dataclass
 class AudioDevice:
@@ -33,6 +42,48 @@ class AudioDevice:
     is_input: bool
 
 
+@dataclass
+class DecodedAudio:
+    """
+    Audio décodé une seule fois au format Whisper (PCM 16 kHz mono int16).
+
+    Produit par AudioProcessor.decode et partagé par toutes les étapes
+    d'un même job (transcription, diarization, batch) pour éviter de
+    relancer FFmpeg sur le fichier source à chaque étape.
+    """
+    path: Path
+    pcm: np.ndarray
+    sample_rate: int = 16000
+    info: dict = field(default_factory=dict)
+
+    @property
+    def num_samples(self) -> int:
+        return len(self.pcm)
+
+    @property
+    def duration(self) -> float:
+        """Durée en secondes."""
+        return self.num_samples / self.sample_rate
+
+    def slice(self, start: int, end: int) -> "DecodedAudio":
+        """Sous-partie [start:end] (en échantillons), sans copie du PCM."""
+        return DecodedAudio(
+            path=self.path,
+            pcm=self.pcm[start:end],
+            sample_rate=self.sample_rate,
+            info=self.info,
+        )
+
+    def to_float32(self, start: int = 0, end: int | None = None) -> np.ndarray:
+        """Retourne les échantillons [start:end] en float32 normalisé [-1, 1]."""
+        return self.pcm[start:end].astype(np.float32) / 32768.0
+
+    def write_wav(self, output_path: Path) -> Path:
+        """Écrit le PCM dans un fichier WAV 16-bit sans redécoder la source."""
+        sf.write(str(output_path), self.pcm, self.sample_rate, subtype="PCM_16")
+        return output_path
+
+
 class AudioRecorder:
     """
     Enregistreur audio pour capturer les réunions.
@@ -223,10 +274,13 @@ class AudioProcessor:
 
     SUPPORTED_FORMATS = {'.wav', '.mp3', '.m4a', '.flac', '.ogg', '.wma', '.aac'}
     WHISPER_SAMPLE_RATE = 16000
+    STREAM_CHUNK_SECONDS = 30
 
     def __init__(self, config: AudioConfig | None = None):
         self.config = config or get_config().audio
         self._ffmpeg_checked = False
+        self._ffmpeg_path: str | None = None
+        self._ffprobe_path: str | None = None
 
     def _candidate_ffmpeg_dirs(self) -> list[Path]:
         """Liste les dossiers potentiels contenant FFmpeg."""
@@ -277,6 +331,8 @@ class AudioProcessor:
         if converter and ffprobe:
             AudioSegment.converter = converter
             AudioSegment.ffprobe = ffprobe
+            self._ffmpeg_path = converter
+            self._ffprobe_path = ffprobe
             self._ffmpeg_checked = True
             return
 
@@ -307,23 +363,213 @@ class AudioProcessor:
         """
         Retourne les informations sur un fichier audio.
 
+        Lit uniquement les métadonnées du conteneur via ffprobe (quasi
+        instantané, même pour plusieurs heures d'audio). Le résultat est mis
+        en cache par (chemin, mtime, taille). Un décodage complet n'est fait
+        qu'en dernier recours, si les métadonnées sont absentes ou corrompues.
+
         Returns:
             dict avec duration, sample_rate, channels, format
         """
         try:
+            stat = file_path.stat()
+            key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+            with _audio_info_cache_lock:
+                cached = _audio_info_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+
             self._ensure_ffmpeg()
-            audio = AudioSegment.from_file(str(file_path))
-            return {
-                "duration": len(audio) / 1000.0,  # secondes
-                "sample_rate": audio.frame_rate,
-                "channels": audio.channels,
-                "format": file_path.suffix.lower().strip('.'),
-                "size_mb": file_path.stat().st_size / (1024 * 1024),
-            }
+            info = self._probe_audio_info(file_path)
+            if info is None:
+                logger.warning(f"Métadonnées illisibles, décodage complet: {file_path.name}")
+                info = self._decode_audio_info(file_path)
+
+            info["format"] = file_path.suffix.lower().strip('.')
+            info["size_mb"] = stat.st_size / (1024 * 1024)
+
+            with _audio_info_cache_lock:
+                _audio_info_cache[key] = info
+            return dict(info)
         except Exception as e:
             logger.error(f"Erreur lecture info audio {file_path}: {e}")
             raise
 
+    def _probe_audio_info(self, file_path: Path) -> dict | None:
+        """Lit durée, sample rate et canaux depuis l'en-tête via ffprobe (JSON)."""
+        command = [
+            self._ffprobe_path or "ffprobe",
+            "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "format=duration:stream=duration,sample_rate,channels",
+            "-of", "json",
+            str(file_path),
+        ]
+        try:
+            completed = subprocess.run(
+                command,
+                capture_output=True,
+                timeout=30,
+                check=False,
+                creationflags=SUBPROCESS_FLAGS,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"ffprobe indisponible pour {file_path.name}: {e}")
+            return None
+
+        if completed.returncode != 0:
+            return None
+
+        try:
+            data = json.loads(completed.stdout or b"{}")
+            stream = (data.get("streams") or [{}])[0]
+            duration = float(
+                data.get("format", {}).get("duration") or stream.get("duration") or 0
+            )
+            sample_rate = int(stream.get("sample_rate") or 0)
+            channels = int(stream.get("channels") or 0)
+        except (ValueError, TypeError, IndexError):
+            return None
+
+        if duration <= 0 or sample_rate <= 0 or channels <= 0:
+            return None
+
+        return {
+            "duration": duration,
+            "sample_rate": sample_rate,
+            "channels": channels,
+        }
+
+    def _decode_audio_info(self, file_path: Path) -> dict:
+        """Fallback: décode tout le fichier pour en déduire les infos."""
+        audio = AudioSegment.from_file(str(file_path))
+        return {
+            "duration": len(audio) / 1000.0,  # secondes
+            "sample_rate": audio.frame_rate,
+            "channels": audio.channels,
+        }
+
+    def iter_pcm_chunks(
+        self,
+        file_path: Path,
+        chunk_seconds: float | None = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        Décode en streaming via un pipe FFmpeg (s16le, mono, 16 kHz).
+
+        Les chunks ont une taille fixe (sauf le dernier) et partagent le même
+        buffer réutilisé: la mémoire reste constante quelle que soit la durée
+        du fichier. Copier un chunk (np.copy) pour le conserver au-delà de
+        l'itération suivante.
+
+        Args:
+            file_path: Fichier audio source
+            chunk_seconds: Durée de chaque chunk (défaut: STREAM_CHUNK_SECONDS)
+
+        Yields:
+            Vues int16 sur le buffer de décodage
+        """
+        self._ensure_ffmpeg()
+
+        chunk_samples = int((chunk_seconds or self.STREAM_CHUNK_SECONDS) * self.WHISPER_SAMPLE_RATE)
+        buffer = np.empty(chunk_samples, dtype=np.int16)
+        view = memoryview(buffer).cast("B")
+
+        command = [
+            self._ffmpeg_path or "ffmpeg",
+            "-nostdin",
+            "-v", "error",
+            "-i", str(file_path),
+            "-f", "s16le",
+            "-ac", "1",
+            "-ar", str(self.WHISPER_SAMPLE_RATE),
+            "pipe:1",
+        ]
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            creationflags=SUBPROCESS_FLAGS,
+        )
+
+        try:
+            while True:
+                filled = 0
+                while filled < len(view):
+                    read = process.stdout.readinto(view[filled:])
+                    if not read:
+                        break
+                    filled += read
+
+                samples = filled // 2
+                if samples:
+                    yield buffer[:samples]
+                if filled < len(view):
+                    break
+
+            process.stdout.close()
+            stderr = process.stderr.read().decode(errors="replace").strip()
+            if process.wait() != 0:
+                raise AudioCorruptedError(str(file_path), stderr)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+    def decode(self, file_path: Path, use_cache: bool = True) -> DecodedAudio:
+        """
+        Décode un fichier audio en PCM 16 kHz mono, une seule fois par job.
+
+        Fait aussi office de validation: un fichier illisible lève
+        AudioCorruptedError. Si le cache PCM est actif, le PCM est relu en
+        memmap depuis le disque (décodé au premier accès seulement). Sinon le
+        buffer est pré-alloué d'après la durée sondée, puis rempli chunk par
+        chunk depuis le pipe FFmpeg.
+
+        Args:
+            file_path: Fichier audio source
+            use_cache: Utiliser le cache PCM (si activé dans la config)
+
+        Returns:
+            DecodedAudio partageable entre transcription et diarization
+        """
+        if not self.is_supported(file_path):
+            raise AudioFormatError(str(file_path), file_path.suffix)
+
+        config = get_config()
+        if use_cache and config.performance.pcm_cache_max_mb > 0:
+            from .pcm_cache import PCMCache
+            cache = PCMCache(
+                cache_dir=config.paths.temp / "pcm_cache",
+                max_size_mb=config.performance.pcm_cache_max_mb,
+            )
+            return cache.get_or_decode(file_path, self)
+
+        info = self.validate_audio_file(file_path)
+
+        capacity = int(info["duration"] * self.WHISPER_SAMPLE_RATE) + self.WHISPER_SAMPLE_RATE
+        pcm = np.empty(capacity, dtype=np.int16)
+        size = 0
+
+        for chunk in self.iter_pcm_chunks(file_path):
+            if size + len(chunk) > len(pcm):
+                # Durée annoncée sous-estimée: agrandir le buffer
+                pcm = np.resize(pcm, max(size + len(chunk), len(pcm) * 2))
+            pcm[size:size + len(chunk)] = chunk
+            size += len(chunk)
+
+        pcm = pcm[:size]
+
+        logger.info(f"Audio décodé: {file_path.name} ({size / self.WHISPER_SAMPLE_RATE:.1f}s)")
+
+        return DecodedAudio(
+            path=file_path,
+            pcm=pcm,
+            sample_rate=self.WHISPER_SAMPLE_RATE,
+            info=info,
+        )
+
     def convert_for_whisper(
         self,
         input_path: Path,
@@ -333,6 +579,9 @@ class AudioProcessor:
         """
         Convertit un fichier audio au format optimal pour Whisper.
 
+        La conversion est faite en streaming: mémoire constante quelle que
+        soit la durée du fichier.
+
         Args:
             input_path: Fichier audio source
             output_path: Fichier de sortie (None = temp)
@@ -356,23 +605,21 @@ class AudioProcessor:
 
         logger.info(f"Conversion de {input_path} vers format Whisper...")
 
-        # Charger l'audio
-        audio = AudioSegment.from_file(str(input_path))
-
-        if progress_callback:
-            progress_callback("Conversion en cours...", 50.0)
-
-        # Convertir
-        audio = audio.set_frame_rate(self.WHISPER_SAMPLE_RATE)
-        audio = audio.set_channels(1)  # Mono
+        total_samples = self.get_audio_info(input_path)["duration"] * self.WHISPER_SAMPLE_RATE
+        written = 0
 
         # Exporter en WAV 16-bit
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        audio.export(
-            str(output_path),
-            format="wav",
-            parameters=["-acodec", "pcm_s16le"],
-        )
+        with sf.SoundFile(
+            str(output_path), mode="w",
+            samplerate=self.WHISPER_SAMPLE_RATE, channels=1, subtype="PCM_16",
+        ) as out:
+            for chunk in self.iter_pcm_chunks(input_path):
+                out.write(chunk)
+                written += len(chunk)
+                if progress_callback and total_samples:
+                    pct = 10.0 + 85.0 * min(written / total_samples, 1.0)
+                    progress_callback("Conversion en cours...", pct)
 
         if progress_callback:
             progress_callback("Conversion terminée", 100.0)
@@ -390,6 +637,9 @@ class AudioProcessor:
         Découpe un fichier audio en chunks pour traitement par morceaux.
         Utile pour les fichiers très longs et la gestion mémoire.
 
+        Les chunks sont écrits au format Whisper (WAV 16 kHz mono) au fil du
+        décodage streaming, sans charger le fichier complet en mémoire.
+
         Args:
             file_path: Fichier audio source
             chunk_minutes: Durée de chaque chunk en minutes
@@ -403,17 +653,34 @@ class AudioProcessor:
 
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        self._ensure_ffmpeg()
-        audio = AudioSegment.from_file(str(file_path))
-        chunk_ms = chunk_minutes * 60 * 1000
+        chunk_samples = int(chunk_minutes * 60 * self.WHISPER_SAMPLE_RATE)
+        chunks: list[Path] = []
+        current: sf.SoundFile | None = None
+        remaining = 0
 
-        chunks = []
-        for i, start in enumerate(range(0, len(audio), chunk_ms)):
-            chunk = audio[start:start + chunk_ms]
-            chunk_path = output_dir / f"{file_path.stem}_chunk_{i:03d}.wav"
-
-            chunk.export(str(chunk_path), format="wav")
-            chunks.append(chunk_path)
+        try:
+            for block in self.iter_pcm_chunks(file_path):
+                while len(block):
+                    if current is None:
+                        chunk_path = output_dir / f"{file_path.stem}_chunk_{len(chunks):03d}.wav"
+                        current = sf.SoundFile(
+                            str(chunk_path), mode="w",
+                            samplerate=self.WHISPER_SAMPLE_RATE, channels=1, subtype="PCM_16",
+                        )
+                        chunks.append(chunk_path)
+                        remaining = chunk_samples
+
+                    part = block[:remaining]
+                    current.write(part)
+                    remaining -= len(part)
+                    block = block[len(part):]
+
+                    if remaining == 0:
+                        current.close()
+                        current = None
+        finally:
+            if current is not None:
+                current.close()
 
         logger.info(f"Audio découpé en {len(chunks)} chunks de {chunk_minutes}min")
         return chunks
@@ -422,6 +689,9 @@ class AudioProcessor:
         """
         Nettoie les fichiers temporaires.
 
+        Les fichiers isolés (conversions, chunks) sont supprimés; le cache
+        PCM est ramené sous son budget par éviction LRU.
+
         Returns:
             Nombre de fichiers supprimés
         """
@@ -440,5 +710,12 @@ class AudioProcessor:
                 except Exception as e:
                     logger.warning(f"Impossible de supprimer {f}: {e}")
 
+        # Le cache PCM n'est pas vidé aveuglément: éviction LRU sous budget
+        from .pcm_cache import PCMCache
+        count += PCMCache(
+            cache_dir=temp_dir / "pcm_cache",
+            max_size_mb=get_config().performance.pcm_cache_max_mb,
+        ).evict()
+
         logger.info(f"Nettoyage: {count} fichiers temporaires supprimés")
         return count
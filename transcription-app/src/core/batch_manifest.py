@@ -0,0 +1,210 @@
+"""
+Manifeste persistant des traitements par lots (SQLite).
+
+Chaque batch nommé enregistre ses fichiers, ses options et, pour chaque
+fichier, le statut, l'empreinte du contenu, les paramètres effectifs, les
+temps et les sorties produites. Les mises à jour sont transactionnelles:
+après un crash ou un redémarrage, le batch reprend là où il s'était arrêté.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from ..utils.config import get_config
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = "batches.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    name TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    options TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    batch TEXT NOT NULL REFERENCES batches(name) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    input_hash TEXT,
+    params TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    started_at TEXT,
+    finished_at TEXT,
+    processing_time REAL,
+    outputs TEXT,
+    error TEXT,
+    PRIMARY KEY (batch, path)
+);
+"""
+
+
+class BatchManifest:
+    """
+    Manifeste d'un batch nommé.
+
+    Usage:
+        manifest = BatchManifest("nuit-2024-05-01")
+        manifest.open_batch(files, options)
+        if not manifest.is_done(path, input_hash, params):
+            manifest.mark_running(path)
+            ...
+            manifest.record(path, "completed", ...)
+    """
+
+    def __init__(self, name: str, db_path: Path | None = None):
+        self.name = name
+        self.db_path = db_path or get_config().paths.output / MANIFEST_FILENAME
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Mis à jour depuis le thread d'écriture du batch et le thread principal
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "BatchManifest":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().isoformat(timespec="seconds")
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return str(Path(path).resolve())
+
+    def exists(self) -> bool:
+        """Indique si le batch est déjà enregistré."""
+        row = self._conn.execute("SELECT 1 FROM batches WHERE name = ?", (self.name,)).fetchone()
+        return row is not None
+
+    def open_batch(self, files: list[Path], options: dict) -> None:
+        """
+        Crée le batch, ou ajoute les nouveaux fichiers à un batch existant
+        (les statuts déjà enregistrés sont conservés).
+        """
+        now = self._now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO batches (name, created_at, updated_at, options) VALUES (?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET updated_at = excluded.updated_at,
+                                                options = excluded.options
+                """,
+                (self.name, now, now, json.dumps(options, sort_keys=True)),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO items (batch, position, path) VALUES (?, ?, ?)",
+                [(self.name, i, self._key(f)) for i, f in enumerate(files)],
+            )
+
+    def load(self) -> tuple[list[Path], dict]:
+        """Fichiers (dans l'ordre d'origine) et options d'un batch enregistré."""
+        row = self._conn.execute("SELECT options FROM batches WHERE name = ?", (self.name,)).fetchone()
+        if row is None:
+            raise KeyError(f"Batch inconnu: {self.name}")
+        paths = self._conn.execute(
+            "SELECT path FROM items WHERE batch = ? ORDER BY position", (self.name,)
+        ).fetchall()
+        return [Path(p["path"]) for p in paths], json.loads(row["options"])
+
+    def get_item(self, path: Path) -> dict | None:
+        """État enregistré d'un fichier (None s'il n'appartient pas au batch)."""
+        row = self._conn.execute(
+            "SELECT * FROM items WHERE batch = ? AND path = ?", (self.name, self._key(path))
+        ).fetchone()
+        if row is None:
+            return None
+        item = dict(row)
+        item["params"] = json.loads(item["params"]) if item["params"] else None
+        item["outputs"] = json.loads(item["outputs"]) if item["outputs"] else []
+        return item
+
+    def is_done(self, path: Path, input_hash: str, params: dict) -> bool:
+        """
+        Un fichier est terminé s'il a réussi avec le même contenu, les mêmes
+        paramètres, et que ses sorties existent toujours.
+        """
+        item = self.get_item(path)
+        return (
+            item is not None
+            and item["status"] == "completed"
+            and item["input_hash"] == input_hash
+            and item["params"] == params
+            and all(Path(p).exists() for p in item["outputs"])
+        )
+
+    def mark_running(self, path: Path) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                UPDATE items SET status = 'running', started_at = ?, attempts = attempts + 1,
+                                 error = NULL
+                WHERE batch = ? AND path = ?
+                """,
+                (self._now(), self.name, self._key(path)),
+            )
+
+    def mark_pending(self, paths: list[Path]) -> None:
+        """Remet en attente des fichiers interrompus (annulation du batch)."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE items SET status = 'pending' WHERE batch = ? AND path = ?",
+                [(self.name, self._key(p)) for p in paths],
+            )
+
+    def record(
+        self,
+        path: Path,
+        status: str,
+        input_hash: str | None,
+        params: dict,
+        processing_time: float,
+        outputs: list[Path],
+        error: str | None = None,
+    ) -> None:
+        """Enregistre l'issue du traitement d'un fichier."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                UPDATE items SET status = ?, input_hash = ?, params = ?, finished_at = ?,
+                                 processing_time = ?, outputs = ?, error = ?
+                WHERE batch = ? AND path = ?
+                """,
+                (
+                    status,
+                    input_hash,
+                    json.dumps(params, sort_keys=True),
+                    self._now(),
+                    processing_time,
+                    json.dumps([str(p) for p in outputs]),
+                    error,
+                    self.name,
+                    self._key(path),
+                ),
+            )
+            self._conn.execute(
+                "UPDATE batches SET updated_at = ? WHERE name = ?", (self._now(), self.name)
+            )
+
+    def status_counts(self) -> dict[str, int]:
+        """Nombre de fichiers par statut."""
+        rows = self._conn.execute(
+            "SELECT status, COUNT(*) AS n FROM items WHERE batch = ? GROUP BY status", (self.name,)
+        ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
@@ -1,21 +1,57 @@
 """
 Module de traitement par lots (batch processing).
-Permet de transcrire plusieurs fichiers audio en séquence.
+Permet de transcrire plusieurs fichiers audio en séquence, ou en parallèle
+dans un pool de processus (chacun avec ses propres modèles).
 """
+import heapq
+import itertools
 import logging
-from collections.abc import Callable
-from dataclasses import dataclass
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 
-from .audio_processor import AudioProcessor
-from .diarizer import Diarizer, assign_speakers_to_transcription
+import numpy as np
+
+from ..utils.config import DiarizationConfig, TranscriptionConfig, get_config
+from ..utils.memory import plan_worker_count
+from .audio_processor import AudioProcessor, DecodedAudio
+from .batch_manifest import BatchManifest
+from .cancellation import CancellationToken
+from .chunking import AudioChunk, chunk_payload, load_chunk_payload, plan_chunks, stitch_segments
+from .diarizer import DiarizationResult, Diarizer, assign_speakers_to_transcription
 from .exceptions import AudioFileNotFoundError
-from .transcriber import Transcriber, TranscriptionResult
+from .memory_planner import MemoryPlanner
+from .model_host import HostedDiarizer, HostedTranscriber, hosted_client
+from .output_index import OutputIndex, output_key
+from .pcm_cache import content_hash, full_content_hash
+from .pipeline import concurrent_thread_split, run_transcription_and_diarization
+from .result_store import RESULTS_DIRNAME, ResultRef, ResultStore
+from .transcriber import LANGUAGE_DETECTION_SECONDS, Transcriber, TranscriptionResult
 
 logger = logging.getLogger(__name__)
 
+# Intervalle de relève des démarrages signalés par les processus du pool
+POLL_SECONDS = 0.2
+# Fichiers longs décodés et découpés en même temps (mode parallèle)
+SPLIT_FILES_IN_FLIGHT = 2
+
 
 class BatchItemStatus(Enum):
     """Statut d'un élément du batch."""
@@ -34,11 +70,25 @@ class BatchItem:
     result: TranscriptionResult | None = None
     error_message: str | None = None
     processing_time: float = 0.0
+    output_paths: list[Path] = field(default_factory=list)
+    duration: float = 0.0  # Durée audio sondée (ordonnancement, ETA)
+    input_hash: str | None = None  # Empreinte du contenu (reprise, doublons)
+    full_hash: str | None = None  # Empreinte complète, calculée à la demande
+    # Résultat déchargé sur disque: seul un résumé reste en mémoire
+    result_ref: ResultRef | None = None
+    language: str | None = None
+    segment_count: int = 0
 
     @property
     def filename(self) -> str:
         return self.path.name
 
+    def load_result(self) -> TranscriptionResult | None:
+        """Résultat complet, relu depuis le disque s'il y a été déchargé."""
+        if self.result is not None:
+            return self.result
+        return self.result_ref.load() if self.result_ref else None
+
 
 @dataclass
 class BatchResult:
@@ -47,6 +97,15 @@ class BatchResult:
     total_time: float = 0.0
     started_at: datetime | None = None
     finished_at: datetime | None = None
+    results_path: Path | None = None  # Fichier des résultats complets (ResultStore)
+
+    def discard_results(self) -> None:
+        """Supprime les résultats complets déchargés sur disque."""
+        if self.results_path is not None:
+            self.results_path.unlink(missing_ok=True)
+            self.results_path = None
+        for item in self.items:
+            item.result_ref = None
 
     @property
     def total_count(self) -> int:
@@ -67,6 +126,58 @@ class BatchResult:
         return self.completed_count / self.total_count * 100
 
 
+@dataclass
+class BatchItemEvent:
+    """Fin de traitement d'un fichier, notifiée pendant le batch."""
+    index: int  # Position dans la liste du batch
+    path: Path
+    status: BatchItemStatus
+    processing_time: float
+    duration: float  # Durée audio (0 si inconnue)
+    output_paths: list[Path]
+    error_message: str | None = None
+
+    @property
+    def real_time_factor(self) -> float | None:
+        """Temps de calcul / durée audio (None si durée inconnue ou rien calculé)."""
+        if self.duration <= 0 or self.status != BatchItemStatus.COMPLETED:
+            return None
+        return self.processing_time / self.duration
+
+
+@dataclass
+class BatchProgress:
+    """
+    Avancement du batch en secondes d'audio.
+
+    L'ETA se base sur le débit observé (secondes d'audio traitées par
+    seconde écoulée): un fichier de 3 h pèse autant que 36 fichiers de
+    5 minutes. Sans durées sondées, repli sur le nombre de fichiers.
+    """
+    total_seconds: float
+    total_items: int
+    done_seconds: float = 0.0
+    done_items: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def percent(self) -> float:
+        if self.total_seconds > 0:
+            return min(100.0, self.done_seconds / self.total_seconds * 100)
+        if self.total_items > 0:
+            return self.done_items / self.total_items * 100
+        return 100.0
+
+    @property
+    def eta_seconds(self) -> float | None:
+        """Temps restant estimé, None tant qu'aucun travail n'est terminé."""
+        fraction = self.percent / 100
+        if fraction <= 0:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        return elapsed * (1 - fraction) / fraction
+
+
 @dataclass
 class BatchOptions:
     """Options pour le batch processing."""
@@ -79,6 +190,19 @@ class BatchOptions:
     include_timestamps: bool = True
     include_speakers: bool = True
     skip_existing: bool = False
+    batch_name: str | None = None  # Manifeste persistant (reprise après crash)
+
+    def to_dict(self) -> dict:
+        """Options sérialisables (manifeste)."""
+        data = asdict(self)
+        data["output_dir"] = str(self.output_dir) if self.output_dir else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BatchOptions":
+        data = dict(data)
+        data["output_dir"] = Path(data["output_dir"]) if data.get("output_dir") else None
+        return cls(**data)
 
 
 class BatchProcessor:
@@ -98,17 +222,38 @@ class BatchProcessor:
         self.transcriber = transcriber
         self.diarizer = diarizer
         self.audio_processor = AudioProcessor()
-        self._cancelled = False
+        self._cancel_token = CancellationToken()
+        self._futures: list = []
+        self._manifest: BatchManifest | None = None
+        self._params: dict = {}
+        self._indexes: dict[Path, OutputIndex] | None = None
+        self._hash_outputs = False  # Empreinte complète à l'enregistrement (skip_existing)
+        self._store: ResultStore | None = None
+        self._progress: BatchProgress | None = None
+        self._eta_callback: Callable[[BatchProgress], None] | None = None
+        self._item_callback: Callable[[BatchItemEvent], None] | None = None
+        self._positions: dict[int, int] = {}
+        self._notify_lock = threading.Lock()
 
     def cancel(self) -> None:
-        """Annule le traitement en cours."""
-        self._cancelled = True
+        """
+        Annule le traitement en cours: les fichiers en cours (dans ce
+        processus ou dans ceux du pool) s'arrêtent à la fenêtre suivante,
+        sans écrire de sorties, et restent à traiter dans le manifeste.
+        """
+        self._cancel_token.cancel()
+        # Mode parallèle: les tâches pas encore démarrées ne le seront pas;
+        # les processus du pool sont prévenus par _process_parallel
+        for future in self._futures:
+            future.cancel()
 
     def process(
         self,
         files: list[Path],
         options: BatchOptions,
         progress_callback: Callable[[int, int, str, float], None] | None = None,
+        eta_callback: Callable[[BatchProgress], None] | None = None,
+        item_callback: Callable[[BatchItemEvent], None] | None = None,
     ) -> BatchResult:
         """
         Traite une liste de fichiers audio.
@@ -117,23 +262,65 @@ class BatchProcessor:
             files: Liste des fichiers à traiter
             options: Options de traitement
             progress_callback: Callback (current, total, filename, percent)
+            eta_callback: Callback d'avancement global (secondes d'audio, ETA)
+            item_callback: Appelé dès qu'un fichier est terminé (sorties
+                écrites), y compris ignoré ou en échec. Peut être appelé
+                depuis le thread d'écriture: il doit rester rapide.
 
         Returns:
             BatchResult avec les résultats de tous les fichiers
         """
-        self._cancelled = False
+        self._cancel_token = CancellationToken()
         items = [BatchItem(path=f) for f in files]
         result = BatchResult(items=items, started_at=datetime.now())
+        self._item_callback = item_callback
+        self._positions = {id(item): i for i, item in enumerate(items)}
 
-        for i, item in enumerate(items):
-            if self._cancelled:
-                self._mark_remaining_as_skipped(items, i)
-                break
+        self._params = self._effective_params(options)
+        self._indexes = {}
+        self._hash_outputs = options.skip_existing
+        self._hash_files(items)
+        if options.batch_name:
+            self._manifest = BatchManifest(options.batch_name)
+            self._manifest.open_batch(files, options.to_dict())
+            self._skip_done_items(items)
 
-            if progress_callback:
-                progress_callback(i + 1, len(items), item.filename, 0.0)
+        try:
+            self._store = ResultStore(get_config().paths.temp / RESULTS_DIRNAME)
+            result.results_path = self._store.path
 
-            self._process_item(item, options, progress_callback, i, len(items))
+            todo = [item for item in items if item.status == BatchItemStatus.PENDING]
+            if options.skip_existing:
+                todo = self._reuse_outputs(todo, options)
+            todo, duplicates = self._group_duplicates(todo)
+
+            self._probe_durations(todo)
+            self._progress = BatchProgress(
+                total_seconds=sum(item.duration for item in todo),
+                total_items=len(todo),
+            )
+            self._eta_callback = eta_callback
+
+            workers = self._worker_count(options, len(todo))
+            if workers > 1:
+                self._process_parallel(todo, options, progress_callback, workers)
+            else:
+                self._process_sequential(todo, options, progress_callback)
+            self._fan_out_duplicates(duplicates, options)
+            if self._cancel_token.cancelled and self._manifest is not None:
+                # Fichiers interrompus ou jamais démarrés: à reprendre
+                self._manifest.mark_pending([
+                    item.path for item in todo
+                    if item.status not in (BatchItemStatus.COMPLETED, BatchItemStatus.FAILED)
+                ])
+        finally:
+            self._indexes = None
+            if self._store is not None:
+                self._store.close()
+                self._store = None
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
 
         result.finished_at = datetime.now()
         result.total_time = (result.finished_at - result.started_at).total_seconds()
@@ -145,6 +332,669 @@ class BatchProcessor:
 
         return result
 
+    def resume(
+        self,
+        batch_name: str,
+        progress_callback: Callable[[int, int, str, float], None] | None = None,
+        eta_callback: Callable[[BatchProgress], None] | None = None,
+        item_callback: Callable[[BatchItemEvent], None] | None = None,
+    ) -> BatchResult:
+        """
+        Reprend un batch nommé: les fichiers déjà traités (même contenu,
+        mêmes paramètres, sorties présentes) sont ignorés, les échecs et
+        les fichiers interrompus sont retraités.
+        """
+        with BatchManifest(batch_name) as manifest:
+            if not manifest.exists():
+                raise KeyError(f"Batch inconnu: {batch_name}")
+            files, options = manifest.load()
+            logger.info(f"Reprise du batch {batch_name}: {manifest.status_counts()}")
+
+        return self.process(
+            files, BatchOptions.from_dict(options), progress_callback, eta_callback, item_callback,
+        )
+
+    def _hash_files(self, items: list[BatchItem]) -> None:
+        """Empreinte du contenu de chaque fichier (None si illisible)."""
+        def digest(item: BatchItem) -> None:
+            try:
+                item.input_hash = content_hash(item.path)
+            except OSError:
+                item.input_hash = None
+
+        with ThreadPoolExecutor(max_workers=8, thread_name_prefix="batch-hash") as pool:
+            list(pool.map(digest, items))
+
+    def _probe_durations(self, items: list[BatchItem]) -> None:
+        """Sonde la durée des fichiers (ffprobe, en parallèle); 0 si illisible."""
+        def probe(item: BatchItem) -> None:
+            try:
+                item.duration = float(self.audio_processor.get_audio_info(item.path)["duration"])
+            except Exception as e:
+                logger.debug(f"Durée inconnue pour {item.filename}: {e}")
+
+        with ThreadPoolExecutor(max_workers=8, thread_name_prefix="batch-probe") as pool:
+            list(pool.map(probe, items))
+
+    def _advance_progress(self, seconds: float, items: int = 1) -> None:
+        """Comptabilise du travail terminé et notifie l'ETA."""
+        if self._progress is None:
+            return
+        self._progress.done_seconds += max(0.0, seconds)
+        self._progress.done_items += items
+        if self._eta_callback:
+            self._eta_callback(self._progress)
+
+    def _effective_params(self, options: BatchOptions) -> dict:
+        """Paramètres qui déterminent le contenu des sorties."""
+        config = self.transcriber.config
+        performance = get_config().performance
+        diarization = options.use_diarization and self.diarizer is not None
+        params = {
+            # Modèle imposé par l'admission (un modèle rétrogradé peut être chargé)
+            "model": self.transcriber.preferred_model,
+            "compute_type": config.compute_type,
+            "language": options.language or config.language,
+            "beam_size": config.beam_size,
+            "vad_filter": config.vad_filter,
+            "mode": config.mode,
+            # Découpage des fichiers longs (chunks recollés)
+            "chunk_size_minutes": performance.chunk_size_minutes,
+            "chunk_overlap_seconds": performance.chunk_overlap_seconds,
+            "diarization": diarization,
+            "output_format": options.output_format,
+            "include_timestamps": options.include_timestamps,
+            "include_speakers": options.include_speakers,
+        }
+        if config.mode == "batched":
+            params["batch_size"] = config.batch_size
+        if diarization:
+            params.update(
+                min_speakers=options.min_speakers,
+                max_speakers=options.max_speakers,
+                diarization_chunk_minutes=self.diarizer.config.chunk_minutes,
+                diarization_chunk_overlap_seconds=self.diarizer.config.chunk_overlap_seconds,
+            )
+        return params
+
+    def _skip_done_items(self, items: list[BatchItem]) -> None:
+        """Marque comme ignorés les fichiers déjà terminés dans le manifeste."""
+        for item in items:
+            state = self._manifest.get_item(item.path)
+            if state is None or state["status"] != "completed" or item.input_hash is None:
+                continue
+            if self._manifest.is_done(item.path, item.input_hash, self._params):
+                item.status = BatchItemStatus.SKIPPED
+                item.output_paths = [Path(p) for p in state["outputs"]]
+                logger.info(f"Déjà traité (manifeste): {item.filename}")
+                self._notify(item)
+
+    def _output_index(self, directory: Path) -> OutputIndex:
+        """Index du dossier de sortie (chargé une fois par batch)."""
+        if directory not in self._indexes:
+            self._indexes[directory] = OutputIndex(directory)
+        return self._indexes[directory]
+
+    def _reuse_outputs(self, items: list[BatchItem], options: BatchOptions) -> list[BatchItem]:
+        """
+        skip_existing: ignore les fichiers dont l'index du dossier de sortie
+        connaît déjà le contenu avec les mêmes paramètres. Les sorties d'une
+        copie renommée sont dupliquées sous le nom du fichier.
+
+        Returns:
+            Les fichiers restant à traiter
+        """
+        remaining = []
+        for item in items:
+            outputs = None
+            if item.input_hash is not None:
+                index = self._output_index(options.output_dir or item.path.parent)
+                key = output_key(item.input_hash, self._params)
+                outputs = index.lookup(key)
+            if outputs is not None and not self._same_content(item, self._indexed_full_hash(index, key)):
+                # Même empreinte échantillonnée, contenu différent
+                outputs = None
+            if outputs is None:
+                remaining.append(item)
+                continue
+            try:
+                item.output_paths = self._copy_outputs(outputs, item, options)
+                item.status = BatchItemStatus.SKIPPED
+                logger.info(f"Déjà transcrit (même contenu et paramètres): {item.filename}")
+            except OSError as e:
+                item.status = BatchItemStatus.FAILED
+                item.error_message = str(e)
+                logger.error(f"Erreur copie des sorties pour {item.filename}: {e}")
+            self._record(item)
+        return remaining
+
+    @staticmethod
+    def _full_hash(item: BatchItem) -> str | None:
+        """Empreinte du fichier complet, lue une seule fois (None si illisible)."""
+        if item.full_hash is None:
+            try:
+                item.full_hash = full_content_hash(item.path)
+            except OSError as e:
+                logger.debug(f"Empreinte complète impossible pour {item.filename}: {e}")
+        return item.full_hash
+
+    @staticmethod
+    def _indexed_full_hash(index: OutputIndex, key: str) -> str | None:
+        """
+        Empreinte complète du source d'une entrée. Une entrée enregistrée
+        sans elle la reçoit à la première consultation, si son source est
+        encore là et inchangé; sinon elle ne peut plus être confirmée.
+        """
+        full_hash = index.full_hash(key)
+        source = index.source_stamp(key)
+        if full_hash is not None or source is None:
+            return full_hash
+        path, stamp = source
+        try:
+            stat = path.stat()
+            if [stat.st_size, stat.st_mtime_ns] != stamp:
+                return None
+            full_hash = full_content_hash(path)
+        except OSError:
+            return None
+        index.set_full_hash(key, full_hash)
+        return full_hash
+
+    def _same_content(self, item: BatchItem, full_hash: str | None) -> bool:
+        """Confirme par l'empreinte complète une correspondance d'empreinte échantillonnée."""
+        return full_hash is not None and self._full_hash(item) == full_hash
+
+    @classmethod
+    def _group_duplicates(
+        cls,
+        items: list[BatchItem],
+    ) -> tuple[list[BatchItem], list[tuple[BatchItem, list[BatchItem]]]]:
+        """
+        Regroupe les fichiers de contenu identique: seul le premier de
+        chaque groupe est traité. L'empreinte échantillonnée désigne les
+        candidats, l'empreinte complète confirme.
+
+        Returns:
+            (fichiers à traiter, [(fichier traité, ses doublons)])
+        """
+        candidates = Counter(item.input_hash for item in items if item.input_hash is not None)
+        primaries: dict[str, BatchItem] = {}
+        duplicates: dict[str, list[BatchItem]] = {}
+        todo = []
+        for item in items:
+            identity = item.input_hash
+            if identity is not None and candidates[identity] > 1:
+                identity = cls._full_hash(item)
+            if identity is None:
+                todo.append(item)
+            elif identity in primaries:
+                duplicates.setdefault(identity, []).append(item)
+            else:
+                primaries[identity] = item
+                todo.append(item)
+
+        if duplicates:
+            logger.info(f"{sum(map(len, duplicates.values()))} doublon(s) traités une seule fois")
+        return todo, [(primaries[h], dups) for h, dups in duplicates.items()]
+
+    def _fan_out_duplicates(
+        self,
+        groups: list[tuple[BatchItem, list[BatchItem]]],
+        options: BatchOptions,
+    ) -> None:
+        """Reporte le résultat de chaque fichier traité sur ses doublons."""
+        for primary, duplicates in groups:
+            for item in duplicates:
+                item.status = primary.status
+                item.error_message = primary.error_message
+                item.duration = primary.duration
+                if primary.output_paths:
+                    try:
+                        item.output_paths = self._copy_outputs(primary.output_paths, item, options)
+                        item.result_ref = primary.result_ref
+                        item.language = primary.language
+                        item.segment_count = primary.segment_count
+                    except OSError as e:
+                        item.status = BatchItemStatus.FAILED
+                        item.error_message = str(e)
+                        logger.error(f"Erreur copie des sorties pour {item.filename}: {e}")
+                self._record(item)
+
+    @staticmethod
+    def _copy_outputs(outputs: list[Path], item: BatchItem, options: BatchOptions) -> list[Path]:
+        """Duplique des sorties sous le nom d'un fichier (même dossier de sortie)."""
+        output_dir = options.output_dir or item.path.parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+        copied = []
+        for source in outputs:
+            target = output_dir / f"{item.path.stem}{source.suffix}"
+            if target.resolve() != source.resolve():
+                shutil.copyfile(source, target)
+            copied.append(target)
+        return copied
+
+    def _spill_result(self, item: BatchItem) -> None:
+        """Décharge le résultat complet sur disque, ne garde qu'un résumé."""
+        if self._store is None or item.result is None:
+            return
+        try:
+            item.result_ref = self._store.append(item.result)
+        except Exception as e:
+            logger.error(f"Erreur déchargement du résultat de {item.filename}: {e}")
+            return
+        item.language = item.result.language
+        item.segment_count = len(item.result.segments)
+        item.result = None
+
+    def _record(self, item: BatchItem) -> None:
+        """
+        Enregistre l'issue d'un fichier (sorties écrites): résultat déchargé
+        sur disque, sorties dans l'index du dossier de sortie, statut dans
+        le manifeste (si batch nommé).
+        """
+        self._spill_result(item)
+        if (
+            self._indexes is not None
+            and item.status == BatchItemStatus.COMPLETED
+            and item.output_paths
+            and item.input_hash is not None
+        ):
+            try:
+                index = self._output_index(item.output_paths[0].parent)
+                # Empreinte complète lue seulement si ce batch consulte
+                # l'index; sinon calculée à la première consultation
+                full_hash = self._full_hash(item) if self._hash_outputs else item.full_hash
+                index.add(
+                    output_key(item.input_hash, self._params), item.path, item.output_paths,
+                    full_hash=full_hash,
+                )
+            except Exception as e:
+                logger.error(f"Erreur index de sortie pour {item.filename}: {e}")
+
+        if self._manifest is not None:
+            try:
+                self._manifest.record(
+                    item.path,
+                    item.status.value,
+                    item.input_hash,
+                    self._params,
+                    item.processing_time,
+                    item.output_paths,
+                    item.error_message,
+                )
+            except Exception as e:
+                logger.error(f"Erreur manifeste pour {item.filename}: {e}")
+
+        self._notify(item)
+
+    def _notify(self, item: BatchItem) -> None:
+        """Notifie la fin d'un fichier (une notification à la fois)."""
+        if self._item_callback is None:
+            return
+        event = BatchItemEvent(
+            index=self._positions.get(id(item), -1),
+            path=item.path,
+            status=item.status,
+            processing_time=item.processing_time,
+            duration=item.duration,
+            output_paths=list(item.output_paths),
+            error_message=item.error_message,
+        )
+        try:
+            with self._notify_lock:
+                self._item_callback(event)
+        except Exception as e:
+            logger.error(f"Erreur callback de fin pour {item.filename}: {e}")
+
+    def _process_sequential(
+        self,
+        items: list[BatchItem],
+        options: BatchOptions,
+        progress_callback: Callable | None,
+    ) -> None:
+        """
+        Traite les fichiers un par un avec le Transcriber courant.
+
+        Pipeline à trois étages: un thread prépare (vérifie, sonde, décode)
+        les `prefetch_files` fichiers suivants pendant que le modèle
+        travaille sur le fichier courant, et un autre écrit les sorties.
+        La file de préchargement est bornée pour limiter la RAM.
+        """
+        prefetch = max(0, get_config().performance.prefetch_files)
+        pending: deque[Future] = deque()
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-prefetch") as loader, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-writer") as writer:
+
+            def schedule(index: int) -> None:
+                if prefetch and index < len(items):
+                    pending.append(loader.submit(self._prepare_file, items[index].path, options))
+
+            for j in range(min(prefetch, len(items))):
+                schedule(j)
+
+            for i, item in enumerate(items):
+                if self._cancel_token.cancelled:
+                    for future in pending:
+                        future.cancel()
+                    self._mark_remaining_as_skipped(items, i)
+                    break
+
+                if progress_callback:
+                    progress_callback(i + 1, len(items), item.filename, 0.0)
+
+                # Le fichier courant est soit préchargé, soit préparé ici (prefetch = 0)
+                prepared = pending.popleft() if pending else None
+                schedule(i + prefetch)
+
+                self._process_item(
+                    item, options, progress_callback, i, len(items),
+                    prepared=prepared, writer=writer,
+                )
+                self._advance_progress(item.duration)
+
+    def _worker_count(self, options: BatchOptions, total: int) -> int:
+        """Nombre de processus de travail (1 = traitement séquentiel)."""
+        performance = get_config().performance
+        if performance.batch_workers == 1 or total < 2:
+            return 1
+
+        workers = plan_worker_count(
+            self.transcriber.preferred_model,
+            use_diarization=options.use_diarization and self.diarizer is not None,
+            requested=performance.batch_workers,
+            budget_mb=performance.memory_budget_mb,
+            cpu_threads=self.transcriber.cpu_threads,
+            compute_type=self.transcriber.config.compute_type,
+            hosted=performance.model_host and hosted_client() is not None,
+        )
+        return min(workers, total)
+
+    def _mark_started(self, started, items_by_path: dict[str, BatchItem]) -> None:
+        """Marque en cours les fichiers dont un processus a commencé le traitement."""
+        while True:
+            try:
+                path = started.get_nowait()
+            except queue.Empty:
+                return
+            item = items_by_path.get(path)
+            if item is None or item.status != BatchItemStatus.PENDING:
+                continue  # Chunk suivant d'un fichier déjà démarré
+            item.status = BatchItemStatus.PROCESSING
+            if self._manifest is not None:
+                self._manifest.mark_running(item.path)
+
+    def _create_pool(self, workers: int, initargs: tuple) -> Executor:
+        """Pool de processus, chacun initialisé avec ses propres modèles."""
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_batch_worker,
+            initargs=initargs,
+        )
+
+    def _process_parallel(
+        self,
+        items: list[BatchItem],
+        options: BatchOptions,
+        progress_callback: Callable | None,
+        workers: int,
+    ) -> None:
+        """
+        Répartit les fichiers sur un pool de processus.
+
+        Les tâches sont soumises de la plus longue à la plus courte (LPT):
+        chaque processus libre prend la plus longue tâche restante. Un
+        fichier plus long que la part d'un processus est découpé en chunks
+        de transcription, pris par les processus libres puis recollés ici;
+        sa diarization reste une seule tâche sur le fichier entier. Les
+        fichiers longs sont décodés au fil de l'eau, au plus
+        SPLIT_FILES_IN_FLIGHT à la fois, et le pool ne reçoit que deux
+        tâches par processus d'avance. Les résultats remontent au fil de l'eau.
+        """
+        threads = max(1, self.transcriber.cpu_threads // workers)
+        transcription_config = replace(self.transcriber.config, cpu_threads=threads, parallel_workers=1)
+        diarization_config = (
+            replace(self.diarizer.config, parallel_chunks=1)
+            if options.use_diarization and self.diarizer is not None
+            else None
+        )
+
+        logger.info(f"Batch parallèle: {len(items)} fichiers, {workers} processus x {threads} threads")
+
+        split_threshold = max(
+            2 * get_config().performance.chunk_size_minutes * 60,
+            sum(item.duration for item in items) / workers,
+        )
+
+        order = itertools.count()
+        tasks: list[_Task] = []  # Tas: la plus longue tâche en tête
+
+        def push(kind: str, item: BatchItem, duration: float, chunk: AudioChunk | None = None) -> None:
+            heapq.heappush(tasks, _Task(-duration, next(order), kind, item, chunk))
+
+        for item in items:
+            push("split" if item.duration > split_threshold else "file", item, item.duration)
+
+        done = 0
+        split_jobs: dict[int, _SplitJob] = {}
+        splitting: dict[Future, BatchItem] = {}
+        futures: dict[Future, _Task] = {}
+        # Les processus signalent le début de chaque tâche: un fichier n'est
+        # marqué en cours qu'une fois réellement démarré
+        context = multiprocessing.get_context("spawn")
+        started = context.Queue()
+        # Levé à l'annulation: chaque processus le consulte via son jeton
+        cancel_event = context.Event()
+        items_by_path = {str(item.path): item for item in items}
+
+        def feed() -> None:
+            deferred = []
+            while tasks and len(futures) < 2 * workers:
+                task = heapq.heappop(tasks)
+                if task.kind != "split":
+                    futures[self._submit_task(pool, task, split_jobs.get(id(task.item)), options)] = task
+                elif len(splitting) + len(split_jobs) < SPLIT_FILES_IN_FLIGHT:
+                    splitting[splitter.submit(self._split_long_file, task.item, options)] = task.item
+                else:
+                    deferred.append(task)
+            for task in deferred:
+                heapq.heappush(tasks, task)
+            self._futures = list(futures)
+            # cancel() a pu passer pendant les soumissions: il n'a pas vu les dernières
+            if self._cancel_token.cancelled:
+                for future in self._futures:
+                    future.cancel()
+
+        with self._create_pool(
+            workers,
+            (self.transcriber.preferred_model, transcription_config, diarization_config, started, cancel_event),
+        ) as pool, ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-split") as splitter:
+            while futures or splitting or (tasks and not self._cancel_token.cancelled):
+                if not self._cancel_token.cancelled:
+                    feed()
+                elif not cancel_event.is_set():
+                    cancel_event.set()
+                finished, _ = wait(
+                    [*futures, *splitting], timeout=POLL_SECONDS, return_when=FIRST_COMPLETED,
+                )
+                self._mark_started(started, items_by_path)
+
+                for future in finished:
+                    if future in splitting:
+                        item = splitting.pop(future)
+                        job = future.result()
+                        if job is None:
+                            self._finish_parallel_item(item)
+                        elif not self._cancel_token.cancelled:
+                            split_jobs[id(item)] = job
+                            if job.language is None:
+                                # Langue détectée une fois, avant les chunks
+                                excerpt = AudioChunk(
+                                    0, 0, int(LANGUAGE_DETECTION_SECONDS * job.audio.sample_rate), 0.0,
+                                    float("inf"), job.audio.sample_rate,
+                                )
+                                push("language", item, job.audio.duration, excerpt)
+                            else:
+                                for chunk in job.chunks:
+                                    push("chunk", item, chunk.duration, chunk)
+                            if job.diarize:
+                                whole = AudioChunk(0, 0, job.audio.num_samples, 0.0, float("inf"),
+                                                   job.audio.sample_rate)
+                                push("diarize", item, job.audio.duration, whole)
+                        continue
+
+                    task = futures.pop(future)
+                    if future.cancelled():
+                        continue
+                    item = task.item
+                    if task.kind == "language":
+                        self._collect_language(item, split_jobs[id(item)], future)
+                        for chunk in split_jobs[id(item)].chunks:
+                            push("chunk", item, chunk.duration, chunk)
+                        continue
+                    if task.kind == "file":
+                        self._collect_file(item, future)
+                    else:
+                        job = split_jobs[id(item)]
+                        self._collect_split_task(item, job, task, future)
+                        if task.kind == "chunk":
+                            self._advance_progress(
+                                min(task.chunk.keep_end, item.duration) - task.chunk.keep_start, items=0,
+                            )
+                        if not job.complete:
+                            continue
+                        del split_jobs[id(item)]
+                        self._finish_split_job(item, job, options)
+
+                    self._finish_parallel_item(item, advance=task.kind == "file")
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, len(items), item.filename, 100.0)
+
+        self._futures = []
+        started.close()
+        self._mark_remaining_as_skipped(items, 0)
+
+    @staticmethod
+    def _submit_task(pool: Executor, task: "_Task", job: "_SplitJob | None", options: BatchOptions) -> Future:
+        """Soumet au pool un fichier entier, un chunk de transcription ou une diarization."""
+        if task.kind == "file":
+            return pool.submit(_process_batch_file, task.item.path, options)
+        payload = chunk_payload(job.audio, task.chunk)
+        sample_rate = job.audio.sample_rate
+        if task.kind == "diarize":
+            return pool.submit(_process_batch_diarization, payload, sample_rate, task.item.path, options)
+        if task.kind == "language":
+            return pool.submit(_process_batch_language, payload, sample_rate, task.item.path)
+        return pool.submit(
+            _process_batch_chunk, payload, sample_rate, task.item.path,
+            replace(options, use_diarization=False, language=job.language or options.language),
+        )
+
+    def _collect_file(self, item: BatchItem, future: Future) -> None:
+        """Reporte dans l'item le résultat d'un fichier traité par un processus."""
+        try:
+            processed = future.result()
+        except Exception as e:
+            # Processus mort (mémoire, crash natif): l'item échoue seul
+            item.status = BatchItemStatus.FAILED
+            item.error_message = str(e)
+            logger.error(f"Erreur processus pour {item.filename}: {e}")
+        else:
+            item.status = processed.status
+            item.result = processed.result
+            item.error_message = processed.error_message
+            item.processing_time = processed.processing_time
+            item.output_paths = processed.output_paths
+
+    def _collect_language(self, item: BatchItem, job: "_SplitJob", future: Future) -> None:
+        """Langue commune aux chunks d'un fichier long (à défaut, chaque chunk détecte la sienne)."""
+        try:
+            detected = future.result()
+        except Exception as e:
+            logger.error(f"Erreur détection de langue de {item.filename}: {e}")
+            return
+        if detected is not None:
+            job.language, job.language_probability = detected
+            logger.info(f"{item.filename}: langue détectée {job.language} ({job.language_probability:.2f})")
+
+    def _split_long_file(self, item: BatchItem, options: BatchOptions) -> "_SplitJob | None":
+        """Décode un fichier long (cache PCM: memmap partagé) et planifie ses chunks."""
+        performance = get_config().performance
+        try:
+            audio = self._load_file(item.path)
+            chunks = plan_chunks(
+                audio,
+                chunk_seconds=performance.chunk_size_minutes * 60,
+                overlap_seconds=performance.chunk_overlap_seconds,
+            )
+        except Exception as e:
+            item.status = BatchItemStatus.FAILED
+            item.error_message = str(e)
+            logger.error(f"Erreur traitement {item.filename}: {e}")
+            return None
+
+        logger.info(f"{item.filename}: {len(chunks)} chunks répartis sur le pool")
+        # Diarization d'un seul tenant: les locuteurs ne sont pas à relier entre chunks
+        diarize = options.use_diarization and self.diarizer is not None
+        language = options.language or self.transcriber.config.language
+        return _SplitJob(
+            audio=audio, chunks=chunks, diarize=diarize, language=None if language == "auto" else language,
+        )
+
+    def _collect_split_task(self, item: BatchItem, job: "_SplitJob", task: "_Task", future: Future) -> None:
+        try:
+            value = future.result()
+        except Exception as e:
+            job.error = job.error or str(e)
+            logger.error(f"Erreur {task.kind} {task.chunk.index} de {item.filename}: {e}")
+        else:
+            result = value if task.kind == "diarize" else value[0]
+            if task.kind == "diarize":
+                job.diarization = result
+            else:
+                job.results[task.chunk.index] = result
+            job.partial = job.partial or result.is_partial
+        job.pending -= 1
+
+    def _finish_split_job(self, item: BatchItem, job: "_SplitJob", options: BatchOptions) -> None:
+        """Recolle les chunks d'un fichier long, attribue les locuteurs et sauvegarde."""
+        item.processing_time = time.monotonic() - job.started_at
+        if job.error:
+            item.status = BatchItemStatus.FAILED
+            item.error_message = job.error
+            return
+        if job.partial:
+            # Annulé en cours: fichier à reprendre, aucune sortie écrite
+            item.status = BatchItemStatus.SKIPPED
+            return
+
+        ordered = [(chunk, job.results[chunk.index]) for chunk in job.chunks]
+        first = ordered[0][1]
+        result = TranscriptionResult(
+            segments=stitch_segments([(c, r.segments) for c, r in ordered]),
+            language=first.language,
+            language_probability=job.language_probability or first.language_probability,
+            duration=job.audio.duration,
+        )
+        if job.diarization is not None:
+            result = assign_speakers_to_transcription(result, job.diarization)
+
+        item.result = result
+        item.status = BatchItemStatus.COMPLETED
+        try:
+            self._save_result(item, options)
+        except Exception as e:
+            item.status = BatchItemStatus.FAILED
+            item.error_message = str(e)
+            logger.error(f"Erreur sauvegarde {item.filename}: {e}")
+
+    def _finish_parallel_item(self, item: BatchItem, advance: bool = True) -> None:
+        """Enregistre un item terminé (l'audio des fichiers découpés est déjà compté)."""
+        self._record(item)
+        self._advance_progress(item.duration if advance else 0.0)
+
     def _process_item(
         self,
         item: BatchItem,
@@ -152,25 +1002,36 @@ class BatchProcessor:
         progress_callback: Callable | None,
         current_index: int,
         total: int,
+        prepared: Future | None = None,
+        writer: Executor | None = None,
     ) -> None:
-        """Traite un seul fichier du batch."""
-        import time
+        """
+        Traite un seul fichier du batch.
+
+        Args:
+            prepared: Préparation déjà lancée par l'étage de préchargement
+            writer: Exécuteur pour écrire la sortie hors du chemin critique
+        """
         start_time = time.time()
+        saving: Future | None = None
         item.status = BatchItemStatus.PROCESSING
+        if self._manifest is not None:
+            self._manifest.mark_running(item.path)
 
         try:
-            self._validate_file(item.path)
-
-            if options.skip_existing and self._output_exists(item.path, options):
+            audio = prepared.result() if prepared else self._prepare_file(item.path, options)
+            result = self._transcribe_file(audio, options, progress_callback, current_index, total)
+            item.result = result
+            if result.is_partial:
                 item.status = BatchItemStatus.SKIPPED
-                logger.info(f"Fichier ignoré (existe déjà): {item.filename}")
+                item.error_message = "Annulé (résultat partiel)"
                 return
-
-            result = self._transcribe_file(item.path, options, progress_callback, current_index, total)
-            item.result = result
             item.status = BatchItemStatus.COMPLETED
 
-            self._save_result(item, options)
+            if writer is not None:
+                saving = writer.submit(self._save_result_async, item, options)
+            else:
+                self._save_result(item, options)
 
         except Exception as e:
             item.status = BatchItemStatus.FAILED
@@ -179,16 +1040,25 @@ class BatchProcessor:
 
         finally:
             item.processing_time = time.time() - start_time
+            # Sauvegarde asynchrone: l'étage d'écriture enregistre l'issue finale
+            # (le statut peut déjà avoir changé dans son thread)
+            if saving is None:
+                self._record(item)
 
-    def _validate_file(self, path: Path) -> None:
-        """Valide un fichier avant traitement."""
+    def _prepare_file(self, path: Path, options: BatchOptions) -> DecodedAudio:
+        """Vérifie et décode un fichier."""
         if not path.exists():
             raise AudioFileNotFoundError(str(path))
-        self.audio_processor.validate_audio_file(path)
+
+        return self._load_file(path)
+
+    def _load_file(self, path: Path) -> DecodedAudio:
+        """Valide et décode un fichier (un seul décodage pour tout le pipeline)."""
+        return self.audio_processor.decode(path)
 
     def _transcribe_file(
         self,
-        path: Path,
+        audio: DecodedAudio,
         options: BatchOptions,
         progress_callback: Callable | None,
         current_index: int,
@@ -198,34 +1068,62 @@ class BatchProcessor:
 
         def item_progress(pct: float):
             if progress_callback:
-                progress_callback(current_index + 1, total, path.name, pct)
+                progress_callback(current_index + 1, total, audio.path.name, pct)
 
-        # Transcription
         item_progress(10.0)
-        result = self.transcriber.transcribe(path, language=options.language)
-        item_progress(50.0)
+        result, diarization_result = self._run_stages(audio, options)
 
-        # Diarization si demandée
-        if options.use_diarization and self.diarizer:
-            diarization_result = self.diarizer.diarize(
-                path,
-                min_speakers=options.min_speakers if options.min_speakers > 0 else None,
-                max_speakers=options.max_speakers if options.max_speakers > 0 else None,
-            )
+        if diarization_result is not None:
             item_progress(90.0)
+            partial = result.is_partial or diarization_result.is_partial
             result = assign_speakers_to_transcription(result, diarization_result)
+            result.is_partial = partial
 
         item_progress(100.0)
         return result
 
-    def _output_exists(self, input_path: Path, options: BatchOptions) -> bool:
-        """Vérifie si le fichier de sortie existe déjà."""
-        output_dir = options.output_dir or input_path.parent
-        base_name = input_path.stem
+    def _run_stages(
+        self,
+        audio: DecodedAudio,
+        options: BatchOptions,
+    ) -> tuple[TranscriptionResult, DiarizationResult | None]:
+        """Transcription, et diarization si demandée (en parallèle si la machine le permet)."""
+        use_diarization = bool(options.use_diarization and self.diarizer)
+        # Pas de rétrogradation en batch: le modèle fait partie des paramètres des sorties
+        plan = MemoryPlanner(allow_downgrade=False).admit(
+            self.transcriber, self.diarizer, use_diarization, duration=audio.duration,
+        )
+
+        if not use_diarization:
+            return self.transcriber.transcribe(
+                audio, language=options.language, cancel_token=self._cancel_token,
+            ), None
+
+        split = None if plan.sequential else concurrent_thread_split(
+            self.transcriber, self.transcriber.cpu_threads,
+        )
+        concurrent = split is not None
+        asr_threads, diarization_threads = split or (None, None)
+
+        def transcribe() -> TranscriptionResult:
+            if self.transcriber.model is None:
+                self.transcriber.load_model(cpu_threads=asr_threads)
+            return self.transcriber.transcribe(
+                audio, language=options.language, cancel_token=self._cancel_token,
+            )
+
+        def diarize() -> DiarizationResult:
+            if plan.sequential:
+                MemoryPlanner.release_transcription_model(self.transcriber)
+            return self.diarizer.diarize(
+                audio,
+                min_speakers=options.min_speakers if options.min_speakers > 0 else None,
+                max_speakers=options.max_speakers if options.max_speakers > 0 else None,
+                num_threads=diarization_threads,
+                cancel_token=self._cancel_token,
+            )
 
-        if options.output_format in ("txt", "both") and (output_dir / f"{base_name}.txt").exists():
-            return True
-        return options.output_format in ("srt", "both") and (output_dir / f"{base_name}.srt").exists()
+        return run_transcription_and_diarization(transcribe, diarize, concurrent=concurrent)
 
     def _save_result(self, item: BatchItem, options: BatchOptions) -> None:
         """Sauvegarde le résultat d'un item."""
@@ -243,18 +1141,74 @@ class BatchProcessor:
                 include_speakers=options.include_speakers,
             )
             txt_path.write_text(content, encoding="utf-8")
+            item.output_paths.append(txt_path)
             logger.info(f"Sauvegardé: {txt_path}")
 
         if options.output_format in ("srt", "both"):
             srt_path = output_dir / f"{base_name}.srt"
             srt_path.write_text(item.result.to_srt(), encoding="utf-8")
+            item.output_paths.append(srt_path)
             logger.info(f"Sauvegardé: {srt_path}")
 
+    def _save_result_async(self, item: BatchItem, options: BatchOptions) -> None:
+        """Sauvegarde depuis l'étage d'écriture: une erreur fait échouer l'item."""
+        try:
+            self._save_result(item, options)
+        except Exception as e:
+            item.status = BatchItemStatus.FAILED
+            item.error_message = str(e)
+            logger.error(f"Erreur sauvegarde {item.filename}: {e}")
+        self._record(item)
+
     def _mark_remaining_as_skipped(self, items: list[BatchItem], start_index: int) -> None:
-        """Marque les éléments restants comme ignorés."""
+        """Marque les éléments restants (ou interrompus) comme ignorés."""
         for i in range(start_index, len(items)):
-            if items[i].status == BatchItemStatus.PENDING:
+            if items[i].status in (BatchItemStatus.PENDING, BatchItemStatus.PROCESSING):
                 items[i].status = BatchItemStatus.SKIPPED
+                self._notify(items[i])
+
+
+def iter_audio_files(
+    directory: Path,
+    recursive: bool = False,
+    cancelled: Callable[[], bool] | None = None,
+) -> Iterator[Path]:
+    """
+    Parcourt un répertoire en une seule passe (os.scandir) et produit les
+    fichiers audio au fil de la découverte.
+
+    L'extension est comparée sans tenir compte de la casse (.WAV, .Mp3).
+    Les liens symboliques vers des répertoires ne sont pas suivis (pas de
+    boucle) et les répertoires illisibles sont ignorés.
+
+    Args:
+        directory: Répertoire à scanner
+        recursive: Si True, inclut les sous-répertoires
+        cancelled: Interrompt le parcours quand il retourne True
+    """
+    stack = [os.fspath(directory)]
+    while stack:
+        if cancelled and cancelled():
+            return
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                subdirs = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                subdirs.append(entry.path)
+                        elif os.path.splitext(entry.name)[1].lower() in AudioProcessor.SUPPORTED_FORMATS \
+                                and entry.is_file():
+                            yield Path(entry.path)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"Répertoire ignoré ({current}): {e}")
+            continue
+        # Ordre de parcours stable: sous-répertoires par nom
+        stack.extend(sorted(subdirs, reverse=True))
 
 
 def get_audio_files_from_directory(
@@ -274,10 +1228,125 @@ def get_audio_files_from_directory(
     if not directory.is_dir():
         return []
 
-    pattern = "**/*" if recursive else "*"
-    files = []
+    return sorted(iter_audio_files(directory, recursive), key=lambda p: p.name.lower())
+
+
+@dataclass(order=True)
+class _Task:
+    """Tâche du pool de batch, ordonnée de la plus longue à la plus courte."""
+    priority: float  # -durée
+    seq: int
+    kind: str = field(compare=False)  # file, split (à découper), language, chunk, diarize
+    item: BatchItem = field(compare=False)
+    chunk: AudioChunk | None = field(compare=False, default=None)
+
+
+@dataclass
+class _SplitJob:
+    """Fichier long découpé en chunks répartis sur le pool de processus."""
+    audio: DecodedAudio
+    chunks: list[AudioChunk]
+    diarize: bool = False  # Plus une tâche de diarization du fichier entier
+    language: str | None = None  # Langue imposée à tous les chunks (None: à détecter)
+    language_probability: float | None = None  # Si détectée
+    results: dict = field(default_factory=dict)
+    diarization: DiarizationResult | None = None
+    error: str | None = None
+    partial: bool = False  # Une tâche a été interrompue par l'annulation
+    started_at: float = field(default_factory=time.monotonic)
+    pending: int = -1
+
+    def __post_init__(self):
+        if self.pending < 0:
+            self.pending = len(self.chunks) + int(self.diarize)
+
+    @property
+    def complete(self) -> bool:
+        return self.pending == 0
+
+
+# Processeur propre à chaque processus du pool de batch
+_worker_processor: BatchProcessor | None = None
+
+
+# File où le processus signale le début de chaque tâche
+_worker_started = None
+
+
+def _init_batch_worker(
+    model_name: str,
+    transcription_config: TranscriptionConfig,
+    diarization_config: DiarizationConfig | None,
+    started=None,
+    cancel_event=None,
+) -> None:
+    """
+    Initialise un processus du pool: son propre Transcriber (et Diarizer).
+
+    `cancel_event` est levé par le parent à l'annulation: les traitements
+    du processus s'arrêtent à la fenêtre suivante.
+    """
+    global _worker_processor, _worker_started
+    _worker_started = started
+    host = hosted_client()
+    if host is not None:
+        # Modèles résidents dans le démon: rien à charger dans ce processus
+        transcriber = HostedTranscriber(host, model_name=model_name, config=transcription_config)
+        diarizer = HostedDiarizer(host, diarization_config) if diarization_config else None
+    else:
+        transcriber = Transcriber(model_name=model_name, config=transcription_config)
+        transcriber.load_model()
+        diarizer = Diarizer(diarization_config) if diarization_config else None
+    _worker_processor = BatchProcessor(transcriber, diarizer)
+    _worker_processor._cancel_token = CancellationToken(cancel_event)
+
+
+def _signal_started(path: Path) -> None:
+    if _worker_started is not None:
+        _worker_started.put(str(path))
+
+
+def _process_batch_file(path: Path, options: BatchOptions) -> BatchItem:
+    """Traite un fichier dans un processus du pool (erreurs capturées dans l'item)."""
+    _signal_started(path)
+    item = BatchItem(path=path)
+    _worker_processor._process_item(item, options, None, 0, 1)
+    return item
+
+
+def _process_batch_chunk(
+    payload: tuple | np.ndarray,
+    sample_rate: int,
+    path: Path,
+    options: BatchOptions,
+) -> tuple[TranscriptionResult, DiarizationResult | None]:
+    """Traite un chunk de fichier long dans un processus du pool (timestamps relatifs)."""
+    _signal_started(path)
+    audio = DecodedAudio(path=path, pcm=load_chunk_payload(payload), sample_rate=sample_rate)
+    return _worker_processor._run_stages(audio, options)
+
+
+def _process_batch_language(payload: tuple | np.ndarray, sample_rate: int, path: Path) -> tuple[str, float] | None:
+    """Détecte dans un processus du pool la langue d'un fichier long (None si annulé)."""
+    _signal_started(path)
+    if _worker_processor._cancel_token.cancelled:
+        return None
+    audio = DecodedAudio(path=path, pcm=load_chunk_payload(payload), sample_rate=sample_rate)
+    return _worker_processor.transcriber.detect_language(audio)
 
-    for ext in AudioProcessor.SUPPORTED_FORMATS:
-        files.extend(directory.glob(f"{pattern}{ext}"))
 
-    return sorted(files, key=lambda p: p.name.lower())
+def _process_batch_diarization(
+    payload: tuple | np.ndarray,
+    sample_rate: int,
+    path: Path,
+    options: BatchOptions,
+) -> DiarizationResult:
+    """Diarise un fichier long entier dans un processus du pool (ses chunks sont transcrits ailleurs)."""
+    _signal_started(path)
+    audio = DecodedAudio(path=path, pcm=load_chunk_payload(payload), sample_rate=sample_rate)
+    return _worker_processor.diarizer.diarize(
+        audio,
+        min_speakers=options.min_speakers if options.min_speakers > 0 else None,
+        max_speakers=options.max_speakers if options.max_speakers > 0 else None,
+        cancel_token=_worker_processor._cancel_token,
+    )
@@ -0,0 +1,111 @@
+"""
+Annulation coopérative des traitements longs.
+
+Un même jeton est partagé par le demandeur (UI, batch) et les boucles
+d'inférence, qui le consultent entre deux fenêtres: l'annulation prend
+effet en une fenêtre au plus, sans attendre la fin du fichier.
+
+Les pools de processus reçoivent un multiprocessing.Event à leur
+initialisation: le parent le lève à l'annulation et chaque processus le
+consulte via son propre jeton.
+"""
+import itertools
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+
+from .exceptions import TranscriptionCancelledError
+
+
+class CancellationToken:
+    """
+    Jeton d'annulation, sûr entre threads.
+
+    Usage:
+        token = CancellationToken()
+        result = transcriber.transcribe(audio, cancel_token=token)
+        # depuis un autre thread:
+        token.cancel()
+    """
+
+    def __init__(self, event=None):
+        # event: multiprocessing.Event partagé avec le parent (processus d'un pool)
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Lève TranscriptionCancelledError si l'annulation a été demandée."""
+        if self._event.is_set():
+            raise TranscriptionCancelledError()
+
+
+def is_cancelled(token: CancellationToken | None) -> bool:
+    """Vrai si un jeton est fourni et annulé."""
+    return token is not None and token.cancelled
+
+
+# Intervalle de consultation du jeton pendant l'attente d'un pool de processus
+POLL_SECONDS = 0.2
+
+
+def as_completed_cancellable(
+    futures: Iterable[Future],
+    cancel_token: CancellationToken | None,
+    cancel_event,
+) -> Iterator[Future]:
+    """
+    Comme concurrent.futures.as_completed, en relayant l'annulation.
+
+    Le jeton est consulté toutes les POLL_SECONDS: dès qu'il est annulé,
+    `cancel_event` (partagé avec les processus du pool) est levé et les
+    tâches pas encore démarrées sont annulées. Les futures annulées sont
+    produites comme les autres (future.cancelled()).
+    """
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+        if is_cancelled(cancel_token) and not cancel_event.is_set():
+            cancel_event.set()
+            for future in pending:
+                future.cancel()
+        yield from done
+
+
+def map_cancellable(
+    pool: Executor,
+    fn: Callable,
+    tasks: Iterable[tuple],
+    max_in_flight: int,
+    cancel_token: CancellationToken | None,
+    cancel_event,
+) -> Iterator[tuple[int, Future]]:
+    """
+    Soumet fn(*args) pour chaque tâche au fil des résultats, au plus
+    `max_in_flight` à la fois: les arguments (tableaux PCM à transmettre au
+    pool) ne sont construits qu'au moment de la soumission.
+
+    L'annulation est relayée comme par as_completed_cancellable et arrête
+    les soumissions. Produit (rang de la tâche, future) à mesure qu'elles
+    se terminent.
+    """
+    remaining = enumerate(tasks)
+    in_flight: dict[Future, int] = {}
+    while True:
+        if not is_cancelled(cancel_token):
+            for index, args in itertools.islice(remaining, max_in_flight - len(in_flight)):
+                in_flight[pool.submit(fn, *args)] = index
+        if not in_flight:
+            return
+        done, _ = wait(in_flight, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+        if is_cancelled(cancel_token) and not cancel_event.is_set():
+            cancel_event.set()
+            for future in in_flight:
+                future.cancel()
+        for future in done:
+            yield in_flight.pop(future), future
@@ -0,0 +1,195 @@
+"""
+Découpage des fichiers longs en chunks alignés sur les silences.
+
+Utilisé pour traiter un long enregistrement en parallèle: chaque chunk
+recouvre légèrement ses voisins, et chacun "possède" la zone comprise entre
+ses deux points de coupe, ce qui permet de dédoublonner les segments
+produits dans les zones de recouvrement.
+"""
+import logging
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .audio_processor import DecodedAudio
+from .transcriber import TranscriptionSegment
+
+logger = logging.getLogger(__name__)
+
+# Fenêtre de recherche d'un silence autour de chaque point de coupe cible
+CUT_SEARCH_SECONDS = 30.0
+
+
+@dataclass
+class AudioChunk:
+    """Portion d'un fichier audio (en échantillons) et zone qu'elle possède (en secondes)."""
+    index: int
+    start: int
+    end: int
+    keep_start: float
+    keep_end: float
+    sample_rate: int = 16000
+
+    @property
+    def offset(self) -> float:
+        """Décalage du chunk dans le fichier, en secondes."""
+        return self.start / self.sample_rate
+
+    @property
+    def duration(self) -> float:
+        return (self.end - self.start) / self.sample_rate
+
+    def owns(self, time: float) -> bool:
+        """Indique si un instant (absolu) appartient à la zone du chunk."""
+        return self.keep_start <= time < self.keep_end
+
+
+def _speech_gaps(samples: np.ndarray, sample_rate: int) -> list[tuple[int, int]]:
+    """Retourne les silences (début, fin) détectés par le VAD Silero de faster-whisper."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    speech = get_speech_timestamps(
+        samples,
+        VadOptions(min_silence_duration_ms=300, speech_pad_ms=100),
+        sampling_rate=sample_rate,
+    )
+
+    gaps = []
+    previous_end = 0
+    for ts in speech:
+        if ts["start"] > previous_end:
+            gaps.append((previous_end, ts["start"]))
+        previous_end = ts["end"]
+    if previous_end < len(samples):
+        gaps.append((previous_end, len(samples)))
+    return gaps
+
+
+def _quietest_point(samples: np.ndarray, sample_rate: int) -> int:
+    """Fallback sans silence: point de plus faible énergie (trames de 20 ms)."""
+    frame = max(1, sample_rate // 50)
+    usable = len(samples) // frame * frame
+    if usable == 0:
+        return len(samples) // 2
+    energy = np.square(samples[:usable].reshape(-1, frame)).mean(axis=1)
+    return int(np.argmin(energy)) * frame + frame // 2
+
+
+def find_cut_point(audio: DecodedAudio, target: int, search_seconds: float = CUT_SEARCH_SECONDS) -> int:
+    """
+    Cherche un point de coupe proche de `target` (échantillon) au milieu
+    d'un silence, pour ne pas couper un mot en deux.
+    """
+    half = int(search_seconds * audio.sample_rate / 2)
+    lo = max(0, target - half)
+    hi = min(audio.num_samples, target + half)
+    window = audio.to_float32(lo, hi)
+
+    try:
+        gaps = _speech_gaps(window, audio.sample_rate)
+    except Exception as e:
+        logger.warning(f"VAD indisponible pour le découpage: {e}")
+        gaps = []
+
+    if gaps:
+        # Silence le plus proche de la cible, les plus longs en priorité à distance égale
+        relative = target - lo
+        start, end = min(
+            gaps,
+            key=lambda g: (abs((g[0] + g[1]) // 2 - relative), -(g[1] - g[0])),
+        )
+        return lo + (start + end) // 2
+
+    return lo + _quietest_point(window, audio.sample_rate)
+
+
+def plan_chunks(
+    audio: DecodedAudio,
+    chunk_seconds: float,
+    overlap_seconds: float = 2.0,
+) -> list[AudioChunk]:
+    """
+    Découpe l'audio en chunks d'environ `chunk_seconds`, coupés dans des
+    silences et recouvrant leurs voisins de `overlap_seconds` de chaque côté.
+    """
+    sr = audio.sample_rate
+    total = audio.num_samples
+    chunk_samples = int(chunk_seconds * sr)
+    overlap = int(overlap_seconds * sr)
+
+    if total <= chunk_samples:
+        return [AudioChunk(0, 0, total, 0.0, float("inf"), sr)]
+
+    cuts = [0]
+    target = chunk_samples
+    while total - target > chunk_samples // 4:
+        cut = find_cut_point(audio, target)
+        cut = max(cut, cuts[-1] + sr)  # garde-fou: chunks non vides
+        cuts.append(cut)
+        target = cut + chunk_samples
+    cuts.append(total)
+
+    chunks = []
+    for i in range(len(cuts) - 1):
+        chunks.append(AudioChunk(
+            index=i,
+            start=max(0, cuts[i] - overlap),
+            end=min(total, cuts[i + 1] + overlap),
+            keep_start=0.0 if i == 0 else cuts[i] / sr,
+            keep_end=float("inf") if i == len(cuts) - 2 else cuts[i + 1] / sr,
+            sample_rate=sr,
+        ))
+
+    logger.info(f"Audio découpé en {len(chunks)} chunks (~{chunk_seconds:.0f}s)")
+    return chunks
+
+
+def chunk_payload(audio: DecodedAudio, chunk: AudioChunk) -> tuple | np.ndarray:
+    """
+    Données d'un chunk à envoyer à un processus: une référence au fichier
+    memmap du cache PCM si possible (aucune copie), sinon les échantillons.
+    """
+    if isinstance(audio.pcm, np.memmap) and audio.pcm.filename:
+        return (str(audio.pcm.filename), chunk.start, chunk.end)
+    return np.ascontiguousarray(audio.pcm[chunk.start:chunk.end])
+
+
+def load_chunk_payload(payload: tuple | np.ndarray) -> np.ndarray:
+    """Relit dans un processus du pool le PCM int16 envoyé par chunk_payload."""
+    if isinstance(payload, tuple):
+        path, start, end = payload
+        return np.memmap(path, dtype=np.int16, mode="r")[start:end]
+    return payload
+
+
+def shift_segment(segment: TranscriptionSegment, offset: float) -> TranscriptionSegment:
+    """Recale un segment (et ses mots) sur la timeline du fichier complet."""
+    words = [
+        {**w, "start": w["start"] + offset, "end": w["end"] + offset}
+        for w in (segment.words or [])
+    ]
+    return replace(
+        segment,
+        start=segment.start + offset,
+        end=segment.end + offset,
+        words=words,
+    )
+
+
+def stitch_segments(
+    chunk_segments: list[tuple[AudioChunk, list[TranscriptionSegment]]],
+) -> list[TranscriptionSegment]:
+    """
+    Recolle les segments de chaque chunk sur la timeline globale.
+
+    Les timestamps sont décalés de l'offset du chunk, et un segment n'est
+    conservé que par le chunk qui possède son point médian: les doublons des
+    zones de recouvrement disparaissent.
+    """
+    stitched = []
+    for chunk, segments in sorted(chunk_segments, key=lambda cs: cs[0].index):
+        for segment in segments:
+            shifted = shift_segment(segment, chunk.offset)
+            if chunk.owns((shifted.start + shifted.end) / 2):
+                stitched.append(shifted)
+    return stitched
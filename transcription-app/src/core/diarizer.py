@@ -3,19 +3,28 @@ Module de diarization (identification des locuteurs).
 Utilise NVIDIA NeMo Sortformer - 100% offline, sans authentification.
 """
 import gc
+import inspect
 import logging
+import tempfile
+import threading
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 
-from .audio_processor import AudioProcessor
+import numpy as np
+
+from .audio_processor import AudioProcessor, DecodedAudio
+from .cancellation import CancellationToken, is_cancelled, map_cancellable
+from .model_registry import get_model_registry
 from ..utils.config import DiarizationConfig, get_config
-from .transcriber import TranscriptionResult
+from ..utils.memory import diarization_footprint_mb, measure_footprint
+from .transcriber import TranscriptionResult, TranscriptionSegment
 
 logger = logging.getLogger(__name__)
 
 # Chemin vers les modèles NeMo locaux
 MODELS_DIR = Path(__file__).parent.parent.parent / "models" / "nemo"
+SORTFORMER_MODEL_PATH = MODELS_DIR / "sortformer" / "diar_sortformer_4spk-v1.nemo"
 
 
 @dataclass
@@ -26,35 +35,479 @@ class SpeakerSegment:
     speaker: str
 
 
+class _SpeakerIndex:
+    """
+    Index des tours de parole pour des recherches vectorisées.
+
+    Deux vues des segments:
+    - tous les segments triés par début, avec le maximum cumulé des fins,
+      pour retrouver par searchsorted le premier segment contenant un instant;
+    - par locuteur, l'union de ses intervalles triée avec la durée cumulée,
+      qui donne en O(log n) le temps de parole F(t) avant l'instant t.
+      Le chevauchement d'une plage [a, b] avec un locuteur vaut F(b) - F(a).
+    """
+
+    def __init__(self, segments: list[SpeakerSegment]):
+        # Ordre de première apparition: départage les égalités comme avant
+        self.speakers = list(dict.fromkeys(seg.speaker for seg in segments))
+        speaker_ids = {speaker: i for i, speaker in enumerate(self.speakers)}
+
+        starts = np.array([seg.start for seg in segments], dtype=np.float64)
+        ends = np.array([seg.end for seg in segments], dtype=np.float64)
+        ids = np.array([speaker_ids[seg.speaker] for seg in segments], dtype=np.int64)
+
+        order = np.argsort(starts, kind="stable")
+        self.starts = starts[order]
+        self.ids = ids[order]
+        sorted_ends = ends[order]
+        self.max_ends = np.maximum.accumulate(sorted_ends)
+
+        self.coverage = [
+            self._merge(self.starts[self.ids == i], sorted_ends[self.ids == i])
+            for i in range(len(self.speakers))
+        ]
+
+    @staticmethod
+    def _merge(starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Fusionne les intervalles (triés par début) d'un locuteur: (débuts, fins, durée cumulée)."""
+        # Un intervalle ouvre un nouveau bloc s'il commence après toutes les fins précédentes
+        new_block = np.ones(len(starts), dtype=bool)
+        new_block[1:] = starts[1:] > np.maximum.accumulate(ends)[:-1]
+        first = np.flatnonzero(new_block)
+
+        merged_starts = starts[first]
+        merged_ends = np.maximum.reduceat(ends, first)
+        durations = merged_ends - merged_starts
+        cumulative = np.concatenate(([0.0], np.cumsum(durations)[:-1]))
+        return merged_starts, merged_ends, cumulative
+
+    def _covered_before(self, speaker: int, times: np.ndarray) -> np.ndarray:
+        """Temps de parole du locuteur avant chaque instant."""
+        starts, ends, cumulative = self.coverage[speaker]
+        k = np.searchsorted(starts, times, side="right") - 1
+        valid = k >= 0
+        k = np.clip(k, 0, None)
+        partial = np.clip(times - starts[k], 0.0, ends[k] - starts[k])
+        return np.where(valid, cumulative[k] + partial, 0.0)
+
+    def overlaps(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Matrice (locuteurs × plages) des durées de chevauchement."""
+        return np.stack([
+            self._covered_before(i, ends) - self._covered_before(i, starts)
+            for i in range(len(self.speakers))
+        ])
+
+    def segment_at(self, times: np.ndarray) -> np.ndarray:
+        """Indice (trié) du premier segment contenant chaque instant, -1 sinon."""
+        candidate = np.searchsorted(self.max_ends, times, side="left")
+        count = np.searchsorted(self.starts, times, side="right")
+        return np.where(candidate < count, candidate, -1)
+
+
 @dataclass
 class DiarizationResult:
-    """Résultat de la diarization."""
+    """
+    Résultat de la diarization.
+
+    Les recherches passent par un index numpy construit au premier appel
+    (O(log n) par requête au lieu d'un parcours de tous les segments).
+    L'index est reconstruit si des segments sont ajoutés.
+    """
     segments: list[SpeakerSegment]
     num_speakers: int
+    is_partial: bool = False  # Annulée en cours: fenêtres déjà traitées seulement
+    _index: _SpeakerIndex | None = field(default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def _get_index(self) -> _SpeakerIndex:
+        if self._index is None or self._indexed_count != len(self.segments):
+            self._index = _SpeakerIndex(self.segments)
+            self._indexed_count = len(self.segments)
+        return self._index
+
+    def speakers_at(self, times: np.ndarray) -> list[str | None]:
+        """Version vectorisée de get_speaker_at."""
+        times = np.asarray(times, dtype=np.float64)
+        if not self.segments:
+            return [None] * len(times)
+
+        index = self._get_index()
+        found = index.segment_at(times)
+        return [
+            index.speakers[index.ids[i]] if i >= 0 else None
+            for i in found.tolist()
+        ]
+
+    def speakers_for_ranges(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        fallback_to_midpoint: bool = False,
+    ) -> list[str | None]:
+        """
+        Version vectorisée de get_speaker_for_range.
+
+        Args:
+            starts: Débuts des plages
+            ends: Fins des plages
+            fallback_to_midpoint: Sans chevauchement, utiliser le locuteur
+                présent au point médian de la plage
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        if not self.segments or len(starts) == 0:
+            return [None] * len(starts)
+
+        index = self._get_index()
+        overlaps = index.overlaps(starts, ends)
+        best = np.argmax(overlaps, axis=0)
+        has_overlap = overlaps[best, np.arange(len(starts))] > 0
+
+        speakers = [
+            index.speakers[b] if ok else None
+            for b, ok in zip(best.tolist(), has_overlap.tolist(), strict=True)
+        ]
+
+        if fallback_to_midpoint and not has_overlap.all():
+            missing = np.flatnonzero(~has_overlap)
+            midpoints = self.speakers_at((starts[missing] + ends[missing]) / 2)
+            for i, speaker in zip(missing.tolist(), midpoints, strict=True):
+                speakers[i] = speaker
+
+        return speakers
 
     def get_speaker_at(self, time: float) -> str | None:
         """Retourne le locuteur à un instant donné."""
-        for seg in self.segments:
-            if seg.start <= time <= seg.end:
-                return seg.speaker
-        return None
+        return self.speakers_at(np.array([time]))[0]
 
     def get_speaker_for_range(self, start: float, end: float) -> str | None:
         """Retourne le locuteur majoritaire sur une plage de temps."""
-        overlaps: dict[str, float] = {}
+        return self.speakers_for_ranges(np.array([start]), np.array([end]))[0]
+
+
+def _parse_sortformer_output(predicted_segments: list) -> list[SpeakerSegment]:
+    """Convertit la sortie de Sortformer (chaînes "start end speaker") en segments."""
+    segments = []
+
+    # predicted_segments est une liste de listes de strings "start end speaker"
+    if predicted_segments and len(predicted_segments) > 0:
+        for seg_str in predicted_segments[0]:  # Premier fichier
+            # Format: "0.000 2.550 speaker_0"
+            parts = seg_str.strip().split()
+            if len(parts) >= 3:
+                speaker = parts[2].upper()
+                # Normaliser le nom du speaker
+                if not speaker.startswith("SPEAKER_"):
+                    speaker = f"SPEAKER_{speaker}"
+                segments.append(SpeakerSegment(
+                    start=float(parts[0]),
+                    end=float(parts[1]),
+                    speaker=speaker,
+                ))
+
+    return segments
+
+
+# Profils acoustiques: relient un locuteur absent d'une zone de recouvrement
+_PROFILE_FFT = 512
+_PROFILE_HOP = 256
+_PROFILE_BANDS = 40
+_PROFILE_MAX_SECONDS = 60.0  # Parole seule retenue par locuteur et par fenêtre
+_PROFILE_MIN_FRAMES = 200  # ~3 s de parole seule
+_PROFILE_SILENCE_DB = -60.0
+# Écart moyen des spectres (en écarts-types intra-locuteur) pour relier deux profils
+PROFILE_MAX_DISTANCE = 0.2
+
+
+@dataclass
+class _SpeakerProfile:
+    """Spectre log-mel d'un locuteur, cumulé sur ses passages de parole seule."""
+    total: np.ndarray
+    squares: np.ndarray
+    frames: int
+
+    @classmethod
+    def from_frames(cls, features: np.ndarray) -> "_SpeakerProfile":
+        return cls(features.sum(axis=0), (features ** 2).sum(axis=0), len(features))
+
+    def merge(self, other: "_SpeakerProfile") -> None:
+        self.total = self.total + other.total
+        self.squares = self.squares + other.squares
+        self.frames += other.frames
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.total / self.frames
 
-        for seg in self.segments:
-            overlap_start = max(start, seg.start)
-            overlap_end = min(end, seg.end)
+    @property
+    def variance(self) -> np.ndarray:
+        return np.maximum(self.squares / self.frames - self.mean ** 2, 1e-6)
+
+    def distance(self, other: "_SpeakerProfile") -> float:
+        """Écart moyen des spectres moyens, normalisé par la variabilité intra-locuteur."""
+        pooled = np.sqrt((self.variance + other.variance) / 2)
+        return float(np.sqrt(np.mean(((self.mean - other.mean) / pooled) ** 2)))
+
+
+def _mel_filterbank(sample_rate: int) -> np.ndarray:
+    """Banc de filtres triangulaires sur l'échelle mel (bandes x bins FFT)."""
+    def to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    edges = to_hz(np.linspace(to_mel(60.0), to_mel(sample_rate / 2 * 0.95), _PROFILE_BANDS + 2))
+    bins = np.fft.rfftfreq(_PROFILE_FFT, 1.0 / sample_rate)
+    low, center, high = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - low) / (center - low)
+    falling = (high - bins) / (high - center)
+    return np.maximum(0.0, np.minimum(rising, falling))
+
+
+def _solo_turns(segments: list[SpeakerSegment]) -> dict[str, list[tuple[float, float]]]:
+    """Intervalles où chaque locuteur parle seul (sans chevauchement)."""
+    events = sorted({t for s in segments for t in (s.start, s.end)})
+    turns: dict[str, list[tuple[float, float]]] = {}
+    index = _SpeakerIndex(segments)
+    if len(events) < 2:
+        return turns
+    starts, ends = np.array(events[:-1]), np.array(events[1:])
+    active = index.overlaps(starts, ends) > 0
+    for i in np.flatnonzero(active.sum(axis=0) == 1):
+        speaker = index.speakers[int(np.argmax(active[:, i]))]
+        turns.setdefault(speaker, []).append((float(starts[i]), float(ends[i])))
+    return turns
+
+
+def _speaker_profiles(
+    audio: DecodedAudio,
+    segments: list[SpeakerSegment],
+) -> dict[str, _SpeakerProfile]:
+    """Profils des locuteurs d'une fenêtre (segments en temps absolu)."""
+    sample_rate = audio.sample_rate
+    filterbank = _mel_filterbank(sample_rate)
+    window = np.hanning(_PROFILE_FFT).astype(np.float32)
+    profiles = {}
+
+    for speaker, turns in _solo_turns(segments).items():
+        frames = []
+        budget = int(_PROFILE_MAX_SECONDS * sample_rate)
+        for start, end in turns:
+            first, last = int(start * sample_rate), min(int(end * sample_rate), audio.num_samples)
+            last = min(last, first + budget)
+            if last - first < _PROFILE_FFT:
+                continue
+            budget -= last - first
+            samples = audio.to_float32(first, last)
+            count = 1 + (len(samples) - _PROFILE_FFT) // _PROFILE_HOP
+            framed = np.lib.stride_tricks.sliding_window_view(samples, _PROFILE_FFT)[::_PROFILE_HOP][:count]
+            frames.append(framed * window)
+            if budget <= 0:
+                break
+        if not frames:
+            continue
+
+        framed = np.concatenate(frames)
+        loud = 10 * np.log10(np.mean(framed ** 2, axis=1) + 1e-12) > _PROFILE_SILENCE_DB
+        if loud.sum() < _PROFILE_MIN_FRAMES:
+            continue
+        power = np.abs(np.fft.rfft(framed[loud], axis=1)) ** 2
+        features = np.log(power @ filterbank.T + 1e-10)
+        profiles[speaker] = _SpeakerProfile.from_frames(features)
+    return profiles
+
+
+def _match_profiles(
+    local: dict[str, _SpeakerProfile],
+    known: dict[str, _SpeakerProfile],
+    max_distance: float,
+) -> dict[str, str]:
+    """
+    Relie des locuteurs locaux à des locuteurs globaux par profil acoustique.
+    Un lien n'est retenu que s'il est proche et sans ambiguïté: le second
+    candidat le plus proche doit être nettement plus loin.
+    """
+    pairs = []
+    for speaker, profile in local.items():
+        distances = sorted((profile.distance(p), label) for label, p in known.items())
+        if not distances or distances[0][0] > max_distance:
+            continue
+        if len(distances) > 1 and distances[1][0] < 1.5 * distances[0][0]:
+            continue
+        pairs.append((distances[0][0], speaker, distances[0][1]))
+
+    mapping: dict[str, str] = {}
+    for _, speaker, label in sorted(pairs):
+        if label not in mapping.values():
+            mapping[speaker] = label
+    return mapping
+
+
+def _match_speakers(
+    segments: list[SpeakerSegment],
+    previous: list[SpeakerSegment],
+    region_start: float,
+    region_end: float,
+    min_agreement: float,
+) -> dict[str, str]:
+    """
+    Associe les locuteurs d'une fenêtre à ceux de la fenêtre précédente
+    d'après leur temps de parole commun dans la zone de recouvrement
+    (appariement glouton par accord décroissant).
+    """
+    def clip(segs):
+        return [
+            SpeakerSegment(max(s.start, region_start), min(s.end, region_end), s.speaker)
+            for s in segs
+            if s.end > region_start and s.start < region_end
+        ]
+
+    local, reference = clip(segments), clip(previous)
+    if not local or not reference:
+        return {}
+
+    index = _SpeakerIndex(reference)
+    per_segment = index.overlaps(
+        np.array([s.start for s in local]),
+        np.array([s.end for s in local]),
+    )
+    local_speakers = list(dict.fromkeys(s.speaker for s in local))
+    columns = np.array([local_speakers.index(s.speaker) for s in local])
+    agreement = np.zeros((len(index.speakers), len(local_speakers)))
+    np.add.at(agreement.T, columns, per_segment.T)
+
+    mapping: dict[str, str] = {}
+    used: set[int] = set()
+    for flat in np.argsort(agreement, axis=None)[::-1]:
+        ref, loc = np.unravel_index(flat, agreement.shape)
+        if agreement[ref, loc] < min_agreement:
+            break
+        if ref in used or local_speakers[loc] in mapping:
+            continue
+        mapping[local_speakers[loc]] = index.speakers[ref]
+        used.add(ref)
+    return mapping
+
+
+def link_chunk_speakers(
+    chunk_segments: list[tuple],
+    min_agreement: float = 0.5,
+    audio: DecodedAudio | None = None,
+    max_profile_distance: float = PROFILE_MAX_DISTANCE,
+) -> list[SpeakerSegment]:
+    """
+    Recolle les diarizations par fenêtre sur la timeline globale.
+
+    Les étiquettes de Sortformer sont locales à chaque fenêtre: un locuteur
+    est relié à celui de la fenêtre précédente avec lequel il partage au
+    moins `min_agreement` secondes de parole dans la zone de recouvrement.
+    Un locuteur muet dans cette zone est comparé, si `audio` est fourni, aux
+    profils acoustiques de tous les locuteurs globaux déjà vus; faute de
+    correspondance sûre, il reçoit une nouvelle étiquette globale (le total
+    peut donc dépasser les 4 locuteurs d'une fenêtre). Chaque fenêtre ne
+    conserve que la zone qu'elle possède, puis les tours coupés à la
+    frontière sont refusionnés.
 
-            if overlap_start < overlap_end:
-                overlap_duration = overlap_end - overlap_start
-                overlaps[seg.speaker] = overlaps.get(seg.speaker, 0) + overlap_duration
+    Args:
+        chunk_segments: (AudioChunk, segments relatifs au chunk) par fenêtre
+        min_agreement: Temps de parole commun minimal (secondes) pour relier
+        audio: Audio complet, pour les profils acoustiques des locuteurs
+        max_profile_distance: Écart de profil maximal pour relier deux locuteurs
+
+    Returns:
+        Segments triés avec étiquettes globales
+    """
+    stitched: list[SpeakerSegment] = []
+    previous: tuple | None = None
+    profiles: dict[str, _SpeakerProfile] = {}
+    next_id = 0
+
+    for chunk, segments in sorted(chunk_segments, key=lambda cs: cs[0].index):
+        absolute = [
+            SpeakerSegment(s.start + chunk.offset, s.end + chunk.offset, s.speaker)
+            for s in segments
+        ]
+
+        mapping: dict[str, str] = {}
+        if previous is not None:
+            previous_chunk, previous_segments = previous
+            mapping = _match_speakers(
+                absolute,
+                previous_segments,
+                region_start=chunk.offset,
+                region_end=previous_chunk.offset + previous_chunk.duration,
+                min_agreement=min_agreement,
+            )
+
+        local_profiles = _speaker_profiles(audio, absolute) if audio is not None else {}
+        unmatched = {k: p for k, p in local_profiles.items() if k not in mapping}
+        if unmatched:
+            # Locuteur de retour après un silence couvrant le recouvrement
+            available = {k: p for k, p in profiles.items() if k not in mapping.values()}
+            mapping.update(_match_profiles(unmatched, available, max_profile_distance))
+
+        for speaker in dict.fromkeys(s.speaker for s in absolute):
+            if speaker not in mapping:
+                mapping[speaker] = f"SPEAKER_{next_id}"
+                next_id += 1
+        for speaker, profile in local_profiles.items():
+            if mapping[speaker] in profiles:
+                profiles[mapping[speaker]].merge(profile)
+            else:
+                profiles[mapping[speaker]] = profile
+
+        relabeled = [replace(s, speaker=mapping[s.speaker]) for s in absolute]
+        for s in relabeled:
+            start, end = max(s.start, chunk.keep_start), min(s.end, chunk.keep_end)
+            if start < end:
+                stitched.append(SpeakerSegment(start, end, s.speaker))
+        previous = (chunk, relabeled)
+
+    # Refusionner les tours coupés à une frontière de fenêtre
+    merged: list[SpeakerSegment] = []
+    last_by_speaker: dict[str, SpeakerSegment] = {}
+    for s in sorted(stitched, key=lambda seg: seg.start):
+        last = last_by_speaker.get(s.speaker)
+        if last is not None and s.start <= last.end + 1e-6:
+            last.end = max(last.end, s.end)
+            continue
+        merged.append(s)
+        last_by_speaker[s.speaker] = s
+    return merged
+
+
+# Diarizer propre à chaque processus du pool de diarization par fenêtres
+_worker_diarizer: "Diarizer | None" = None
+
+# Jeton du processus, levé par le parent à l'annulation
+_worker_cancel_token: CancellationToken | None = None
+
+
+def _init_diarization_worker(config: DiarizationConfig, num_threads: int, cancel_event=None) -> None:
+    """Initialise un processus du pool: charge son propre Sortformer."""
+    global _worker_diarizer, _worker_cancel_token
+    import torch
+
+    _worker_cancel_token = CancellationToken(cancel_event)
+
+    torch.set_num_threads(num_threads)
+    _worker_diarizer = Diarizer(config)
+    _worker_diarizer.load()
+
+
+def _diarize_chunk(payload: tuple | np.ndarray, sample_rate: int) -> list[SpeakerSegment] | None:
+    """
+    Diarise une fenêtre dans un processus du pool (timestamps relatifs à la
+    fenêtre). Retourne None si l'annulation précède le début de la fenêtre.
+    """
+    from .chunking import load_chunk_payload
 
-        if not overlaps:
-            return None
+    if is_cancelled(_worker_cancel_token):
+        return None
 
-        return max(overlaps.items(), key=lambda x: x[1])[0]
+    audio = DecodedAudio(path=Path("chunk"), pcm=load_chunk_payload(payload), sample_rate=sample_rate)
+    return _parse_sortformer_output(_worker_diarizer._run_sortformer(audio))
 
 
 class Diarizer:
@@ -65,9 +518,14 @@ class Diarizer:
     Supporte jusqu'à 4 locuteurs.
     """
 
+    # Le modèle est chargé dans ce processus (voir HostedDiarizer)
+    loads_locally = True
+
     def __init__(self, config: DiarizationConfig | None = None):
         self.config = config or get_config().diarization
         self.model = None
+        self._model_key: tuple | None = None  # Clé du modèle emprunté au registre
+        self._load_lock = threading.RLock()
         self._mode = "nemo"  # Mode unique: NeMo
 
     @property
@@ -84,22 +542,27 @@ class Diarizer:
         self,
         progress_callback: Callable[[str, float], None] | None = None,
     ) -> None:
-        """Charge le modèle NeMo Sortformer."""
-        if self.model is not None:
-            return
+        """Emprunte le modèle NeMo Sortformer au registre des modèles (chargé si besoin)."""
+        with self._load_lock:
+            if self.model is not None:
+                return
 
-        if progress_callback:
-            progress_callback("Chargement NeMo Sortformer...", 0.0)
+            if progress_callback:
+                progress_callback("Chargement NeMo Sortformer...", 0.0)
 
-        self._load_nemo(progress_callback)
+            key = ("sortformer", str(SORTFORMER_MODEL_PATH))
+            self.model = get_model_registry().acquire(
+                key, lambda: self._load_nemo(progress_callback), diarization_footprint_mb(),
+            )
+            self._model_key = key
 
-        if progress_callback:
-            progress_callback("Diarization prête", 100.0)
+            if progress_callback:
+                progress_callback("Diarization prête", 100.0)
 
     def _load_nemo(
         self,
         progress_callback: Callable[[str, float], None] | None = None,
-    ) -> None:
+    ):
         """Charge le modèle NeMo depuis les fichiers locaux."""
         try:
             import torch
@@ -108,8 +571,7 @@ class Diarizer:
             if progress_callback:
                 progress_callback("Chargement Sortformer...", 30.0)
 
-            # Chemin vers le modèle local
-            model_path = MODELS_DIR / "sortformer" / "diar_sortformer_4spk-v1.nemo"
+            model_path = SORTFORMER_MODEL_PATH
 
             if not model_path.exists():
                 raise FileNotFoundError(
@@ -118,120 +580,106 @@ class Diarizer:
                 )
 
             # Charger depuis le fichier local
-            self.model = SortformerEncLabelModel.restore_from(
-                restore_path=str(model_path),
-                map_location=torch.device("cpu"),
-                strict=False,
-            )
-            self.model.eval()
+            with measure_footprint(("sortformer",)):
+                model = SortformerEncLabelModel.restore_from(
+                    restore_path=str(model_path),
+                    map_location=torch.device("cpu"),
+                    strict=False,
+                )
+                model.eval()
 
             logger.info("Modèle NeMo Sortformer chargé (100% offline)")
+            return model
 
         except Exception as e:
             logger.error(f"Erreur chargement NeMo: {e}")
             raise
 
     def unload(self) -> None:
-        """Décharge les modèles pour libérer la mémoire."""
-        self.model = None
+        """Rend le modèle au registre (conservé en mémoire jusqu'à éviction)."""
+        with self._load_lock:
+            self.model = None
+            if self._model_key is not None:
+                get_model_registry().release(self._model_key)
+                self._model_key = None
         gc.collect()
         logger.info("Modèles diarization déchargés")
 
     def diarize(
         self,
-        audio_path: Path,
+        audio_path: Path | DecodedAudio,
         min_speakers: int | None = None,
         max_speakers: int | None = None,
         progress_callback: Callable[[str, float], None] | None = None,
+        num_threads: int | None = None,
+        cancel_token: CancellationToken | None = None,
     ) -> DiarizationResult:
         """
         Effectue la diarization d'un fichier audio.
 
         Args:
-            audio_path: Chemin vers le fichier audio
+            audio_path: Chemin vers le fichier audio, ou DecodedAudio déjà
+                décodé (évite un second décodage FFmpeg)
             min_speakers: (ignoré - Sortformer détecte auto jusqu'à 4)
             max_speakers: (ignoré - Sortformer détecte auto jusqu'à 4)
             progress_callback: Callback de progression
+            num_threads: Threads PyTorch alloués à l'inférence (défaut: réglage
+                courant), pour partager les cores avec une transcription concurrente
+            cancel_token: Arrête la diarization à la fenêtre suivante (résultat
+                partiel); un passage Sortformer unique n'est pas interruptible
 
         Returns:
             DiarizationResult avec segments et locuteurs identifiés
         """
-        if self.model is None:
+        if self.model is None and not self._uses_process_pool(audio_path):
             self.load(progress_callback)
 
         if progress_callback:
             progress_callback("Analyse des locuteurs...", 10.0)
 
-        logger.info(f"Diarization de {audio_path}...")
+        source = audio_path.path if isinstance(audio_path, DecodedAudio) else audio_path
+        logger.info(f"Diarization de {source}...")
+
+        if not num_threads:
+            return self._diarize_nemo(audio_path, progress_callback, cancel_token)
 
-        return self._diarize_nemo(audio_path, progress_callback)
+        # Réglage global au processus: rétabli pour les diarizations suivantes
+        import torch
+        previous_threads = torch.get_num_threads()
+        torch.set_num_threads(num_threads)
+        try:
+            return self._diarize_nemo(audio_path, progress_callback, cancel_token)
+        finally:
+            torch.set_num_threads(previous_threads)
 
     def _diarize_nemo(
         self,
-        audio_path: Path,
+        audio_path: Path | DecodedAudio,
         progress_callback: Callable[[str, float], None] | None,
+        cancel_token: CancellationToken | None = None,
     ) -> DiarizationResult:
         """Diarization avec NeMo Sortformer."""
-        import tempfile
-
-        from pydub import AudioSegment
-
         if progress_callback:
             progress_callback("Préparation audio...", 20.0)
 
-        AudioProcessor().ensure_ffmpeg()
-
-        # Charger l'audio avec pydub (supporte tous les formats via ffmpeg)
-        audio = AudioSegment.from_file(str(audio_path))
-
-        # Convertir en mono 16kHz
-        audio = audio.set_channels(1).set_frame_rate(16000)
+        # Un seul décodage, réutilisé s'il a déjà été fait par l'appelant
+        audio = audio_path if isinstance(audio_path, DecodedAudio) else AudioProcessor().decode(audio_path)
 
         if progress_callback:
             progress_callback("Sortformer en cours...", 30.0)
 
-        # Sauvegarder dans un fichier temporaire WAV mono
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp_path = tmp.name
-            audio.export(tmp_path, format="wav")
-
-        try:
-            # Lancer la diarization sur l'audio mono
-            predicted_segments = self.model.diarize(
-                audio=tmp_path,
-                batch_size=1,
-            )
-        finally:
-            # Nettoyer le fichier temporaire
-            Path(tmp_path).unlink(missing_ok=True)
+        partial = False
+        if self._use_chunks(audio):
+            segments, partial = self._diarize_chunked(audio, progress_callback, cancel_token)
+        elif is_cancelled(cancel_token):
+            segments, partial = [], True
+        else:
+            segments = _parse_sortformer_output(self._run_sortformer(audio))
 
         if progress_callback:
             progress_callback("Traitement des résultats...", 80.0)
 
-        # Convertir les résultats
-        segments = []
-        speakers_set = set()
-
-        # predicted_segments est une liste de listes de strings "start end speaker"
-        if predicted_segments and len(predicted_segments) > 0:
-            for seg_str in predicted_segments[0]:  # Premier fichier
-                # Format: "0.000 2.550 speaker_0"
-                parts = seg_str.strip().split()
-                if len(parts) >= 3:
-                    start = float(parts[0])
-                    end = float(parts[1])
-                    speaker = parts[2].upper().replace("SPEAKER_", "SPEAKER_")
-                    # Normaliser le nom du speaker
-                    if speaker.startswith("SPEAKER_"):
-                        speaker = speaker
-                    else:
-                        speaker = f"SPEAKER_{speaker}"
-                    segments.append(SpeakerSegment(
-                        start=start,
-                        end=end,
-                        speaker=speaker,
-                    ))
-                    speakers_set.add(speaker)
+        speakers_set = {seg.speaker for seg in segments}
 
         if progress_callback:
             progress_callback("Diarization terminée", 100.0)
@@ -239,33 +687,249 @@ class Diarizer:
         result = DiarizationResult(
             segments=segments,
             num_speakers=len(speakers_set),
+            is_partial=partial,
         )
 
         logger.info(f"Diarization NeMo: {len(segments)} segments, {result.num_speakers} locuteurs")
         return result
 
+    def _use_chunks(self, audio: Path | DecodedAudio) -> bool:
+        """Mode fenêtres: audio déjà décodé et plus long qu'une fenêtre."""
+        chunk_seconds = self.config.chunk_minutes * 60
+        return (
+            chunk_seconds > 0
+            and isinstance(audio, DecodedAudio)
+            and audio.duration > chunk_seconds
+        )
+
+    def _uses_process_pool(self, audio: Path | DecodedAudio) -> bool:
+        """Les fenêtres tournent dans des processus: pas de modèle dans le parent."""
+        return self.config.parallel_chunks > 1 and self._use_chunks(audio)
+
+    def _diarize_chunked(
+        self,
+        audio: DecodedAudio,
+        progress_callback: Callable[[str, float], None] | None,
+        cancel_token: CancellationToken | None = None,
+    ) -> tuple[list[SpeakerSegment], bool]:
+        """
+        Diarization d'un fichier long par fenêtres recouvrantes.
+
+        Seule la fenêtre en cours est convertie en float32: la mémoire
+        reste bornée quelle que soit la durée. Les locuteurs de chaque
+        fenêtre sont ensuite reliés à ceux de la précédente.
+
+        Returns:
+            (segments, partiel): partiel si annulée avant la dernière fenêtre
+        """
+        from .chunking import plan_chunks
+
+        chunks = plan_chunks(
+            audio,
+            chunk_seconds=self.config.chunk_minutes * 60,
+            overlap_seconds=self.config.chunk_overlap_seconds,
+        )
+
+        def chunk_done(done: int) -> None:
+            if progress_callback:
+                progress_callback(
+                    f"Sortformer: fenêtre {done}/{len(chunks)}",
+                    30.0 + 50.0 * done / len(chunks),
+                )
+
+        if self._uses_process_pool(audio):
+            results = self._diarize_chunks_parallel(audio, chunks, chunk_done, cancel_token)
+        else:
+            results = []
+            for chunk in chunks:
+                if is_cancelled(cancel_token):
+                    break
+                output = self._run_sortformer(audio.slice(chunk.start, chunk.end))
+                results.append((chunk, _parse_sortformer_output(output)))
+                chunk_done(len(results))
+
+        partial = len(results) < len(chunks)
+        if partial:
+            logger.info(f"Diarization annulée: {len(results)}/{len(chunks)} fenêtres traitées")
+        return link_chunk_speakers(results, audio=audio), partial
+
+    def _diarize_chunks_parallel(
+        self,
+        audio: DecodedAudio,
+        chunks: list,
+        chunk_done: Callable[[int], None],
+        cancel_token: CancellationToken | None = None,
+    ) -> list[tuple]:
+        """
+        Fenêtres réparties sur un pool de processus (un Sortformer chacun).
+        Annulation: les fenêtres pas encore démarrées sont abandonnées, y
+        compris celles déjà transmises aux processus.
+        """
+        import multiprocessing
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+
+        from .chunking import chunk_payload
+
+        workers = min(self.config.parallel_chunks, len(chunks))
+        threads_per_worker = max(1, (os.cpu_count() or 2) // 2 // workers)
+
+        logger.info(
+            f"Diarization parallèle: {len(chunks)} fenêtres, "
+            f"{workers} processus x {threads_per_worker} threads"
+        )
+
+        results = []
+        context = multiprocessing.get_context("spawn")
+        cancel_event = context.Event()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_diarization_worker,
+            initargs=(self.config, threads_per_worker, cancel_event),
+        ) as pool:
+            # Fenêtres soumises au fil de l'eau: sans cache PCM, chacune est
+            # une copie de l'audio transmise au pool
+            tasks = ((chunk_payload(audio, c), audio.sample_rate) for c in chunks)
+            for index, future in map_cancellable(
+                pool, _diarize_chunk, tasks, 2 * workers, cancel_token, cancel_event,
+            ):
+                if future.cancelled() or future.result() is None:
+                    continue
+                results.append((chunks[index], future.result()))
+                chunk_done(len(results))
+
+        return results
+
+    def _accepts_in_memory_audio(self) -> bool:
+        """Les versions récentes de NeMo acceptent un tableau numpy avec sample_rate."""
+        try:
+            return "sample_rate" in inspect.signature(self.model.diarize).parameters
+        except (TypeError, ValueError):
+            return False
+
+    def _run_sortformer(self, audio: DecodedAudio) -> list:
+        """
+        Lance Sortformer sur l'audio 16 kHz mono.
+
+        Le signal est passé en mémoire (float32), sans fichier intermédiaire.
+        Repli sur un WAV temporaire pour les versions de NeMo qui n'acceptent
+        que des chemins.
+        """
+        if self._accepts_in_memory_audio():
+            return self.model.diarize(
+                audio=audio.to_float32(),
+                sample_rate=audio.sample_rate,
+                batch_size=1,
+            )
+
+        logger.info("NeMo sans support de l'audio en mémoire: export WAV temporaire")
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+            tmp_path = Path(tmp.name)
+
+        try:
+            audio.write_wav(tmp_path)
+            return self.model.diarize(audio=str(tmp_path), batch_size=1)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+
+def _split_by_speaker(
+    segment: TranscriptionSegment,
+    words: list[dict],
+    runs: list[tuple[int, int, str | None]],
+) -> list[TranscriptionSegment]:
+    """Découpe un segment en tours homogènes (runs: début, fin dans `words`, locuteur)."""
+    parts = []
+    for k, (first, last, speaker) in enumerate(runs):
+        run_words = words[first:last]
+        parts.append(replace(
+            segment,
+            start=segment.start if k == 0 else run_words[0]["start"],
+            end=segment.end if k == len(runs) - 1 else run_words[-1]["end"],
+            text="".join(w["word"] for w in run_words),
+            words=run_words,
+            speaker=speaker,
+        ))
+    return parts
+
 
 def assign_speakers_to_transcription(
     transcription: TranscriptionResult,
     diarization: DiarizationResult,
+    split_on_speaker_change: bool = True,
 ) -> TranscriptionResult:
     """
     Assigne les locuteurs identifiés aux segments de transcription.
 
+    Les segments sans horodatage des mots reçoivent le locuteur majoritaire
+    de leur plage. Sinon chaque mot est attribué (en une passe vectorisée sur
+    tous les mots du fichier) et un segment est redécoupé là où le locuteur
+    change, pour ne pas fusionner deux tours de parole.
+
     Args:
         transcription: Résultat de la transcription
         diarization: Résultat de la diarization
+        split_on_speaker_change: Redécouper les segments au niveau des mots
 
     Returns:
         TranscriptionResult avec les speakers assignés
     """
-    for segment in transcription.segments:
-        speaker = diarization.get_speaker_for_range(segment.start, segment.end)
-
-        if speaker is None:
-            mid_time = (segment.start + segment.end) / 2
-            speaker = diarization.get_speaker_at(mid_time)
-
+    segments = transcription.segments
+    if not segments:
+        return transcription
+
+    # Une seule passe vectorisée pour tous les segments
+    speakers = diarization.speakers_for_ranges(
+        np.fromiter((seg.start for seg in segments), dtype=np.float64, count=len(segments)),
+        np.fromiter((seg.end for seg in segments), dtype=np.float64, count=len(segments)),
+        fallback_to_midpoint=True,
+    )
+    for segment, speaker in zip(segments, speakers, strict=True):
         segment.speaker = speaker
 
+    words = [w for seg in segments for w in (seg.words or [])]
+    if not split_on_speaker_change or not words:
+        return transcription
+
+    # Attribution mot par mot, puis repli sur le locuteur du segment
+    word_counts = [len(seg.words or []) for seg in segments]
+    offsets = np.concatenate(([0], np.cumsum(word_counts)))
+    owners = np.repeat(np.arange(len(segments)), word_counts)
+    word_speakers = diarization.speakers_for_ranges(
+        np.fromiter((w["start"] for w in words), dtype=np.float64, count=len(words)),
+        np.fromiter((w["end"] for w in words), dtype=np.float64, count=len(words)),
+        fallback_to_midpoint=True,
+    )
+    word_speakers = [
+        speaker if speaker is not None else speakers[owner]
+        for speaker, owner in zip(word_speakers, owners.tolist(), strict=True)
+    ]
+
+    # Tours homogènes: changement de locuteur ou de segment
+    codes = {speaker: i for i, speaker in enumerate(dict.fromkeys(word_speakers))}
+    speaker_codes = np.fromiter((codes[s] for s in word_speakers), dtype=np.int64, count=len(words))
+    boundary = np.ones(len(words), dtype=bool)
+    boundary[1:] = (speaker_codes[1:] != speaker_codes[:-1]) | (owners[1:] != owners[:-1])
+    run_starts = np.flatnonzero(boundary)
+    run_ends = np.append(run_starts[1:], len(words))
+    run_owners = owners[run_starts]
+
+    runs_by_segment: dict[int, list[tuple[int, int, str | None]]] = {}
+    for first, last, owner in zip(run_starts.tolist(), run_ends.tolist(), run_owners.tolist(), strict=True):
+        base = int(offsets[owner])
+        runs_by_segment.setdefault(owner, []).append((first - base, last - base, word_speakers[first]))
+
+    result = []
+    for i, segment in enumerate(segments):
+        runs = runs_by_segment.get(i)
+        if not runs:
+            result.append(segment)
+        elif len(runs) == 1:
+            segment.speaker = runs[0][2]
+            result.append(segment)
+        else:
+            result.extend(_split_by_speaker(segment, segment.words, runs))
+
+    transcription.segments = result
     return transcription
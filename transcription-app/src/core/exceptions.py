@@ -130,6 +130,18 @@ class ModelLoadError(ModelError):
         self.model_name = model_name
 
 
+class ModelInUseError(ModelError):
+    """Modèle partagé utilisé par un autre traitement: ni changement ni déchargement."""
+
+    def __init__(self, model_name: str):
+        super().__init__(
+            f"Modèle en cours d'utilisation: {model_name}",
+            f"Le modèle '{model_name}' est utilisé par un autre traitement.\n\n"
+            "Réessayez une fois ce traitement terminé."
+        )
+        self.model_name = model_name
+
+
 class HuggingFaceTokenError(ModelError):
     """Token HuggingFace manquant ou invalide."""
 
@@ -226,6 +238,16 @@ class InsufficientMemoryError(SystemError):
         )
 
 
+class ModelHostError(SystemError):
+    """Erreur du démon des modèles (injoignable, ou job en échec côté démon)."""
+
+    def __init__(self, details: str = "", user_message: str | None = None):
+        super().__init__(
+            f"Démon des modèles: {details}",
+            user_message or f"Le service de modèles local a échoué.\n\n{details}"
+        )
+
+
 class DiskSpaceError(SystemError):
     """Espace disque insuffisant."""
 
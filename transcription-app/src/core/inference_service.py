@@ -0,0 +1,214 @@
+"""
+Service d'inférence du processus: file de priorité devant un Transcriber partagé.
+
+La fenêtre principale et le dialogue de batch partagent le même Transcriber.
+Leurs transcriptions passent par une file unique, servie par autant de
+threads que le modèle a de répliques CTranslate2 (transcription.num_workers):
+jamais plus d'appels concurrents que de répliques, et un fichier interactif
+passe devant les fichiers de batch en attente.
+"""
+import itertools
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Any
+
+from .audio_processor import DecodedAudio
+from .cancellation import POLL_SECONDS, CancellationToken, is_cancelled
+from .exceptions import TranscriptionCancelledError
+from .transcriber import Transcriber, TranscriptionResult
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Priorité d'un job (la plus petite valeur passe en premier)."""
+    INTERACTIVE = 0
+    BATCH = 10
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    audio: Path | DecodedAudio | None = field(compare=False, default=None)
+    language: str | None = field(compare=False, default=None)
+    progress_callback: Callable[[int, str], None] | None = field(compare=False, default=None)
+    cancel_token: CancellationToken | None = field(compare=False, default=None)
+    future: Future | None = field(compare=False, default=None)
+
+
+# Sentinelle d'arrêt, servie après tous les jobs en attente
+_STOP_PRIORITY = 1 << 30
+
+
+class InferenceService:
+    """
+    File de transcriptions devant un Transcriber partagé.
+
+    Usage:
+        service = InferenceService(transcriber)
+        result = service.transcribe(audio, priority=Priority.INTERACTIVE)
+        future = service.submit(audio, priority=Priority.BATCH)
+        ...
+        service.shutdown()
+    """
+
+    def __init__(self, transcriber: Transcriber, num_workers: int | None = None):
+        """
+        Args:
+            transcriber: Transcriber partagé par tous les demandeurs
+            num_workers: Jobs exécutés simultanément (défaut:
+                transcription.num_workers, une réplique CTranslate2 par job)
+        """
+        self.transcriber = transcriber
+        self.num_workers = max(1, num_workers or transcriber.config.num_workers)
+        self._queue: queue.PriorityQueue[_Job] = queue.PriorityQueue()
+        self._seq = itertools.count()  # FIFO à priorité égale
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _ensure_started(self) -> None:
+        """Démarre les threads au premier job (appelant: verrou tenu)."""
+        if self._threads:
+            return
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._serve, name=f"inference-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(
+        self,
+        audio: Path | DecodedAudio,
+        language: str | None = None,
+        progress_callback: Callable[[int, str], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+        priority: Priority = Priority.BATCH,
+    ) -> Future:
+        """
+        Met une transcription en file et retourne son Future.
+
+        Un job annulé avant d'avoir démarré échoue avec
+        TranscriptionCancelledError; en cours, il rend un résultat partiel.
+        Dès sa mise en file, le job réserve le modèle partagé: un autre
+        demandeur ne peut ni en changer ni le décharger avant sa fin.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Service d'inférence arrêté")
+            self._ensure_started()
+            self.transcriber.acquire()
+            future.add_done_callback(lambda _: self.transcriber.release())
+            self._queue.put(_Job(
+                priority=int(priority),
+                seq=next(self._seq),
+                audio=audio,
+                language=language,
+                progress_callback=progress_callback,
+                cancel_token=cancel_token,
+                future=future,
+            ))
+        return future
+
+    def transcribe(
+        self,
+        audio: Path | DecodedAudio,
+        language: str | None = None,
+        progress_callback: Callable[[int, str], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+        priority: Priority = Priority.BATCH,
+    ) -> TranscriptionResult:
+        """
+        Transcrit via la file et attend le résultat.
+
+        Le jeton est consulté pendant l'attente: annulé avant le démarrage
+        du job, celui-ci est retiré de la file et TranscriptionCancelledError
+        est levée sans attendre les jobs qui le précèdent.
+        """
+        future = self.submit(audio, language, progress_callback, cancel_token, priority)
+        while True:
+            try:
+                return future.result(timeout=POLL_SECONDS)
+            except FutureTimeoutError:
+                # Job déjà démarré: il s'arrête de lui-même à la fenêtre suivante
+                if is_cancelled(cancel_token) and future.cancel():
+                    raise TranscriptionCancelledError() from None
+
+    def pending(self) -> int:
+        """Nombre de jobs en attente (hors jobs en cours)."""
+        return self._queue.qsize()
+
+    def _serve(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job.future is None:
+                return  # Sentinelle d'arrêt
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            try:
+                if is_cancelled(job.cancel_token):
+                    raise TranscriptionCancelledError()
+                result = self.transcriber.transcribe(
+                    job.audio,
+                    language=job.language,
+                    progress_callback=job.progress_callback,
+                    cancel_token=job.cancel_token,
+                )
+            except Exception as e:
+                job.future.set_exception(e)
+            else:
+                job.future.set_result(result)
+
+    def client(self, priority: Priority) -> "PrioritizedTranscriber":
+        """Vue du Transcriber partagé dont les transcriptions passent par la file."""
+        return PrioritizedTranscriber(self, priority)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Termine les jobs en file puis arrête les threads."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for _ in self._threads:
+                self._queue.put(_Job(priority=_STOP_PRIORITY, seq=next(self._seq)))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class PrioritizedTranscriber:
+    """
+    Transcriber partagé vu par un demandeur: transcribe() passe par la file
+    du service avec la priorité du demandeur, le reste (load_model, model,
+    config...) est celui du Transcriber partagé.
+    """
+
+    def __init__(self, service: InferenceService, priority: Priority):
+        self._service = service
+        self.priority = priority
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._service.transcriber, name)
+
+    def transcribe(
+        self,
+        audio_path: Path | DecodedAudio,
+        language: str | None = None,
+        progress_callback: Callable[[int, str], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> TranscriptionResult:
+        return self._service.transcribe(
+            audio_path,
+            language=language,
+            progress_callback=progress_callback,
+            cancel_token=cancel_token,
+            priority=self.priority,
+        )
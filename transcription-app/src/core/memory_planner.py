@@ -0,0 +1,225 @@
+"""
+Contrôle d'admission mémoire avant un job.
+
+Sur une VM de 8 Go, charger large-v3 et Sortformer en même temps suffit à
+déclencher l'OOM killer. Avant chaque job, le planificateur compare
+l'empreinte des modèles nécessaires (mesurée, sinon estimée) à la mémoire
+disponible (limite cgroup comprise), puis choisit:
+
+1. les deux modèles en mémoire ensemble (cas normal);
+2. les modèles l'un après l'autre: Whisper est déchargé avant Sortformer;
+3. un modèle Whisper plus petit, si autorisé;
+4. sinon InsufficientMemoryError, avant tout chargement.
+
+Le Transcriber est partagé entre la fenêtre principale et le batch: tant
+qu'un autre job l'utilise (Transcriber.busy), son modèle n'est ni changé
+ni déchargé, et compte comme mémoire occupée.
+"""
+import logging
+import math
+from dataclasses import dataclass
+
+from ..utils.config import get_config
+from ..utils.memory import (
+    JOB_WORKING_SET_MB,
+    WHISPER_FOOTPRINT_MB,
+    available_memory_mb,
+    diarization_footprint_mb,
+    whisper_footprint_mb,
+)
+from .diarizer import Diarizer
+from .exceptions import InsufficientMemoryError, ModelInUseError
+from .model_registry import get_model_registry
+from .transcriber import Transcriber
+
+logger = logging.getLogger(__name__)
+
+# PCM int16 + copie float32, par seconde d'audio à 16 kHz
+_WORKING_BYTES_PER_SECOND = 16000 * (2 + 4)
+
+# Modèles jamais proposés en repli: spécialisés (français seul, distillé)
+_NO_DOWNGRADE_TO = frozenset({"large-v3-french"})
+
+
+@dataclass
+class MemoryPlan:
+    """Décision d'admission d'un job."""
+    model_name: str  # Modèle Whisper retenu
+    requested_model: str
+    sequential: bool = False  # Whisper déchargé avant le chargement de Sortformer
+    required_mb: int = 0
+    available_mb: int | None = None
+
+    @property
+    def downgraded(self) -> bool:
+        return self.model_name != self.requested_model
+
+
+def job_working_set_mb(duration: float | None) -> int:
+    """Mémoire de travail d'un job selon la durée audio (défaut: fichier de 2 h)."""
+    if duration is None:
+        return JOB_WORKING_SET_MB
+    return math.ceil(duration * _WORKING_BYTES_PER_SECOND / (1024 * 1024))
+
+
+class MemoryPlanner:
+    """
+    Décide, avant un job, quels modèles charger et comment.
+
+    Usage:
+        plan = MemoryPlanner().admit(transcriber, diarizer, use_diarization=True)
+        if plan.sequential:
+            ...  # transcription, transcriber.unload_model(), puis diarization
+    """
+
+    def __init__(self, reserve_mb: int | None = None, allow_downgrade: bool | None = None):
+        """
+        Args:
+            reserve_mb: Marge laissée au système et à l'interface
+            allow_downgrade: Autoriser un modèle Whisper plus petit
+        """
+        performance = get_config().performance
+        self.reserve_mb = performance.memory_reserve_mb if reserve_mb is None else reserve_mb
+        self.allow_downgrade = (
+            performance.allow_model_downgrade if allow_downgrade is None else allow_downgrade
+        )
+
+    def plan(
+        self,
+        transcriber: Transcriber,
+        diarizer: Diarizer | None,
+        use_diarization: bool,
+        duration: float | None = None,
+    ) -> MemoryPlan:
+        """
+        Calcule le plan sans rien charger ni décharger.
+
+        La mémoire utilisable est la mémoire disponible, plus les modèles
+        que ce job peut rendre: ceux de transcriber et diarizer, et ceux que
+        plus personne n'emprunte dans le registre. Si un autre job utilise
+        le modèle Whisper, le plan le garde tel quel et chargé.
+
+        Raises:
+            ModelInUseError: Le modèle en cours d'utilisation n'est pas celui
+                demandé et la rétrogradation est interdite
+        """
+        requested = transcriber.preferred_model
+        compute_type = transcriber.config.compute_type
+        use_diarization = use_diarization and diarizer is not None
+        busy = transcriber.busy
+        if busy and transcriber.model_name != requested and not self.allow_downgrade:
+            raise ModelInUseError(transcriber.model_name)
+        available = available_memory_mb()
+        if available is None:
+            return MemoryPlan(transcriber.model_name if busy else requested, requested)
+
+        own_keys = {None if busy else transcriber._model_key, diarizer._model_key if diarizer else None}
+        reclaimable = sum(
+            footprint
+            for key, footprint, refs in get_model_registry().entries()
+            if key in own_keys or refs == 0
+        )
+        usable = available - self.reserve_mb + reclaimable
+        working = job_working_set_mb(duration)
+        diarization = diarization_footprint_mb() if use_diarization else 0
+
+        if busy:
+            # Modèle utilisé par un autre job: déjà compté dans la mémoire occupée
+            candidates = [transcriber.model_name]
+        else:
+            candidates = [requested]
+            if self.allow_downgrade:
+                candidates += self._downgrade_candidates(transcriber, requested, compute_type)
+
+        for name in candidates:
+            whisper = 0 if busy and transcriber.model is not None else whisper_footprint_mb(name, compute_type)
+            together = whisper + diarization + working
+            if together <= usable:
+                return MemoryPlan(name, requested, False, together, usable)
+            one_at_a_time = max(whisper, diarization) + working
+            if use_diarization and not busy and one_at_a_time <= usable:
+                return MemoryPlan(name, requested, True, one_at_a_time, usable)
+
+        required = max(whisper_footprint_mb(candidates[-1], compute_type), diarization) + working
+        raise InsufficientMemoryError(required / 1024, max(usable, 0) / 1024)
+
+    @staticmethod
+    def _downgrade_candidates(transcriber: Transcriber, requested: str, compute_type: str) -> list[str]:
+        """
+        Modèles plus petits que `requested`, du plus gros au plus petit.
+
+        Seuls les modèles déjà téléchargés sont proposés: un repli ne doit
+        pas déclencher de téléchargement (application hors ligne).
+        """
+        base = whisper_footprint_mb(requested, compute_type)
+        smaller = [
+            name for name in WHISPER_FOOTPRINT_MB
+            if name not in _NO_DOWNGRADE_TO
+            and whisper_footprint_mb(name, compute_type) < base
+            and transcriber.model_manager.is_whisper_downloaded(name)
+        ]
+        return sorted(smaller, key=lambda name: whisper_footprint_mb(name, compute_type), reverse=True)
+
+    def admit(
+        self,
+        transcriber: Transcriber,
+        diarizer: Diarizer | None,
+        use_diarization: bool,
+        duration: float | None = None,
+    ) -> MemoryPlan:
+        """
+        Planifie le job et prépare la mémoire: modèle Whisper rétrogradé si
+        besoin, modèles inutiles pour ce job rendus et évincés.
+
+        Raises:
+            InsufficientMemoryError: Aucun modèle ne tient en mémoire
+        """
+        if not (transcriber.loads_locally and (diarizer is None or diarizer.loads_locally)):
+            # Modèles résidents dans le démon: rien à charger ici
+            return MemoryPlan(transcriber.model_name, transcriber.model_name)
+
+        plan = self.plan(transcriber, diarizer, use_diarization, duration)
+
+        if plan.model_name != transcriber.model_name:
+            if plan.downgraded:
+                logger.warning(
+                    f"RAM insuffisante pour {plan.requested_model}: "
+                    f"transcription avec {plan.model_name} (~{plan.available_mb} Mo utilisables)"
+                )
+            transcriber.switch_model(plan.model_name)
+
+        if plan.sequential:
+            logger.warning(
+                f"RAM insuffisante pour Whisper et Sortformer ensemble "
+                f"(~{plan.available_mb} Mo utilisables): chargement l'un après l'autre"
+            )
+            if diarizer is not None:
+                diarizer.unload()  # Rechargé après la transcription
+
+        if self._short_of(plan, transcriber, diarizer if use_diarization else None):
+            evicted = get_model_registry().evict_idle()
+            if evicted:
+                logger.info(f"{evicted} modèle(s) inutilisé(s) évincé(s) avant le job")
+            if not use_diarization and diarizer is not None and diarizer.model is not None \
+                    and self._short_of(plan, transcriber, None):
+                diarizer.unload()
+                get_model_registry().evict_idle()
+        return plan
+
+    def _short_of(self, plan: MemoryPlan, transcriber: Transcriber, diarizer: Diarizer | None) -> bool:
+        """Vrai si la part du plan pas encore chargée dépasse la mémoire libre."""
+        available = available_memory_mb()
+        if available is None:
+            return False
+        footprints = {key: footprint for key, footprint, _ in get_model_registry().entries()}
+        # Modèle d'un autre job: hors du plan, et pas rendu pour autant
+        resident = 0 if transcriber.busy else footprints.get(transcriber._model_key, 0)
+        if diarizer is not None:
+            resident += footprints.get(diarizer._model_key, 0)
+        return available - self.reserve_mb < plan.required_mb - resident
+
+    @staticmethod
+    def release_transcription_model(transcriber: Transcriber) -> None:
+        """Plan séquentiel: rend Whisper avant de charger Sortformer."""
+        transcriber.unload_model()
+        get_model_registry().evict_idle()
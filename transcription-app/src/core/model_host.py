@@ -0,0 +1,566 @@
+"""
+Démon local des modèles, partagé entre les lancements de l'application.
+
+Le démon garde les modèles Whisper et Sortformer en mémoire et exécute les
+jobs de transcription et de diarization envoyés par l'interface, le batch
+ou tout autre processus local. L'application n'a alors plus à recharger
+1,5 à 3 Go de poids à chaque lancement.
+
+Transport: socket Unix (tube nommé sous Windows) via
+multiprocessing.connection, authentifié par une clé lisible du seul
+utilisateur. Le PCM décodé passe par une mémoire partagée, pas par le
+socket.
+
+Démarrage:
+    python -m src.core.model_host [--diarization]
+"""
+import argparse
+import contextlib
+import getpass
+import logging
+import os
+import secrets
+import sys
+import threading
+from collections.abc import Callable
+from multiprocessing import connection, shared_memory
+from pathlib import Path
+
+import numpy as np
+
+from ..utils.config import DiarizationConfig, TranscriptionConfig, get_config
+from .audio_processor import DecodedAudio
+from .cancellation import CancellationToken, is_cancelled
+from .diarizer import DiarizationResult, Diarizer
+from .exceptions import DICTEAError, ModelHostError
+from .model_registry import get_model_registry, reset_model_registry
+from .transcriber import LANGUAGE_DETECTION_SECONDS, Transcriber, TranscriptionResult
+
+logger = logging.getLogger(__name__)
+
+SOCKET_FILENAME = "model-host.sock"
+KEY_FILENAME = "model-host.key"
+PIPE_PREFIX = r"\\.\pipe\dictea-model-host"
+
+# Intervalle de scrutation des messages d'annulation pendant un job
+POLL_SECONDS = 0.02
+
+UNREACHABLE_MESSAGE = "Le service de modèles local est injoignable."
+
+
+def host_address() -> tuple[str, str]:
+    """Adresse et famille du démon: socket Unix, ou tube nommé sous Windows."""
+    if sys.platform == "win32":
+        return f"{PIPE_PREFIX}-{getpass.getuser()}", "AF_PIPE"
+    return str(get_config().paths.temp.resolve() / SOCKET_FILENAME), "AF_UNIX"
+
+
+def _key_path() -> Path:
+    return get_config().paths.temp / KEY_FILENAME
+
+
+def _write_key() -> bytes:
+    """Génère la clé d'authentification du démon (lisible du seul utilisateur)."""
+    key = secrets.token_bytes(32)
+    path = _key_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def _share_audio(audio: Path | DecodedAudio) -> tuple[dict, shared_memory.SharedMemory | None]:
+    """Description de l'audio pour le démon; le PCM est copié en mémoire partagée."""
+    if not isinstance(audio, DecodedAudio):
+        return {"path": str(audio)}, None
+
+    shm = shared_memory.SharedMemory(create=True, size=max(audio.pcm.nbytes, 1))
+    np.ndarray(audio.pcm.shape, dtype=audio.pcm.dtype, buffer=shm.buf)[:] = audio.pcm
+    return {
+        "shm": shm.name,
+        "samples": audio.num_samples,
+        "dtype": str(audio.pcm.dtype),
+        "sample_rate": audio.sample_rate,
+        "path": str(audio.path),
+        "info": audio.info,
+    }, shm
+
+
+def _attach_shared(name: str) -> shared_memory.SharedMemory:
+    """Ouvre une mémoire partagée créée par le client, sans en prendre la propriété."""
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix":
+        # Avant Python 3.13, l'ouverture enregistre le segment auprès du
+        # resource_tracker du démon, qui le supprimerait à sa sortie
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class ModelHostServer:
+    """
+    Démon qui garde les modèles résidents et exécute les jobs des clients.
+
+    Chaque connexion est servie par un thread; plusieurs clients partagent
+    les mêmes modèles (via le registre des modèles).
+    """
+
+    def __init__(self, address: str | None = None, family: str | None = None):
+        if address is None:
+            address, family = host_address()
+        self.address = address
+        self.family = family or "AF_UNIX"
+        self._transcribers: dict[str, Transcriber] = {}
+        self._diarizer: Diarizer | None = None
+        self._models_lock = threading.Lock()
+        self._listener: connection.Listener | None = None
+        self._key = b""
+        self._stopping = threading.Event()
+
+    # -- Modèles -------------------------------------------------------------
+
+    def _get_transcriber(self, model_name: str | None) -> Transcriber:
+        model_name = model_name or get_config().transcription.model
+        with self._models_lock:
+            transcriber = self._transcribers.get(model_name)
+            if transcriber is None:
+                transcriber = Transcriber(model_name=model_name)
+                self._transcribers[model_name] = transcriber
+        transcriber.load_model()
+        return transcriber
+
+    def _get_diarizer(self) -> Diarizer:
+        with self._models_lock:
+            if self._diarizer is None:
+                self._diarizer = Diarizer()
+        self._diarizer.load()
+        return self._diarizer
+
+    def preload(self, diarization: bool = False) -> None:
+        """Charge le modèle Whisper configuré (et Sortformer) avant le premier job."""
+        self._get_transcriber(None)
+        if diarization:
+            self._get_diarizer()
+
+    # -- Service -------------------------------------------------------------
+
+    def start(self) -> None:
+        """Ouvre le socket d'écoute."""
+        if self.family == "AF_UNIX" and os.path.exists(self.address):
+            if ModelHostClient(self.address, self.family).available():
+                raise ModelHostError(f"déjà démarré sur {self.address}")
+            os.unlink(self.address)  # Socket laissé par un démon arrêté brutalement
+
+        self._key = _write_key()
+        self._listener = connection.Listener(self.address, family=self.family, authkey=self._key)
+        if self.family == "AF_UNIX":
+            os.chmod(self.address, 0o600)
+        logger.info(f"Démon des modèles à l'écoute sur {self.address}")
+
+    def serve_forever(self) -> None:
+        """Accepte les connexions jusqu'à shutdown()."""
+        if self._listener is None:
+            self.start()
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn = self._listener.accept()
+                except (OSError, EOFError, connection.AuthenticationError) as e:
+                    if not self._stopping.is_set():
+                        logger.warning(f"Connexion refusée: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self._listener.close()
+            if self.family == "AF_UNIX" and os.path.exists(self.address):
+                os.unlink(self.address)
+            reset_model_registry()
+            logger.info("Démon des modèles arrêté")
+
+    def shutdown(self) -> None:
+        """Arrête le démon (les jobs en cours se terminent sans réponse)."""
+        self._stopping.set()
+        # Débloque accept() par une connexion locale
+        with contextlib.suppress(OSError, EOFError, connection.AuthenticationError):
+            connection.Client(self.address, family=self.family, authkey=self._key).close()
+
+    def _handle(self, conn: connection.Connection) -> None:
+        handlers = {
+            "ping": self._ping,
+            "load": self._load,
+            "transcribe": self._transcribe,
+            "detect_language": self._detect_language,
+            "diarize": self._diarize,
+        }
+        with conn:
+            try:
+                while True:
+                    try:
+                        request = conn.recv()
+                    except EOFError:
+                        return
+                    op = request.get("op")
+                    if op == "cancel":
+                        continue  # Arrivé après la fin du job: rien à annuler
+                    if op == "shutdown":
+                        conn.send({"ok": True})
+                        self.shutdown()
+                        return
+                    handler = handlers.get(op)
+                    if handler is None:
+                        conn.send({"ok": False, "error": f"Opération inconnue: {op}"})
+                        continue
+                    self._reply(conn, handler, request)
+            except OSError as e:
+                logger.info(f"Client déconnecté: {e}")
+
+    def _reply(self, conn: connection.Connection, handler: Callable, request: dict) -> None:
+        """
+        Exécute un job dans un thread et transmet sa réponse. Pendant le job,
+        ce thread lit la connexion: un message "cancel" (ou la déconnexion
+        du client) annule le job à la fenêtre suivante.
+        """
+        token = CancellationToken()
+        send_lock = threading.Lock()
+        done = threading.Event()
+        response: dict = {}
+
+        def send(message: dict) -> None:
+            with send_lock:
+                conn.send(message)
+
+        def run() -> None:
+            try:
+                response.update(ok=True, result=handler(request, send, token))
+            except DICTEAError as e:
+                response.update(ok=False, error=str(e), user_message=e.user_message)
+            except Exception as e:
+                logger.exception(f"Échec du job {request.get('op')}")
+                response.update(ok=False, error=str(e))
+            finally:
+                done.set()
+
+        threading.Thread(target=run, daemon=True).start()
+        while not done.is_set():
+            if not conn.poll(POLL_SECONDS):
+                continue
+            try:
+                message = conn.recv()
+            except EOFError:
+                token.cancel()
+                done.wait()
+                return
+            if message.get("op") == "cancel":
+                token.cancel()
+        send(response)
+
+    def _run_on_audio(self, audio: dict, job: Callable[[Path | DecodedAudio], object]) -> object:
+        """Exécute job sur l'audio du client, lu en place dans la mémoire partagée."""
+        if "shm" not in audio:
+            return job(Path(audio["path"]))
+
+        shm = _attach_shared(audio["shm"])
+        try:
+            pcm = np.ndarray((audio["samples"],), dtype=audio["dtype"], buffer=shm.buf)
+            return job(DecodedAudio(
+                path=Path(audio["path"]),
+                pcm=pcm,
+                sample_rate=audio["sample_rate"],
+                info=audio["info"],
+            ))
+        finally:
+            pcm = None
+            try:
+                shm.close()
+            except BufferError:
+                # Une vue sur le PCM survit au job: libérée par le ramasse-miettes
+                logger.debug("Mémoire partagée encore référencée après le job")
+
+    def _ping(self, request: dict, send: Callable, token: CancellationToken) -> dict:
+        return {"pid": os.getpid(), "models": [str(key) for key in get_model_registry().loaded()]}
+
+    def _load(self, request: dict, send: Callable, token: CancellationToken) -> None:
+        self._get_transcriber(request.get("model"))
+        if request.get("diarization"):
+            self._get_diarizer()
+
+    def _transcribe(self, request: dict, send: Callable, token: CancellationToken) -> TranscriptionResult:
+        transcriber = self._get_transcriber(request.get("model"))
+
+        def progress(index: int, text: str) -> None:
+            send({"segment": (index, text)})
+
+        return self._run_on_audio(request["audio"], lambda audio: transcriber.transcribe(
+            audio,
+            language=request.get("language"),
+            progress_callback=progress if request.get("progress") else None,
+            cancel_token=token,
+        ))
+
+    def _detect_language(self, request: dict, send: Callable, token: CancellationToken) -> tuple[str, float]:
+        transcriber = self._get_transcriber(request.get("model"))
+        return self._run_on_audio(request["audio"], transcriber.detect_language)
+
+    def _diarize(self, request: dict, send: Callable, token: CancellationToken) -> DiarizationResult:
+        diarizer = self._get_diarizer()
+
+        def progress(message: str, percent: float) -> None:
+            send({"progress": (message, percent)})
+
+        return self._run_on_audio(request["audio"], lambda audio: diarizer.diarize(
+            audio,
+            min_speakers=request.get("min_speakers"),
+            max_speakers=request.get("max_speakers"),
+            progress_callback=progress if request.get("progress") else None,
+            cancel_token=token,
+        ))
+
+
+class ModelHostClient:
+    """
+    Client du démon des modèles (une connexion par appel).
+
+    Usage:
+        client = ModelHostClient()
+        if client.available():
+            result = client.transcribe(decoded_audio, language="fr")
+    """
+
+    def __init__(self, address: str | None = None, family: str | None = None):
+        if address is None:
+            address, family = host_address()
+        self.address = address
+        self.family = family or "AF_UNIX"
+
+    def _connect(self) -> connection.Connection:
+        try:
+            key = _key_path().read_bytes()
+            return connection.Client(self.address, family=self.family, authkey=key)
+        except (OSError, EOFError, connection.AuthenticationError) as e:
+            raise ModelHostError(str(e), UNREACHABLE_MESSAGE)
+
+    def available(self) -> bool:
+        """Vrai si un démon répond à cette adresse."""
+        try:
+            self.ping()
+            return True
+        except ModelHostError:
+            return False
+
+    def ping(self) -> dict:
+        return self._call({"op": "ping"})
+
+    def load(self, model_name: str | None = None, diarization: bool = False) -> None:
+        """Fait charger les modèles par le démon (sans effet s'ils sont résidents)."""
+        self._call({"op": "load", "model": model_name, "diarization": diarization})
+
+    def shutdown(self) -> None:
+        self._call({"op": "shutdown"})
+
+    def transcribe(
+        self,
+        audio: Path | DecodedAudio,
+        model_name: str | None = None,
+        language: str | None = None,
+        progress_callback: Callable[[int, str], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> TranscriptionResult:
+        """Transcrit via le démon (mêmes paramètres que Transcriber.transcribe)."""
+        def on_message(message: dict) -> None:
+            if progress_callback and "segment" in message:
+                progress_callback(*message["segment"])
+
+        request = {
+            "op": "transcribe",
+            "model": model_name,
+            "language": language,
+            "progress": progress_callback is not None,
+        }
+        return self._call(request, audio, on_message, cancel_token)
+
+    def detect_language(self, audio: DecodedAudio, model_name: str | None = None) -> tuple[str, float]:
+        """Détecte la langue via le démon (même retour que Transcriber.detect_language)."""
+        return self._call({"op": "detect_language", "model": model_name}, audio)
+
+    def diarize(
+        self,
+        audio: Path | DecodedAudio,
+        min_speakers: int | None = None,
+        max_speakers: int | None = None,
+        progress_callback: Callable[[str, float], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> DiarizationResult:
+        """Diarization via le démon (mêmes paramètres que Diarizer.diarize)."""
+        def on_message(message: dict) -> None:
+            if progress_callback and "progress" in message:
+                progress_callback(*message["progress"])
+
+        request = {
+            "op": "diarize",
+            "min_speakers": min_speakers,
+            "max_speakers": max_speakers,
+            "progress": progress_callback is not None,
+        }
+        return self._call(request, audio, on_message, cancel_token)
+
+    def _call(
+        self,
+        request: dict,
+        audio: Path | DecodedAudio | None = None,
+        on_message: Callable[[dict], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+    ):
+        """Envoie une requête et attend sa réponse, en relayant progression et annulation."""
+        shm = None
+        if audio is not None:
+            request["audio"], shm = _share_audio(audio)
+        try:
+            with self._connect() as conn:
+                conn.send(request)
+                cancel_sent = False
+                while True:
+                    if not cancel_sent and is_cancelled(cancel_token):
+                        conn.send({"op": "cancel"})
+                        cancel_sent = True
+                    if not conn.poll(POLL_SECONDS):
+                        continue
+                    message = conn.recv()
+                    if "ok" not in message:
+                        if on_message:
+                            on_message(message)
+                        continue
+                    if not message["ok"]:
+                        raise ModelHostError(message["error"], message.get("user_message"))
+                    return message.get("result")
+        except (OSError, EOFError) as e:
+            raise ModelHostError(str(e), UNREACHABLE_MESSAGE)
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+
+class HostedTranscriber(Transcriber):
+    """
+    Transcriber dont le modèle réside dans le démon: même interface, aucun
+    poids chargé dans le processus.
+    """
+
+    loads_locally = False
+
+    def __init__(
+        self,
+        client: ModelHostClient,
+        model_name: str | None = None,
+        config: TranscriptionConfig | None = None,
+    ):
+        super().__init__(model_name=model_name, config=config)
+        self.client = client
+
+    def load_model(
+        self,
+        progress_callback: Callable[[str, float], None] | None = None,
+        cpu_threads: int | None = None,
+    ) -> None:
+        with self._load_lock:
+            if self.model is not None:
+                return
+            self.client.load(self.model_name)
+            self.model = self.client  # Modèle prêt côté démon
+        if progress_callback:
+            progress_callback("Modèle prêt", 100.0)
+
+    def unload_model(self) -> None:
+        # Le démon garde le modèle résident pour les prochains lancements
+        self.model = None
+
+    def transcribe(
+        self,
+        audio_path: Path | DecodedAudio,
+        language: str | None = None,
+        progress_callback: Callable[[int, str], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> TranscriptionResult:
+        return self.client.transcribe(
+            audio_path,
+            model_name=self.model_name,
+            language=language or self.config.language,
+            progress_callback=progress_callback,
+            cancel_token=cancel_token,
+        )
+
+    def detect_language(self, audio: DecodedAudio) -> tuple[str, float]:
+        # Seul l'extrait analysé transite par la mémoire partagée
+        end = int(LANGUAGE_DETECTION_SECONDS * audio.sample_rate)
+        return self.client.detect_language(audio.slice(0, end), model_name=self.model_name)
+
+
+class HostedDiarizer(Diarizer):
+    """Diarizer dont le modèle Sortformer réside dans le démon."""
+
+    loads_locally = False
+
+    def __init__(self, client: ModelHostClient, config: DiarizationConfig | None = None):
+        super().__init__(config)
+        self.client = client
+
+    def load(self, progress_callback: Callable[[str, float], None] | None = None) -> None:
+        with self._load_lock:
+            if self.model is not None:
+                return
+            self.client.load(diarization=True)
+            self.model = self.client
+        if progress_callback:
+            progress_callback("Diarization prête", 100.0)
+
+    def unload(self) -> None:
+        self.model = None
+
+    def diarize(
+        self,
+        audio_path: Path | DecodedAudio,
+        min_speakers: int | None = None,
+        max_speakers: int | None = None,
+        progress_callback: Callable[[str, float], None] | None = None,
+        num_threads: int | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> DiarizationResult:
+        # num_threads ignoré: le démon répartit ses propres threads
+        return self.client.diarize(
+            audio_path,
+            min_speakers=min_speakers,
+            max_speakers=max_speakers,
+            progress_callback=progress_callback,
+            cancel_token=cancel_token,
+        )
+
+
+def hosted_client() -> ModelHostClient | None:
+    """Client du démon s'il est activé (performance.model_host) et joignable."""
+    if not get_config().performance.model_host:
+        return None
+    client = ModelHostClient()
+    if not client.available():
+        logger.info("Démon des modèles injoignable, modèles chargés localement")
+        return None
+    return client
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Démon local des modèles de transcription")
+    parser.add_argument("--diarization", action="store_true", help="Précharger aussi Sortformer")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    server = ModelHostServer()
+    server.start()
+    server.preload(diarization=args.diarization)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Cycle de vie des modèles de l'application interactive.
+
+Les modèles configurés sont préchargés en arrière-plan une fois la fenêtre
+affichée: la première transcription ne paie plus le temps de chargement, et
+le démarrage (NFR-PERF-03) n'attend pas. Après une période d'inactivité, ils
+sont déchargés pour rendre la RAM aux autres applications du poste.
+"""
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .diarizer import Diarizer
+from .model_registry import get_model_registry
+from .pipeline import concurrent_thread_split
+from .transcriber import Transcriber
+
+logger = logging.getLogger(__name__)
+
+
+class ModelLifecycle:
+    """
+    Préchargement et déchargement sur inactivité des modèles d'une fenêtre.
+
+    Usage:
+        lifecycle = ModelLifecycle(transcriber, diarizer, idle_seconds=900)
+        lifecycle.preload()
+        with lifecycle.in_use():
+            transcriber.transcribe(audio)
+        ...
+        lifecycle.shutdown()
+    """
+
+    def __init__(
+        self,
+        transcriber: Transcriber,
+        diarizer: Diarizer | None = None,
+        idle_seconds: float = 0,
+    ):
+        """
+        Args:
+            transcriber: Transcriber dont le modèle est géré
+            diarizer: Diarizer dont le modèle est géré (optionnel)
+            idle_seconds: Inactivité avant déchargement (0 = jamais)
+        """
+        self.transcriber = transcriber
+        self.diarizer = diarizer
+        self.idle_seconds = idle_seconds
+
+        # Protège le compteur d'utilisations et le minuteur: un déchargement
+        # ne peut pas commencer pendant qu'un traitement démarre
+        self._lock = threading.Lock()
+        self._users = 0
+        self._last_used = time.monotonic()
+        self._timer: threading.Timer | None = None
+        self._preload_thread: threading.Thread | None = None
+        self._closed = False
+
+    def preload(self, diarization: bool = True) -> threading.Thread:
+        """
+        Charge les modèles dans un thread d'arrière-plan et retourne ce thread.
+        Un traitement lancé entre-temps attend la fin du chargement en cours
+        au lieu de charger une seconde fois.
+
+        Args:
+            diarization: Précharger aussi le modèle de diarization
+        """
+        thread = threading.Thread(
+            target=self._preload, args=(diarization,), name="model-preload", daemon=True
+        )
+        self._preload_thread = thread
+        thread.start()
+        return thread
+
+    def _preload(self, diarization: bool) -> None:
+        start = time.perf_counter()
+        # Avec la diarization, Whisper prend d'emblée sa part des threads du
+        # pipeline concurrent: ce nombre ne change plus une fois chargé
+        split = concurrent_thread_split(self.transcriber) if diarization and self.diarizer else None
+        try:
+            self.transcriber.load_model(cpu_threads=split[0] if split else None)
+            if diarization and self.diarizer is not None:
+                self.diarizer.load()
+        except Exception as e:
+            # Le traitement rechargera et signalera l'erreur à l'utilisateur
+            logger.warning(f"Préchargement des modèles impossible: {e}")
+            return
+        logger.info(f"Modèles préchargés en {time.perf_counter() - start:.1f}s")
+        self._touch()
+
+    @contextmanager
+    def in_use(self) -> Iterator[None]:
+        """Marque les modèles comme utilisés pendant le bloc."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def acquire(self) -> None:
+        """Début d'un traitement: suspend le déchargement sur inactivité."""
+        with self._lock:
+            self._users += 1
+            self._cancel_timer()
+
+    def release(self) -> None:
+        """Fin d'un traitement: relance le délai d'inactivité."""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+        self._touch()
+
+    def _touch(self) -> None:
+        """Note une utilisation et réarme le minuteur d'inactivité."""
+        with self._lock:
+            self._last_used = time.monotonic()
+            if self._users or self._closed or self.idle_seconds <= 0:
+                return
+            self._cancel_timer()
+            self._timer = threading.Timer(self.idle_seconds, self._on_idle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        """Annule le minuteur en cours (appelant: verrou tenu)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_idle(self) -> None:
+        with self._lock:
+            idle = time.monotonic() - self._last_used
+            if self._users or self._closed or idle < self.idle_seconds:
+                return
+            self._timer = None
+            self.unload()
+        logger.info(f"Modèles déchargés après {idle / 60:.0f} min d'inactivité")
+
+    def unload(self) -> None:
+        """Rend les modèles et libère ceux que plus personne n'emprunte."""
+        self.transcriber.unload_model()
+        if self.diarizer is not None:
+            self.diarizer.unload()
+        get_model_registry().evict_idle()
+
+    def shutdown(self) -> None:
+        """Arrête le minuteur et décharge les modèles (fermeture de l'application)."""
+        with self._lock:
+            self._closed = True
+            self._cancel_timer()
+        self.unload()
@@ -0,0 +1,182 @@
+"""
+Registre des modèles chargés en mémoire, partagé par tout le processus.
+
+Transcriber et Diarizer empruntent leurs modèles au registre au lieu de les
+posséder: deux Transcriber de même configuration partagent le même
+WhisperModel, et plusieurs modèles (medium et large-v3-french par exemple)
+peuvent cohabiter sous un plafond de RAM. Les modèles non empruntés sont
+conservés pour un prochain usage et évincés du moins récemment utilisé au
+plus récent quand la place manque.
+"""
+import gc
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..utils.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    model: Any
+    footprint_mb: int
+    refs: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ModelRegistry:
+    """
+    Modèles chargés, comptés par référence, avec éviction LRU.
+
+    Usage:
+        registry = get_model_registry()
+        model = registry.acquire(key, loader, footprint_mb)
+        ...
+        registry.release(key)
+    """
+
+    def __init__(self, ceiling_mb: int):
+        self.ceiling_mb = ceiling_mb
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        # Un verrou par clé: deux threads ne chargent pas le même modèle,
+        # mais deux modèles différents se chargent en parallèle
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+
+    @property
+    def used_mb(self) -> int:
+        with self._lock:
+            return sum(e.footprint_mb for e in self._entries.values())
+
+    def loaded(self) -> list[Hashable]:
+        """Clés des modèles en mémoire, du moins au plus récemment utilisé."""
+        with self._lock:
+            return list(self._entries)
+
+    def entries(self) -> list[tuple[Hashable, int, int]]:
+        """(clé, empreinte en Mo, nombre d'emprunts) des modèles en mémoire."""
+        with self._lock:
+            return [(key, e.footprint_mb, e.refs) for key, e in self._entries.items()]
+
+    def refcount(self, key: Hashable) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.refs if entry else 0
+
+    def _borrow(self, key: Hashable) -> Any | None:
+        """Emprunte un modèle déjà chargé (appelant: verrou tenu)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.refs += 1
+        entry.last_used = time.monotonic()
+        self._entries.move_to_end(key)
+        return entry.model
+
+    def acquire(self, key: Hashable, loader: Callable[[], Any], footprint_mb: int) -> Any:
+        """
+        Emprunte un modèle, en le chargeant avec `loader` s'il n'est pas en
+        mémoire. Chaque acquire doit être suivi d'un release.
+
+        Args:
+            key: Identifiant du modèle (nom, précision, threads...)
+            loader: Fonction de chargement (appelée hors du verrou global)
+            footprint_mb: Empreinte RAM estimée du modèle
+        """
+        with self._lock:
+            model = self._borrow(key)
+            if model is not None:
+                return model
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                # Chargé par un autre thread pendant l'attente
+                model = self._borrow(key)
+                if model is not None:
+                    return model
+                self._make_room(footprint_mb)
+
+            model = loader()
+
+            with self._lock:
+                self._entries[key] = _Entry(model=model, footprint_mb=footprint_mb, refs=1)
+            logger.info(f"Modèle {key} en mémoire (~{footprint_mb} Mo, total ~{self.used_mb} Mo)")
+            return model
+
+    def release(self, key: Hashable) -> None:
+        """Rend un modèle emprunté; il reste en mémoire jusqu'à éviction."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.refs == 0:
+                logger.warning(f"Libération d'un modèle non emprunté: {key}")
+                return
+            entry.refs -= 1
+            entry.last_used = time.monotonic()
+
+    def _make_room(self, needed_mb: int) -> None:
+        """Évince les modèles non empruntés (LRU) jusqu'à faire de la place (verrou tenu)."""
+        used = sum(e.footprint_mb for e in self._entries.values())
+        for key in list(self._entries):
+            if used + needed_mb <= self.ceiling_mb:
+                return
+            entry = self._entries[key]
+            if entry.refs == 0:
+                used -= entry.footprint_mb
+                self._evict(key)
+
+        if used + needed_mb > self.ceiling_mb:
+            logger.warning(
+                f"Plafond des modèles dépassé: {used + needed_mb} Mo > {self.ceiling_mb} Mo "
+                f"(modèles en cours d'utilisation)"
+            )
+
+    def _evict(self, key: Hashable) -> None:
+        del self._entries[key]
+        gc.collect()
+        logger.info(f"Modèle {key} évincé de la mémoire")
+
+    def evict_idle(self) -> int:
+        """Décharge tous les modèles non empruntés. Retourne leur nombre."""
+        with self._lock:
+            idle = [key for key, entry in self._entries.items() if entry.refs == 0]
+            for key in idle:
+                self._evict(key)
+        return len(idle)
+
+    def clear(self) -> None:
+        """Décharge tous les modèles, empruntés ou non (fermeture de l'application)."""
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+        gc.collect()
+
+
+# Singleton global (un registre par processus)
+_registry: ModelRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Retourne le registre du processus (plafond: performance.model_cache_mb)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            performance = get_config().performance
+            _registry = ModelRegistry(performance.model_cache_mb or performance.memory_budget_mb)
+        return _registry
+
+
+def reset_model_registry() -> None:
+    """Décharge tous les modèles et oublie le registre."""
+    global _registry
+    with _registry_lock:
+        if _registry is not None:
+            _registry.clear()
+        _registry = None
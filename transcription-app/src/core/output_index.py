@@ -0,0 +1,110 @@
+"""
+Index des sorties de transcription (fichier annexe du dossier de sortie).
+
+Associe l'empreinte du contenu audio et les paramètres effectifs aux
+fichiers produits. Un fichier renommé ou copié est ainsi reconnu, et une
+sortie produite avec d'autres réglages n'est plus prise pour à jour.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = ".transcriptions.json"
+
+
+def output_key(input_hash: str, params: dict) -> str:
+    """Clé d'index: empreinte du contenu + paramètres qui déterminent la sortie."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(input_hash.encode())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class OutputIndex:
+    """
+    Index JSON d'un dossier de sortie.
+
+    Les sorties sont enregistrées par nom (relatif au dossier): l'index
+    reste valide si le dossier est déplacé. Une entrée dont un fichier a
+    disparu est ignorée.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.path = self.directory / INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = self._read()
+
+    def _read(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Index de sortie illisible, ignoré ({self.path}): {e}")
+            return {}
+
+    def lookup(self, key: str) -> list[Path] | None:
+        """Sorties existantes pour une clé, ou None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        outputs = [self.directory / name for name in entry["outputs"]]
+        if not outputs or not all(p.exists() for p in outputs):
+            return None
+        return outputs
+
+    def full_hash(self, key: str) -> str | None:
+        """Empreinte complète du fichier source d'une entrée (None si inconnue)."""
+        entry = self._entries.get(key)
+        return entry.get("full_hash") if entry else None
+
+    def source_stamp(self, key: str) -> tuple[Path, list[int]] | None:
+        """Chemin et (taille, mtime_ns) du fichier source à l'enregistrement."""
+        entry = self._entries.get(key)
+        if not entry or entry.get("source_stamp") is None:
+            return None
+        return Path(entry["source_path"]), entry["source_stamp"]
+
+    def set_full_hash(self, key: str, full_hash: str) -> None:
+        """Complète après coup l'empreinte complète d'une entrée."""
+        with self._lock:
+            if key in self._entries:
+                self._entries[key]["full_hash"] = full_hash
+                self._write()
+
+    def add(self, key: str, source: Path, outputs: list[Path], full_hash: str | None = None) -> None:
+        """
+        Enregistre les sorties d'un fichier et réécrit l'index. Sans
+        empreinte complète, l'état du source (taille, mtime) permet de la
+        calculer plus tard tant qu'il n'a pas changé.
+        """
+        source = Path(source)
+        try:
+            stat = source.stat()
+            stamp = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            stamp = None
+        with self._lock:
+            self._entries[key] = {
+                "source": source.name,
+                "source_path": str(source.resolve()),
+                "source_stamp": stamp,
+                "outputs": [Path(p).name for p in outputs],
+                "full_hash": full_hash,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._write()
+
+    def _write(self) -> None:
+        """Écriture atomique (fichier temporaire puis renommage)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._entries, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
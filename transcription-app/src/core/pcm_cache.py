@@ -0,0 +1,258 @@
+"""
+Cache disque du PCM décodé (16 kHz mono int16), adressé par contenu.
+
+Retranscrire le même fichier (autre modèle, autre langue, avec ou sans
+diarization) ne repaie pas le décodage FFmpeg: le PCM est relu via
+np.memmap, sans copie. La taille du cache est bornée (éviction LRU).
+
+La clé (content_hash) n'échantillonne que trois blocs du fichier: chaque
+entrée garde l'empreinte complète du fichier source, comparée avant toute
+réutilisation. Les fichiers déjà confirmés sont reconnus à leur taille et
+date de modification, sans relecture.
+"""
+import hashlib
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from ..utils.config import get_config
+from .audio_processor import AudioProcessor, DecodedAudio
+
+logger = logging.getLogger(__name__)
+
+# Taille des blocs échantillonnés pour l'empreinte rapide
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def content_hash(path: Path) -> str:
+    """
+    Empreinte rapide du contenu d'un fichier.
+
+    Hache la taille et trois blocs de 1 Mo (début, milieu, fin) au lieu du
+    fichier complet: quelques millisecondes même pour plusieurs Go, et
+    indépendant du nom ou de l'emplacement du fichier.
+    """
+    size = path.stat().st_size
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(size).encode())
+
+    with open(path, "rb") as f:
+        if size <= 3 * _HASH_BLOCK_SIZE:
+            digest.update(f.read())
+        else:
+            for offset in (0, size // 2, size - _HASH_BLOCK_SIZE):
+                f.seek(offset)
+                digest.update(f.read(_HASH_BLOCK_SIZE))
+
+    return digest.hexdigest()
+
+
+def full_content_hash(path: Path) -> str:
+    """
+    Empreinte du fichier complet: confirme qu'une correspondance trouvée
+    par content_hash (blocs échantillonnés) est bien le même contenu.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while block := f.read(_HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PCMCache:
+    """
+    Cache du PCM décodé sous PathsConfig.temp.
+
+    Chaque entrée est un fichier brut `<hash>.pcm` (int16) accompagné de
+    `<hash>.json`: métadonnées audio, empreinte complète du source et
+    fichiers déjà confirmés (chemin -> [taille, mtime_ns]). La date de
+    modification du PCM sert d'horodatage LRU: elle est rafraîchie à
+    chaque lecture.
+    """
+
+    PCM_SUFFIX = ".pcm"
+    META_SUFFIX = ".json"
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        max_size_mb: int | None = None,
+    ):
+        config = get_config()
+        self.cache_dir = cache_dir or config.paths.temp / "pcm_cache"
+        self.max_size_mb = (
+            max_size_mb if max_size_mb is not None else config.performance.pcm_cache_max_mb
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size_mb > 0
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return (
+            self.cache_dir / f"{key}{self.PCM_SUFFIX}",
+            self.cache_dir / f"{key}{self.META_SUFFIX}",
+        )
+
+    def get(self, file_path: Path, key: str | None = None) -> DecodedAudio | None:
+        """Retourne l'audio en cache (memmap lecture seule) ou None."""
+        key = key or content_hash(file_path)
+        pcm_path, meta_path = self._paths(key)
+
+        if not pcm_path.exists() or not meta_path.exists():
+            return None
+
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if not self._confirm(file_path, meta_path, meta):
+                return None
+            if pcm_path.stat().st_size == 0:
+                pcm = np.zeros(0, dtype=np.int16)
+            else:
+                pcm = np.memmap(pcm_path, dtype=np.int16, mode="r")
+            os.utime(pcm_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrée de cache PCM illisible {key}: {e}")
+            return None
+
+        logger.info(f"Cache PCM: {file_path.name} ({key})")
+        return DecodedAudio(
+            path=file_path,
+            pcm=pcm,
+            sample_rate=AudioProcessor.WHISPER_SAMPLE_RATE,
+            info=meta["info"],
+        )
+
+    @staticmethod
+    def _stamp(path: Path) -> list[int]:
+        stat = path.stat()
+        return [stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def _write_meta(meta_path: Path, meta: dict) -> None:
+        """Écriture atomique: plusieurs processus peuvent lire l'entrée."""
+        tmp_path = meta_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(tmp_path, meta_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _confirm(self, file_path: Path, meta_path: Path, meta: dict) -> bool:
+        """
+        Vérifie que l'entrée est bien celle du fichier: un fichier modifié
+        hors des blocs échantillonnés garde la même clé. Un écart est un
+        défaut de cache.
+        """
+        full_hash = meta.get("full_hash")
+        if full_hash is None:
+            return False  # Entrée d'un format antérieur: redécodée
+        source = str(file_path.resolve())
+        stamp = self._stamp(file_path)
+        if meta["sources"].get(source) == stamp:
+            return True
+        if full_content_hash(file_path) != full_hash:
+            logger.info(f"Cache PCM: contenu de {file_path.name} différent de l'entrée, redécodage")
+            return False
+        meta["sources"][source] = stamp
+        self._write_meta(meta_path, meta)
+        return True
+
+    def store(
+        self,
+        file_path: Path,
+        processor: AudioProcessor,
+        key: str | None = None,
+    ) -> DecodedAudio:
+        """
+        Décode un fichier directement vers le cache (streaming, mémoire
+        constante) et le retourne en memmap.
+        """
+        info = processor.validate_audio_file(file_path)
+        key = key or content_hash(file_path)
+        pcm_path, meta_path = self._paths(key)
+        # Date relevée avant la lecture: une modification pendant le décodage
+        # imposera une nouvelle vérification
+        stamp = self._stamp(file_path)
+        meta = {
+            "info": info,
+            "full_hash": full_content_hash(file_path),
+            "sources": {str(file_path.resolve()): stamp},
+        }
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Écriture atomique: plusieurs processus peuvent décoder le même fichier
+        tmp_path = pcm_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in processor.iter_pcm_chunks(file_path):
+                    f.write(chunk.tobytes())
+            self._write_meta(meta_path, meta)
+            os.replace(tmp_path, pcm_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        self.evict(keep={key})
+
+        audio = self.get(file_path, key)
+        if audio is None:
+            raise OSError(f"Impossible de relire l'entrée de cache {key}")
+        return audio
+
+    def get_or_decode(self, file_path: Path, processor: AudioProcessor) -> DecodedAudio:
+        """Retourne l'audio depuis le cache, en le décodant au premier accès."""
+        key = content_hash(file_path)
+        return self.get(file_path, key) or self.store(file_path, processor, key)
+
+    def size_bytes(self) -> int:
+        """Taille totale occupée par le cache."""
+        if not self.cache_dir.exists():
+            return 0
+        return sum(f.stat().st_size for f in self.cache_dir.iterdir() if f.is_file())
+
+    def evict(self, max_size_mb: int | None = None, keep: set[str] | None = None) -> int:
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à revenir
+        sous le budget.
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        budget = (self.max_size_mb if max_size_mb is None else max_size_mb) * 1024 * 1024
+        keep = keep or set()
+
+        entries = []
+        total = 0
+        for pcm_path in self.cache_dir.glob(f"*{self.PCM_SUFFIX}"):
+            stat = pcm_path.stat()
+            entries.append((stat.st_mtime, pcm_path, stat.st_size))
+            total += stat.st_size
+
+        removed = 0
+        for _, pcm_path, size in sorted(entries):
+            if total <= budget:
+                break
+            key = pcm_path.stem
+            if key in keep:
+                continue
+            try:
+                pcm_path.unlink()
+                pcm_path.with_suffix(self.META_SUFFIX).unlink(missing_ok=True)
+            except OSError as e:
+                # Fichier encore mappé (Windows): on le garde pour cette fois
+                logger.warning(f"Impossible d'évincer {pcm_path.name}: {e}")
+                continue
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"Cache PCM: {removed} entrée(s) évincée(s)")
+        return removed
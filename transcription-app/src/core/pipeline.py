@@ -0,0 +1,104 @@
+"""
+Exécution conjointe transcription + diarization.
+
+Les deux étapes sont indépendantes jusqu'à la fusion
+(assign_speakers_to_transcription): elles peuvent tourner en parallèle sur le
+même DecodedAudio, chacune avec sa part des threads CPU. La latence totale
+devient alors max(ASR, diarization) au lieu de la somme.
+"""
+import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from ..utils.config import get_config
+from .diarizer import DiarizationResult
+from .transcriber import Transcriber, TranscriptionResult
+
+logger = logging.getLogger(__name__)
+
+# En dessous, les deux étapes se disputeraient les mêmes cores
+MIN_CONCURRENT_THREADS = 4
+
+
+def total_cpu_threads() -> int:
+    """Budget de threads CPU (config transcription, sinon cores physiques)."""
+    return get_config().transcription.cpu_threads or (os.cpu_count() or 2) // 2 or 1
+
+
+def split_cpu_threads(total: int | None = None) -> tuple[int, int]:
+    """
+    Répartit le budget de threads entre transcription et diarization.
+
+    Whisper est l'étape la plus coûteuse: il reçoit les deux tiers des
+    threads, Sortformer le reste (au moins un).
+
+    Returns:
+        (threads transcription, threads diarization)
+    """
+    total = total or total_cpu_threads()
+    diarization = max(1, total // 3)
+    return max(1, total - diarization), diarization
+
+
+def use_concurrent_pipeline(total: int | None = None) -> bool:
+    """Indique si transcription et diarization doivent tourner en parallèle."""
+    if not get_config().performance.concurrent_diarization:
+        return False
+    return (total or total_cpu_threads()) >= MIN_CONCURRENT_THREADS
+
+
+def concurrent_thread_split(
+    transcriber: Transcriber, total: int | None = None
+) -> tuple[int, int] | None:
+    """
+    Répartition des threads pour un pipeline concurrent, ou None s'il doit
+    rester séquentiel.
+
+    Le nombre de threads CTranslate2 est fixé au chargement du modèle: un
+    modèle Whisper déjà chargé avec un autre nombre de threads que sa part
+    garderait tous ses cores et se disputerait le CPU avec la diarization.
+    """
+    if not use_concurrent_pipeline(total):
+        return None
+    asr_threads, diarization_threads = split_cpu_threads(total)
+    loaded = transcriber.loaded_cpu_threads
+    if loaded is not None and loaded != asr_threads:
+        logger.info(
+            f"Modèle Whisper chargé avec {loaded} threads (part concurrente: {asr_threads}): "
+            f"transcription puis diarization"
+        )
+        return None
+    return asr_threads, diarization_threads
+
+
+def run_transcription_and_diarization(
+    transcribe: Callable[[], TranscriptionResult],
+    diarize: Callable[[], DiarizationResult],
+    concurrent: bool = True,
+) -> tuple[TranscriptionResult, DiarizationResult]:
+    """
+    Exécute les deux étapes, en parallèle si `concurrent`.
+
+    La diarization tourne dans un thread dédié pendant que la transcription
+    s'exécute dans le thread appelant (les deux moteurs libèrent le GIL
+    pendant l'inférence). Une erreur de l'une des étapes est propagée après
+    la fin de l'autre.
+
+    Returns:
+        (résultat de transcription, résultat de diarization)
+    """
+    if not concurrent:
+        return transcribe(), diarize()
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarization") as pool:
+        diarization_future = pool.submit(diarize)
+        try:
+            transcription = transcribe()
+        finally:
+            # Attendre la diarization même en cas d'erreur: pas de thread orphelin
+            diarization_error = diarization_future.exception()
+
+    if diarization_error is not None:
+        raise diarization_error
+    return transcription, diarization_future.result()
@@ -0,0 +1,87 @@
+"""
+Stockage sur disque des résultats complets d'un batch.
+
+Un TranscriptionResult (segments, mots horodatés) pèse plusieurs Mo en
+objets Python: sur un batch de 1000 fichiers, les garder en mémoire jusqu'à
+la fin coûte des Go. Chaque résultat terminé est donc ajouté à un fichier
+JSONL et seule sa position reste en mémoire; il est relu à la demande.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..utils.config import get_config
+from .transcriber import TranscriptionResult
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIRNAME = "batch_results"
+
+# Fichiers laissés par un batch interrompu, supprimés au batch suivant
+STALE_SECONDS = 24 * 3600
+
+
+@dataclass(frozen=True)
+class ResultRef:
+    """Position d'un résultat dans le fichier du batch."""
+    path: Path
+    offset: int
+    length: int
+
+    def load(self) -> TranscriptionResult:
+        """Relit le résultat complet."""
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(self.length)
+        return TranscriptionResult.from_dict(json.loads(data))
+
+
+class ResultStore:
+    """
+    Fichier JSONL en ajout seul, un résultat par ligne.
+
+    Usage:
+        store = ResultStore()
+        ref = store.append(result)
+        ...
+        result = ref.load()
+    """
+
+    def __init__(self, directory: Path | None = None):
+        directory = directory or get_config().paths.temp / RESULTS_DIRNAME
+        directory.mkdir(parents=True, exist_ok=True)
+        self._prune(directory)
+
+        fd, path = tempfile.mkstemp(prefix="batch-", suffix=".jsonl", dir=directory)
+        self.path = Path(path)
+        self._file = os.fdopen(fd, "ab")
+        # Alimenté par le thread d'écriture et le thread principal du batch
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _prune(directory: Path) -> None:
+        cutoff = time.time() - STALE_SECONDS
+        for path in directory.glob("batch-*.jsonl"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                continue
+
+    def append(self, result: TranscriptionResult) -> ResultRef:
+        """Écrit un résultat et retourne sa position."""
+        line = json.dumps(result.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(line + b"\n")
+            self._file.flush()
+        return ResultRef(self.path, offset, len(line))
+
+    def close(self) -> None:
+        """Ferme le fichier (les résultats restent lisibles)."""
+        self._file.close()
@@ -5,14 +5,22 @@ Optimisé pour CPU Intel avec quantification int8.
 import gc
 import logging
 import os
+import threading
 from collections.abc import Callable, Iterator
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
-from faster_whisper import WhisperModel
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 
 from ..utils.config import TranscriptionConfig, get_config
+from ..utils.memory import measure_footprint, whisper_footprint_mb
 from ..utils.model_manager import ModelManager
+from .audio_processor import DecodedAudio
+from .cancellation import CancellationToken, as_completed_cancellable, is_cancelled
+from .exceptions import ModelInUseError
+from .model_registry import get_model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +43,7 @@ class TranscriptionResult:
     language: str
     language_probability: float
     duration: float
+    is_partial: bool = False  # Transcription annulée en cours: segments déjà produits
 
     def to_text(self, include_timestamps: bool = False, include_speakers: bool = True) -> str:
         """Convertit en texte formaté."""
@@ -60,6 +69,103 @@ class TranscriptionResult:
             lines.extend([str(i), f"{start_time} --> {end_time}", text, ""])
         return "\n".join(lines)
 
+    def to_dict(self) -> dict:
+        """Forme sérialisable (JSON)."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TranscriptionResult":
+        return cls(
+            segments=[TranscriptionSegment(**seg) for seg in data["segments"]],
+            language=data["language"],
+            language_probability=data["language_probability"],
+            duration=data["duration"],
+            is_partial=data.get("is_partial", False),
+        )
+
+
+def _to_segment(segment) -> TranscriptionSegment:
+    """Convertit un segment faster-whisper en TranscriptionSegment."""
+    return TranscriptionSegment(
+        start=segment.start,
+        end=segment.end,
+        text=segment.text,
+        words=[
+            {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+            for w in (segment.words or [])
+        ],
+        confidence=segment.avg_logprob if hasattr(segment, 'avg_logprob') else 0.0,
+    )
+
+
+# Modèle propre à chaque processus du pool de transcription par chunks
+_worker_model: WhisperModel | None = None
+
+# Pipeline du processus en mode batched (None: décodage séquentiel)
+_worker_pipeline: BatchedInferencePipeline | None = None
+
+# Jeton du processus, levé par le parent à l'annulation
+_worker_cancel_token: CancellationToken | None = None
+
+# Début de l'audio analysé pour détecter la langue (une fenêtre Whisper)
+LANGUAGE_DETECTION_SECONDS = 30.0
+
+
+def _init_chunk_worker(
+    model_path: str,
+    compute_type: str,
+    cpu_threads: int,
+    cancel_event=None,
+    batched: bool = False,
+) -> None:
+    """Initialise un processus du pool: charge son propre WhisperModel."""
+    global _worker_model, _worker_pipeline, _worker_cancel_token
+    _worker_cancel_token = CancellationToken(cancel_event)
+    os.environ["OMP_NUM_THREADS"] = str(cpu_threads)
+    os.environ["MKL_NUM_THREADS"] = str(cpu_threads)
+    _worker_model = WhisperModel(
+        model_path,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+    )
+    _worker_pipeline = BatchedInferencePipeline(model=_worker_model) if batched else None
+
+
+def _detect_chunk_language(payload: tuple | np.ndarray) -> tuple[str, float] | None:
+    """Détecte dans un processus du pool la langue d'un extrait (None si annulé)."""
+    from .chunking import load_chunk_payload
+
+    if is_cancelled(_worker_cancel_token):
+        return None
+    pcm = load_chunk_payload(payload)
+    language, probability, _ = _worker_model.detect_language(pcm.astype(np.float32) / 32768.0)
+    return language, probability
+
+
+def _transcribe_chunk(
+    payload: tuple | np.ndarray,
+    options: dict,
+) -> tuple[list[TranscriptionSegment], str, float] | None:
+    """
+    Transcrit un chunk dans un processus du pool (timestamps relatifs au chunk).
+
+    Retourne None si l'annulation précède le début du chunk; annulé en
+    cours, seuls les segments déjà décodés sont retournés.
+    """
+    from .chunking import load_chunk_payload
+
+    if is_cancelled(_worker_cancel_token):
+        return None
+    pcm = load_chunk_payload(payload)
+    segments_iter, info = (_worker_pipeline or _worker_model).transcribe(
+        pcm.astype(np.float32) / 32768.0,
+        word_timestamps=True,
+        **options,
+    )
+    segments = [_to_segment(s) for s in Transcriber._until_cancelled(segments_iter, _worker_cancel_token)]
+    return segments, info.language, info.language_probability
+
 
 def _format_time(seconds: float) -> str:
     """Formate un temps en MM:SS."""
@@ -82,9 +188,13 @@ class Transcriber:
     Optimisée pour:
     - CPU Intel i7 avec instructions AVX2
     - 16 Go RAM avec modèle medium int8
-    - Traitement par chunks pour fichiers longs
+    - Traitement par chunks pour fichiers longs (pool de processus si
+      parallel_workers > 1)
     """
 
+    # Le modèle est chargé dans ce processus (voir HostedTranscriber)
+    loads_locally = True
+
     def __init__(
         self,
         model_name: str | None = None,
@@ -92,8 +202,16 @@ class Transcriber:
     ):
         self.config = config or get_config().transcription
         self.model_name = model_name or self.config.model
+        # Modèle demandé; model_name peut être rétrogradé si la RAM manque
+        self.preferred_model = self.model_name
         self.model: WhisperModel | None = None
+        self._model_key: tuple | None = None  # Clé du modèle emprunté au registre
+        self._batched_pipeline: BatchedInferencePipeline | None = None
         self.model_manager = ModelManager()
+        # Préchargement en arrière-plan et workers peuvent charger en même temps
+        self._load_lock = threading.RLock()
+        # Transcriptions en cours ou en file sur ce Transcriber (voir acquire)
+        self._users = 0
 
         # Optimisations CPU Intel
         self._setup_cpu_optimizations()
@@ -109,98 +227,227 @@ class Transcriber:
         os.environ["MKL_NUM_THREADS"] = str(cpu_threads)
         os.environ["OMP_WAIT_POLICY"] = "PASSIVE"
 
+        self.cpu_threads = cpu_threads
         logger.info(f"CPU threads configurés: {cpu_threads}")
 
     def load_model(
         self,
         progress_callback: Callable[[str, float], None] | None = None,
+        cpu_threads: int | None = None,
     ) -> None:
         """
-        Charge le modèle Whisper en mémoire.
-        Télécharge si nécessaire.
+        Emprunte le modèle Whisper au registre des modèles, qui le charge
+        (et le télécharge) s'il n'est pas déjà en mémoire.
+
+        Args:
+            progress_callback: Callback de progression
+            cpu_threads: Nombre de threads d'inférence (défaut: config), par
+                exemple pour laisser des cores à la diarization concurrente
         """
-        if self.model is not None:
-            logger.info("Modèle déjà chargé")
-            return
+        with self._load_lock:
+            if self.model is not None:
+                logger.info("Modèle déjà chargé")
+                return
+
+            threads = cpu_threads or self.config.cpu_threads or (os.cpu_count() // 2)
+            workers = max(1, self.config.num_workers)
+            key = ("whisper", self.model_name, self.config.compute_type, threads, workers)
+
+            def load() -> WhisperModel:
+                # Télécharger si nécessaire
+                model_path = self.model_manager.download_whisper_model(
+                    self.model_name,
+                    progress_callback=progress_callback,
+                )
+
+                if progress_callback:
+                    progress_callback("Chargement du modèle en mémoire...", 50.0)
+
+                logger.info(f"Chargement du modèle {self.model_name} ({self.config.compute_type})...")
+                with measure_footprint(("whisper", self.model_name, self.config.compute_type)):
+                    return WhisperModel(
+                        str(model_path),
+                        device="cpu",
+                        compute_type=self.config.compute_type,
+                        cpu_threads=threads,
+                        num_workers=workers,
+                    )
+
+            footprint = whisper_footprint_mb(self.model_name, self.config.compute_type)
+            self.model = get_model_registry().acquire(key, load, footprint)
+            self._model_key = key
 
-        # Télécharger si nécessaire
-        model_path = self.model_manager.download_whisper_model(
-            self.model_name,
-            progress_callback=progress_callback,
-        )
+            if progress_callback:
+                progress_callback("Modèle prêt", 100.0)
+
+            logger.info("Modèle chargé avec succès")
+
+    @property
+    def loaded_cpu_threads(self) -> int | None:
+        """Threads d'inférence du modèle chargé (None si aucun modèle)."""
+        if self.model is None or self._model_key is None:
+            return None
+        return self._model_key[3]
+
+    @property
+    def busy(self) -> bool:
+        """Vrai si une transcription utilise le modèle ou l'attend en file."""
+        return self._users > 0
+
+    @contextmanager
+    def in_use(self) -> Iterator[None]:
+        """Marque le modèle comme utilisé pendant le bloc."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def acquire(self) -> None:
+        """Début d'une transcription: le modèle ne peut plus être changé ni déchargé."""
+        with self._load_lock:
+            self._users += 1
+
+    def release(self) -> None:
+        """Fin d'une transcription."""
+        with self._load_lock:
+            self._users = max(0, self._users - 1)
+
+    def switch_model(self, model_name: str) -> None:
+        """
+        Change de modèle Whisper; le nouveau est chargé au prochain usage.
 
-        if progress_callback:
-            progress_callback("Chargement du modèle en mémoire...", 50.0)
+        Raises:
+            ModelInUseError: Une transcription utilise le modèle actuel
+        """
+        with self._load_lock:
+            if model_name == self.model_name:
+                return
+            if self._users:
+                raise ModelInUseError(self.model_name)
+            self.unload_model()
+            self.model_name = model_name
+            logger.info(f"Modèle Whisper: {model_name}")
 
-        logger.info(f"Chargement du modèle {self.model_name} ({self.config.compute_type})...")
+    def unload_model(self) -> None:
+        """
+        Rend le modèle au registre. Il reste en mémoire pour un prochain
+        usage tant que le plafond RAM n'impose pas de l'évincer. Sans effet
+        tant qu'une transcription l'utilise.
+        """
+        with self._load_lock:
+            if self.model is not None and self._users:
+                logger.info("Modèle en cours d'utilisation: conservé")
+            elif self.model is not None:
+                self._batched_pipeline = None
+                self.model = None
+                if self._model_key is not None:
+                    get_model_registry().release(self._model_key)
+                    self._model_key = None
+                gc.collect()
+                logger.info("Modèle déchargé")
+
+    @staticmethod
+    def _prepare_input(audio: Path | DecodedAudio) -> str | np.ndarray:
+        """Retourne l'entrée à passer à faster-whisper (buffer déjà décodé ou chemin)."""
+        if isinstance(audio, DecodedAudio):
+            return audio.to_float32()
+        return str(audio)
+
+    def _run_model(self, audio_input: str | np.ndarray, language: str | None):
+        """
+        Lance le décodage selon le mode configuré.
 
-        self.model = WhisperModel(
-            str(model_path),
-            device="cpu",
-            compute_type=self.config.compute_type,
-            cpu_threads=self.config.cpu_threads or (os.cpu_count() // 2),
-        )
+        - sequential: WhisperModel.transcribe, une fenêtre de 30 s à la fois
+        - batched: BatchedInferencePipeline, plusieurs segments VAD décodés
+          par appel CTranslate2 (batch_size)
+        """
+        options = {
+            "language": language,
+            "beam_size": self.config.beam_size,
+            "vad_filter": self.config.vad_filter,
+            "word_timestamps": True,  # Requis pour alignement diarization
+        }
+
+        if self.config.mode == "batched":
+            if self._batched_pipeline is None:
+                self._batched_pipeline = BatchedInferencePipeline(model=self.model)
+            return self._batched_pipeline.transcribe(
+                audio_input,
+                batch_size=self.config.batch_size,
+                **options,
+            )
 
-        if progress_callback:
-            progress_callback("Modèle prêt", 100.0)
+        return self.model.transcribe(audio_input, **options)
 
-        logger.info("Modèle chargé avec succès")
+    def detect_language(self, audio: DecodedAudio) -> tuple[str, float]:
+        """
+        Détecte la langue sur le début de l'audio (LANGUAGE_DETECTION_SECONDS).
 
-    def unload_model(self) -> None:
-        """Décharge le modèle pour libérer la mémoire."""
-        if self.model is not None:
-            del self.model
-            self.model = None
-            gc.collect()
-            logger.info("Modèle déchargé")
+        Les chunks d'un fichier long la reçoivent ensuite explicitement:
+        détectée chunk par chunk, elle pourrait changer en cours de fichier.
+
+        Returns:
+            (code langue, probabilité)
+        """
+        with self.in_use():
+            if self.model is None:
+                self.load_model()
+            end = int(LANGUAGE_DETECTION_SECONDS * audio.sample_rate)
+            language, probability, _ = self.model.detect_language(audio.to_float32(0, end))
+            return language, probability
 
     def transcribe(
         self,
-        audio_path: Path,
+        audio_path: Path | DecodedAudio,
         language: str | None = None,
         progress_callback: Callable[[int, str], None] | None = None,
+        cancel_token: CancellationToken | None = None,
     ) -> TranscriptionResult:
         """
         Transcrit un fichier audio.
 
         Args:
-            audio_path: Chemin vers le fichier audio
+            audio_path: Chemin vers le fichier audio, ou DecodedAudio déjà
+                décodé (évite un second décodage FFmpeg)
             language: Code langue (fr, en, auto...) ou None pour config
             progress_callback: Callback (segment_index, texte_segment)
+            cancel_token: Arrête le décodage à la fenêtre suivante; les
+                segments déjà produits sont retournés (is_partial=True)
 
         Returns:
             TranscriptionResult avec tous les segments
         """
-        if self.model is None:
-            self.load_model()
+        with self.in_use():
+            return self._transcribe(audio_path, language, progress_callback, cancel_token)
 
+    def _transcribe(
+        self,
+        audio_path: Path | DecodedAudio,
+        language: str | None,
+        progress_callback: Callable[[int, str], None] | None,
+        cancel_token: CancellationToken | None,
+    ) -> TranscriptionResult:
         language = language or self.config.language
         if language == "auto":
             language = None
 
-        logger.info(f"Transcription de {audio_path} (langue: {language or 'auto'})...")
+        if self._use_parallel(audio_path):
+            return self._transcribe_parallel(audio_path, language, progress_callback, cancel_token)
 
-        segments_iter, info = self.model.transcribe(
-            str(audio_path),
-            language=language,
-            beam_size=self.config.beam_size,
-            vad_filter=self.config.vad_filter,
-            word_timestamps=True,  # Requis pour alignement diarization
+        if self.model is None:
+            self.load_model()
+
+        source = audio_path.path if isinstance(audio_path, DecodedAudio) else audio_path
+        logger.info(
+            f"Transcription de {source} (langue: {language or 'auto'}, mode: {self.config.mode})..."
         )
 
+        segments_iter, info = self._run_model(self._prepare_input(audio_path), language)
+
         segments = []
-        for i, segment in enumerate(segments_iter):
-            seg = TranscriptionSegment(
-                start=segment.start,
-                end=segment.end,
-                text=segment.text,
-                words=[
-                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
-                    for w in (segment.words or [])
-                ],
-                confidence=segment.avg_logprob if hasattr(segment, 'avg_logprob') else 0.0,
-            )
-            segments.append(seg)
+        for i, segment in enumerate(self._until_cancelled(segments_iter, cancel_token)):
+            segments.append(_to_segment(segment))
 
             if progress_callback:
                 progress_callback(i, segment.text[:80])
@@ -210,46 +457,170 @@ class Transcriber:
             language=info.language,
             language_probability=info.language_probability,
             duration=info.duration,
+            is_partial=is_cancelled(cancel_token),
         )
 
-        logger.info(
-            f"Transcription terminée: {len(segments)} segments, "
-            f"durée {result.duration:.1f}s, langue {result.language}"
-        )
+        if result.is_partial:
+            logger.info(f"Transcription annulée: {len(segments)} segments conservés")
+        else:
+            logger.info(
+                f"Transcription terminée: {len(segments)} segments, "
+                f"durée {result.duration:.1f}s, langue {result.language}"
+            )
 
         return result
 
+    @staticmethod
+    def _until_cancelled(segments_iter, cancel_token: CancellationToken | None):
+        """
+        Consomme le générateur de faster-whisper tant que le jeton n'est pas
+        annulé. Le décodage est paresseux: ne plus demander de segment arrête
+        l'inférence à la fin de la fenêtre (ou du batch) en cours.
+        """
+        try:
+            for segment in segments_iter:
+                yield segment
+                if is_cancelled(cancel_token):
+                    return
+        finally:
+            if hasattr(segments_iter, "close"):
+                segments_iter.close()
+
     def transcribe_stream(
         self,
-        audio_path: Path,
+        audio_path: Path | DecodedAudio,
         language: str | None = None,
+        cancel_token: CancellationToken | None = None,
     ) -> Iterator[TranscriptionSegment]:
         """
         Transcrit en mode streaming (yield segment par segment).
-        Utile pour affichage progressif dans l'UI.
+        Utile pour affichage progressif dans l'UI. Le flux s'arrête après
+        le segment en cours si `cancel_token` est annulé.
         """
-        if self.model is None:
-            self.load_model()
+        with self.in_use():
+            if self.model is None:
+                self.load_model()
 
-        language = language or self.config.language
-        if language == "auto":
-            language = None
+            language = language or self.config.language
+            if language == "auto":
+                language = None
+
+            segments_iter, info = self._run_model(self._prepare_input(audio_path), language)
+
+            for segment in self._until_cancelled(segments_iter, cancel_token):
+                yield _to_segment(segment)
+
+    def _use_parallel(self, audio: Path | DecodedAudio) -> bool:
+        """Mode fichier long: audio déjà décodé, plusieurs workers et au moins deux chunks."""
+        if self.config.parallel_workers <= 1 or not isinstance(audio, DecodedAudio):
+            return False
+        chunk_seconds = get_config().performance.chunk_size_minutes * 60
+        return audio.duration > 2 * chunk_seconds
 
-        segments_iter, info = self.model.transcribe(
-            str(audio_path),
-            language=language,
-            beam_size=self.config.beam_size,
-            vad_filter=self.config.vad_filter,
-            word_timestamps=True,
+    def _transcribe_parallel(
+        self,
+        audio: DecodedAudio,
+        language: str | None,
+        progress_callback: Callable[[int, str], None] | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> TranscriptionResult:
+        """
+        Transcrit un fichier long par chunks alignés sur les silences, dans un
+        pool de processus (un WhisperModel et une part des cœurs par processus),
+        puis recolle les segments sur la timeline globale.
+
+        En cas d'annulation, les processus s'arrêtent à la fenêtre suivante
+        et seuls les segments déjà décodés sont recollés (résultat partiel).
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        from .chunking import AudioChunk, chunk_payload, plan_chunks, stitch_segments
+
+        performance = get_config().performance
+        chunks = plan_chunks(
+            audio,
+            chunk_seconds=performance.chunk_size_minutes * 60,
+            overlap_seconds=performance.chunk_overlap_seconds,
         )
+        workers = min(self.config.parallel_workers, len(chunks))
+        threads_per_worker = max(1, self.cpu_threads // workers)
+
+        model_path = self.model_manager.download_whisper_model(self.model_name)
+        batched = self.config.mode == "batched"
+        options = {
+            "beam_size": self.config.beam_size,
+            "vad_filter": self.config.vad_filter,
+        }
+        if batched:
+            options["batch_size"] = self.config.batch_size
 
-        for segment in segments_iter:
-            yield TranscriptionSegment(
-                start=segment.start,
-                end=segment.end,
-                text=segment.text,
-                words=[
-                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
-                    for w in (segment.words or [])
-                ],
-            )
+        logger.info(
+            f"Transcription parallèle de {audio.path}: {len(chunks)} chunks, "
+            f"{workers} processus x {threads_per_worker} threads (mode: {self.config.mode})"
+        )
+
+        results = []
+        segment_index = 0
+        detected_probability = None
+        context = multiprocessing.get_context("spawn")
+        cancel_event = context.Event()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_chunk_worker,
+            initargs=(str(model_path), self.config.compute_type, threads_per_worker, cancel_event, batched),
+        ) as pool:
+            if language is None:
+                # Langue détectée une fois pour tout le fichier
+                excerpt = AudioChunk(
+                    0, 0, int(LANGUAGE_DETECTION_SECONDS * audio.sample_rate), 0.0, float("inf"),
+                    audio.sample_rate,
+                )
+                detection = pool.submit(_detect_chunk_language, chunk_payload(audio, excerpt))
+                for future in as_completed_cancellable([detection], cancel_token, cancel_event):
+                    if not future.cancelled() and future.result() is not None:
+                        language, detected_probability = future.result()
+                        logger.info(f"Langue détectée: {language} ({detected_probability:.2f})")
+            options["language"] = language
+
+            futures = {}
+            if language is not None:
+                futures = {
+                    pool.submit(_transcribe_chunk, chunk_payload(audio, c), options): c
+                    for c in chunks
+                }
+            for future in as_completed_cancellable(futures, cancel_token, cancel_event):
+                if future.cancelled() or future.result() is None:
+                    continue
+                chunk = futures[future]
+                segments, chunk_language, probability = future.result()
+                results.append((chunk, segments, chunk_language, probability))
+
+                if progress_callback:
+                    for segment in segments:
+                        progress_callback(segment_index, segment.text[:80])
+                        segment_index += 1
+
+        segments = stitch_segments([(chunk, segs) for chunk, segs, _, _ in results])
+        if results:
+            _, _, first_language, first_probability = min(results, key=lambda r: r[0].index)
+        else:
+            first_language, first_probability = language or "", 0.0
+        if detected_probability is not None:
+            first_probability = detected_probability
+
+        result = TranscriptionResult(
+            segments=segments,
+            language=first_language,
+            language_probability=first_probability,
+            duration=audio.duration,
+            is_partial=is_cancelled(cancel_token) or len(results) < len(chunks),
+        )
+
+        logger.info(
+            f"Transcription parallèle terminée: {len(segments)} segments, "
+            f"durée {result.duration:.1f}s, langue {result.language}"
+        )
+
+        return result
@@ -24,11 +24,10 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 
-from ..core.batch_processor import get_audio_files_from_directory
 from ..core.diarizer import Diarizer
 from ..core.transcriber import Transcriber
 from ..utils.config import get_config
-from .workers import BatchWorker, WorkerThread
+from .workers import BatchWorker, DirectoryScanWorker, WorkerThread
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +46,10 @@ class BatchDialog(QDialog):
         self.diarizer = diarizer
         self.config = get_config()
         self._files: list[Path] = []
+        self._file_set: set[Path] = set()
         self._worker: WorkerThread | None = None
+        self._scan: WorkerThread | None = None
+        self._eta_driven = False  # Barre pilotée par les secondes d'audio traitées
 
         self._setup_ui()
         self._connect_signals()
@@ -172,6 +174,9 @@ class BatchDialog(QDialog):
         progress_layout.addStretch()
         progress_layout.addWidget(self.lbl_current_file)
 
+        self.lbl_eta = QLabel("")
+        progress_layout.addWidget(self.lbl_eta)
+
         layout.addLayout(progress_layout)
 
         self.progress_bar = QProgressBar()
@@ -226,17 +231,54 @@ class BatchDialog(QDialog):
     def _on_add_folder(self) -> None:
         """Ajoute tous les fichiers d'un dossier."""
         folder = QFileDialog.getExistingDirectory(self, "Sélectionner un dossier")
-        if folder:
-            files = get_audio_files_from_directory(Path(folder), recursive=True)
-            for f in files:
-                self._add_file(f)
-            self._update_file_count()
+        if not folder:
+            return
+
+        # Parcours en arrière-plan: la liste se remplit au fil de la découverte
+        scanner = DirectoryScanWorker(Path(folder), recursive=True)
+        scanner.files_found.connect(self._on_files_found)
+        scanner.finished.connect(self._on_scan_finished)
+        scanner.error.connect(self._on_scan_error)
+
+        self.btn_add_folder.setEnabled(False)
+        self.btn_start.setEnabled(False)
+        self.lbl_file_count.setText("Recherche...")
+        self._scan = WorkerThread(scanner)
+        # Référence gardée jusqu'à l'arrêt effectif du QThread: le libérer
+        # depuis le signal du worker détruirait un thread encore actif
+        self._scan.thread.finished.connect(self._on_scan_thread_finished)
+        self._scan.start()
+
+    def _on_files_found(self, files: list) -> None:
+        """Ajoute un paquet de fichiers découverts par le parcours."""
+        self.list_files.setUpdatesEnabled(False)
+        for f in files:
+            self._add_file(f)
+        self.list_files.setUpdatesEnabled(True)
+        self.lbl_file_count.setText(f"Recherche... {len(self._files)} fichier(s)")
+
+    def _on_scan_finished(self, count: int) -> None:
+        """Fin du parcours d'un dossier."""
+        self._update_file_count()
+        if count == 0 and self.isVisible():
+            QMessageBox.information(self, "Dossier", "Aucun fichier audio trouvé dans ce dossier.")
+
+    def _on_scan_error(self, error_msg: str) -> None:
+        self._update_file_count()
+        QMessageBox.warning(self, "Dossier", f"Erreur lors du parcours du dossier:\n{error_msg}")
+
+    def _on_scan_thread_finished(self) -> None:
+        """Libère le parcours une fois son thread terminé."""
+        self._scan = None
+        self.btn_add_folder.setEnabled(True)
+        self._update_file_count()
 
     def _add_file(self, path: Path) -> None:
         """Ajoute un fichier à la liste."""
-        if path in self._files:
+        if path in self._file_set:
             return
         self._files.append(path)
+        self._file_set.add(path)
         item = QListWidgetItem(f"{path.name}  ({path.parent})")
         item.setData(Qt.UserRole, str(path))
         self.list_files.addItem(item)
@@ -245,14 +287,16 @@ class BatchDialog(QDialog):
         """Retire les fichiers sélectionnés."""
         for item in self.list_files.selectedItems():
             path = Path(item.data(Qt.UserRole))
-            if path in self._files:
+            if path in self._file_set:
                 self._files.remove(path)
+                self._file_set.discard(path)
             self.list_files.takeItem(self.list_files.row(item))
         self._update_file_count()
 
     def _on_clear_files(self) -> None:
         """Efface tous les fichiers."""
         self._files.clear()
+        self._file_set.clear()
         self.list_files.clear()
         self._update_file_count()
 
@@ -280,7 +324,7 @@ class BatchDialog(QDialog):
         """Met à jour le compteur de fichiers."""
         count = len(self._files)
         self.lbl_file_count.setText(f"{count} fichier(s)")
-        self.btn_start.setEnabled(count > 0)
+        self.btn_start.setEnabled(count > 0 and self._scan is None)
         self.btn_clear.setEnabled(count > 0)
 
     def _on_start(self) -> None:
@@ -289,6 +333,8 @@ class BatchDialog(QDialog):
             return
 
         self._set_ui_processing(True)
+        self._eta_driven = False
+        self.lbl_eta.setText("")
 
         lang_text = self.combo_language.currentText()
         language = lang_text.split("(")[-1].rstrip(")")
@@ -314,6 +360,7 @@ class BatchDialog(QDialog):
         )
 
         worker.progress.connect(self._on_progress)
+        worker.eta.connect(self._on_eta)
         worker.item_completed.connect(self._on_item_completed)
         worker.finished.connect(self._on_finished)
         worker.error.connect(self._on_error)
@@ -330,11 +377,20 @@ class BatchDialog(QDialog):
 
     def _on_progress(self, current: int, total: int, filename: str, percent: float) -> None:
         """Met à jour la progression."""
-        overall = ((current - 1) / total * 100) + (percent / total)
-        self.progress_bar.setValue(int(overall))
+        if not self._eta_driven:
+            overall = ((current - 1) / total * 100) + (percent / total)
+            self.progress_bar.setValue(int(overall))
         self.lbl_progress.setText(f"Fichier {current}/{total}")
         self.lbl_current_file.setText(filename)
 
+    def _on_eta(self, percent: float, remaining: float) -> None:
+        """Avancement pondéré par la durée audio et temps restant estimé."""
+        self._eta_driven = True
+        self.progress_bar.setValue(int(percent))
+        if remaining >= 0:
+            minutes, seconds = divmod(int(remaining), 60)
+            self.lbl_eta.setText(f"reste ~{minutes:02d}:{seconds:02d}")
+
     def _on_item_completed(self, index: int, success: bool, message: str) -> None:
         """Met à jour l'état d'un fichier."""
         item = self.list_files.item(index)
@@ -345,11 +401,15 @@ class BatchDialog(QDialog):
             else:
                 item.setBackground(QColor("#FFEBEE"))
                 item.setText(f"✗ {item.text()}")
+            item.setToolTip(message)
 
     def _on_finished(self, result) -> None:
         """Appelé quand le batch est terminé."""
         self._set_ui_processing(False)
         self.progress_bar.setValue(100)
+        self.lbl_eta.setText("")
+        # Les sorties sont écrites: les résultats complets sur disque ne servent plus
+        result.discard_results()
         self.lbl_progress.setText(
             f"Terminé: {result.completed_count}/{result.total_count} réussis "
             f"({result.total_time:.1f}s)"
@@ -380,6 +440,8 @@ class BatchDialog(QDialog):
 
     def closeEvent(self, event) -> None:
         """Gère la fermeture du dialogue."""
+        if self._scan and self._scan.is_running():
+            self._scan.stop()
         if self._worker and self._worker.is_running():
             reply = QMessageBox.question(
                 self,
@@ -29,6 +29,10 @@ from PySide6.QtWidgets import (
 from ..core.audio_processor import AudioProcessor, AudioRecorder
 from ..core.diarizer import Diarizer
 from ..core.exceptions import DICTEAError, get_user_friendly_message
+from ..core.inference_service import InferenceService, Priority
+from ..core.model_host import HostedDiarizer, HostedTranscriber, hosted_client
+from ..core.model_lifecycle import ModelLifecycle
+from ..core.model_registry import reset_model_registry
 from ..core.transcriber import Transcriber, TranscriptionResult
 from ..utils.config import get_config
 from .audio_player import AudioPlayerWidget
@@ -37,6 +41,9 @@ from .workers import FullPipelineWorker, TranscriptionWorker, WorkerThread
 
 logger = logging.getLogger(__name__)
 
+# Délai avant le préchargement des modèles, pour laisser la fenêtre s'afficher
+PRELOAD_DELAY_MS = 500
+
 
 class MainWindow(QMainWindow):
     """Fenêtre principale de l'application."""
@@ -45,8 +52,22 @@ class MainWindow(QMainWindow):
         super().__init__()
 
         self.config = get_config()
-        self.transcriber = Transcriber()
-        self.diarizer = Diarizer()
+        # Modèles résidents dans le démon s'il tourne, sinon chargés ici
+        host = hosted_client()
+        if host is not None:
+            self.transcriber = HostedTranscriber(host)
+            self.diarizer = HostedDiarizer(host)
+        else:
+            self.transcriber = Transcriber()
+            self.diarizer = Diarizer()
+        # Fichier interactif et batch partagent le modèle: file commune,
+        # le fichier interactif passe devant les fichiers de batch en attente
+        self.inference = InferenceService(self.transcriber)
+        self.model_lifecycle = ModelLifecycle(
+            self.transcriber,
+            self.diarizer,
+            idle_seconds=self.config.performance.model_idle_unload_minutes * 60,
+        )
         self.recorder = AudioRecorder()
         self.processor = AudioProcessor()
 
@@ -59,6 +80,13 @@ class MainWindow(QMainWindow):
         self._setup_ui()
         self._connect_signals()
 
+        if self.config.performance.preload_models:
+            QTimer.singleShot(PRELOAD_DELAY_MS, self._preload_models)
+
+    def _preload_models(self) -> None:
+        """Précharge les modèles en arrière-plan (fenêtre déjà affichée)."""
+        self.model_lifecycle.preload(diarization=self.chk_diarization.isChecked())
+
     # =========================================================================
     # Setup UI - Méthodes de construction de l'interface
     # =========================================================================
@@ -300,8 +328,9 @@ class MainWindow(QMainWindow):
 
     def _on_batch_clicked(self) -> None:
         """Ouvre le dialogue de traitement par lots."""
-        dialog = BatchDialog(self.transcriber, self.diarizer, parent=self)
-        dialog.exec()
+        dialog = BatchDialog(self.inference.client(Priority.BATCH), self.diarizer, parent=self)
+        with self.model_lifecycle.in_use():
+            dialog.exec()
 
     # =========================================================================
     # Handlers - Enregistrement
@@ -425,13 +454,16 @@ class MainWindow(QMainWindow):
         worker.error.connect(self._on_error)
 
         self._current_worker = WorkerThread(worker)
+        # Pas de déchargement sur inactivité tant que le thread tourne
+        self.model_lifecycle.acquire()
+        self._current_worker.thread.finished.connect(self.model_lifecycle.release)
         self._current_worker.start()
 
     def _create_full_pipeline_worker(self, options: dict) -> FullPipelineWorker:
         """Crée un worker pour le pipeline complet (transcription + diarization)."""
         worker = FullPipelineWorker(
             audio_path=self._audio_path,
-            transcriber=self.transcriber,
+            transcriber=self.inference.client(Priority.INTERACTIVE),
             diarizer=self.diarizer,
             language=options["language"],
             min_speakers=options["min_speakers"],
@@ -444,7 +476,7 @@ class MainWindow(QMainWindow):
         """Crée un worker pour la transcription seule."""
         worker = TranscriptionWorker(
             audio_path=self._audio_path,
-            transcriber=self.transcriber,
+            transcriber=self.inference.client(Priority.INTERACTIVE),
             language=options["language"],
         )
         worker.segment_ready.connect(self._on_segment_ready)
@@ -478,8 +510,9 @@ class MainWindow(QMainWindow):
         ))
         self._reset_ui_after_transcription()
         self._enable_export_buttons()
+        state = "Annulé (résultat partiel)" if result.is_partial else "Terminé"
         self.status_bar.showMessage(
-            f"Terminé: {len(result.segments)} segments, "
+            f"{state}: {len(result.segments)} segments, "
             f"durée {result.duration:.1f}s, langue {result.language}"
         )
 
@@ -569,7 +602,8 @@ class MainWindow(QMainWindow):
         if self.recorder.is_recording:
             self.recorder.stop_recording()
 
-        self.transcriber.unload_model()
-        self.diarizer.unload()
+        self.inference.shutdown(wait=False)
+        self.model_lifecycle.shutdown()
+        reset_model_registry()
 
         event.accept()
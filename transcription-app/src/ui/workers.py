@@ -4,21 +4,26 @@ Permet de maintenir l'UI responsive pendant le traitement.
 """
 import gc
 import logging
+import threading
 import traceback
 from pathlib import Path
 
 from PySide6.QtCore import QObject, QThread, Signal
 
-from ..core.audio_processor import AudioProcessor
+from ..core.audio_processor import AudioProcessor, DecodedAudio
+from ..core.cancellation import CancellationToken
 from ..core.diarizer import DiarizationResult, Diarizer, assign_speakers_to_transcription
 from ..core.exceptions import (
     AudioFileNotFoundError,
+    AudioFormatError,
     DICTEAError,
     HuggingFaceTokenError,
     ModelLoadError,
     TranscriptionCancelledError,
     get_user_friendly_message,
 )
+from ..core.memory_planner import MemoryPlanner
+from ..core.pipeline import concurrent_thread_split, run_transcription_and_diarization
 from ..core.transcriber import Transcriber, TranscriptionResult
 
 logger = logging.getLogger(__name__)
@@ -52,11 +57,14 @@ class TranscriptionWorker(QObject):
         self.audio_path = audio_path
         self.transcriber = transcriber
         self.language = language
+        self._audio: DecodedAudio | None = None
         self._cancelled = False
+        self._cancel_token = CancellationToken()
 
     def cancel(self) -> None:
-        """Demande l'annulation du traitement."""
+        """Demande l'annulation: le décodage s'arrête à la fenêtre suivante."""
         self._cancelled = True
+        self._cancel_token.cancel()
 
     def run(self) -> None:
         """Exécute la transcription."""
@@ -72,15 +80,16 @@ class TranscriptionWorker(QObject):
             self.error.emit(get_user_friendly_message(e))
 
     def _validate_input(self) -> None:
-        """Valide le fichier d'entrée."""
+        """Valide et décode le fichier d'entrée (un seul décodage par job)."""
         if not self.audio_path.exists():
             raise AudioFileNotFoundError(str(self.audio_path))
-        AudioProcessor().validate_audio_file(self.audio_path)
+        self._audio = AudioProcessor().decode(self.audio_path)
 
     def _run_transcription(self) -> None:
         """Exécute la transcription proprement dite."""
         self.progress.emit("Initialisation", 0.0, "Chargement du modèle...")
 
+        self._admit_job()
         self._load_model_if_needed()
 
         if self._cancelled:
@@ -90,13 +99,25 @@ class TranscriptionWorker(QObject):
 
         result = self._transcribe_with_progress()
 
-        if self._cancelled:
-            raise TranscriptionCancelledError()
-
         segment_count = len(result.segments)
-        self.progress.emit("Terminé", 100.0, f"{segment_count} segments transcrits")
+        if result.is_partial:
+            # Annulation en cours de fichier: les segments déjà produits sont conservés
+            self.progress.emit("Annulé", 100.0, f"{segment_count} segments (résultat partiel)")
+        else:
+            self.progress.emit("Terminé", 100.0, f"{segment_count} segments transcrits")
         self.finished.emit(result)
 
+    def _admit_job(self) -> None:
+        """Contrôle mémoire avant chargement (modèle plus petit si la RAM manque)."""
+        plan = MemoryPlanner().admit(
+            self.transcriber, None, use_diarization=False, duration=self._audio.duration,
+        )
+        if plan.downgraded:
+            self.progress.emit(
+                "Mémoire", 0.0,
+                f"RAM insuffisante: modèle {plan.model_name} au lieu de {plan.requested_model}",
+            )
+
     def _load_model_if_needed(self) -> None:
         """Charge le modèle si nécessaire."""
         if self.transcriber.model is not None:
@@ -118,9 +139,10 @@ class TranscriptionWorker(QObject):
             self.segment_ready.emit(idx, text)
 
         return self.transcriber.transcribe(
-            self.audio_path,
+            self._audio or self.audio_path,
             language=self.language,
             progress_callback=transcription_progress,
+            cancel_token=self._cancel_token,
         )
 
 
@@ -144,10 +166,13 @@ class DiarizationWorker(QObject):
         self.diarizer = diarizer
         self.min_speakers = min_speakers
         self.max_speakers = max_speakers
+        self._audio: DecodedAudio | None = None
         self._cancelled = False
+        self._cancel_token = CancellationToken()
 
     def cancel(self) -> None:
         self._cancelled = True
+        self._cancel_token.cancel()
 
     def run(self) -> None:
         try:
@@ -162,10 +187,10 @@ class DiarizationWorker(QObject):
             self.error.emit(get_user_friendly_message(e))
 
     def _validate_input(self) -> None:
-        """Valide le fichier d'entrée."""
+        """Valide et décode le fichier d'entrée (un seul décodage par job)."""
         if not self.audio_path.exists():
             raise AudioFileNotFoundError(str(self.audio_path))
-        AudioProcessor().validate_audio_file(self.audio_path)
+        self._audio = AudioProcessor().decode(self.audio_path)
 
     def _run_diarization(self) -> None:
         """Exécute la diarization."""
@@ -176,10 +201,11 @@ class DiarizationWorker(QObject):
 
         try:
             result = self.diarizer.diarize(
-                self.audio_path,
+                self._audio or self.audio_path,
                 min_speakers=self.min_speakers if self.min_speakers > 0 else None,
                 max_speakers=self.max_speakers if self.max_speakers > 0 else None,
                 progress_callback=diarization_progress,
+                cancel_token=self._cancel_token,
             )
         except Exception as e:
             error_str = str(e).lower()
@@ -219,10 +245,16 @@ class FullPipelineWorker(QObject):
         self.language = language
         self.min_speakers = min_speakers
         self.max_speakers = max_speakers
+        self._audio: DecodedAudio | None = None
         self._cancelled = False
+        self._cancel_token = CancellationToken()
+        # Transcription et diarization peuvent rapporter en parallèle
+        self._progress_lock = threading.Lock()
+        self._progress_value = 0.0
 
     def cancel(self) -> None:
         self._cancelled = True
+        self._cancel_token.cancel()
 
     def run(self) -> None:
         try:
@@ -245,60 +277,103 @@ class FullPipelineWorker(QObject):
         if not AudioProcessor.is_supported(self.audio_path):
             raise AudioFormatError(str(self.audio_path), self.audio_path.suffix)
 
+    def _emit_progress(self, step: str, percent: float, detail: str) -> None:
+        """Émet la progression sans jamais reculer (étapes concurrentes)."""
+        with self._progress_lock:
+            self._progress_value = max(self._progress_value, percent)
+            percent = self._progress_value
+        self.progress.emit(step, percent, detail)
+
+    def _decode_audio(self) -> None:
+        """Étape 0: décodage unique partagé par transcription et diarization."""
+        self._emit_progress("Préparation", 0.0, "Décodage audio...")
+        self._audio = AudioProcessor().decode(self.audio_path)
+
     def _run_pipeline(self) -> None:
         """Exécute le pipeline complet."""
-        transcription_result = self._run_transcription()
+        self._decode_audio()
         if self._cancelled:
             return
 
-        diarization_result = self._run_diarization()
-        if self._cancelled:
-            return
+        # Contrôle mémoire: modèles ensemble, l'un après l'autre, ou plus petits
+        plan = MemoryPlanner().admit(
+            self.transcriber, self.diarizer, use_diarization=True, duration=self._audio.duration,
+        )
+        if plan.downgraded:
+            self._emit_progress(
+                "Mémoire", 0.0,
+                f"RAM insuffisante: modèle {plan.model_name} au lieu de {plan.requested_model}",
+            )
+
+        # Étapes 1 et 2 en parallèle si la machine a assez de cores (et de RAM)
+        split = None if plan.sequential else concurrent_thread_split(self.transcriber)
+        concurrent = split is not None
+        asr_threads, diarization_threads = split or (None, None)
+
+        def diarize() -> DiarizationResult:
+            if plan.sequential:
+                MemoryPlanner.release_transcription_model(self.transcriber)
+            return self._run_diarization(diarization_threads)
 
+        transcription_result, diarization_result = run_transcription_and_diarization(
+            lambda: self._run_transcription(asr_threads),
+            diarize,
+            concurrent=concurrent,
+        )
+
+        # Annulation en cours de fichier: fusion de ce qui a été produit
+        partial = transcription_result.is_partial or diarization_result.is_partial
         final_result = self._merge_results(transcription_result, diarization_result)
+        final_result.is_partial = partial
         self.finished.emit(final_result)
 
-    def _run_transcription(self) -> TranscriptionResult:
+    def _run_transcription(self, cpu_threads: int | None = None) -> TranscriptionResult:
         """Étape 1: Transcription."""
-        self.progress.emit("Transcription", 0.0, "Chargement du modèle...")
+        self._emit_progress("Transcription", 0.0, "Chargement du modèle...")
 
         if self.transcriber.model is None:
             try:
                 def model_progress(msg, pct):
-                    self.progress.emit("Transcription", pct * 0.1, msg)
-                self.transcriber.load_model(progress_callback=model_progress)
+                    self._emit_progress("Transcription", pct * 0.1, msg)
+                self.transcriber.load_model(
+                    progress_callback=model_progress,
+                    cpu_threads=cpu_threads,
+                )
             except Exception as e:
                 raise ModelLoadError(self.transcriber.model_name, str(e))
 
         if self._cancelled:
             raise TranscriptionCancelledError()
 
-        self.progress.emit("Transcription", 10.0, "En cours...")
+        self._emit_progress("Transcription", 10.0, "En cours...")
 
         result = self.transcriber.transcribe(
-            self.audio_path,
+            self._audio,
             language=self.language,
+            cancel_token=self._cancel_token,
         )
 
-        self.progress.emit("Transcription", 40.0, "Terminée")
+        self._emit_progress("Transcription", 40.0, "Terminée")
         self.transcription_done.emit(result)
 
         return result
 
-    def _run_diarization(self) -> DiarizationResult:
+    def _run_diarization(self, num_threads: int | None = None) -> DiarizationResult:
         """Étape 2: Diarization."""
-        self.progress.emit("Diarization", 45.0, "Identification des locuteurs...")
+        self._emit_progress("Diarization", 45.0, "Identification des locuteurs...")
 
         def diarization_progress(msg, pct):
             mapped_pct = 45.0 + (pct * 0.5)
-            self.progress.emit("Diarization", mapped_pct, msg)
+            self._emit_progress("Diarization", mapped_pct, msg)
 
         try:
             result = self.diarizer.diarize(
-                self.audio_path,
+                self._audio,
                 min_speakers=self.min_speakers if self.min_speakers > 0 else None,
                 max_speakers=self.max_speakers if self.max_speakers > 0 else None,
                 progress_callback=diarization_progress,
+                num_threads=num_threads,
+                cancel_token=self._cancel_token,
             )
         except Exception as e:
             error_str = str(e).lower()
@@ -314,11 +389,11 @@ class FullPipelineWorker(QObject):
         diarization: DiarizationResult,
     ) -> TranscriptionResult:
         """Étape 3: Fusion des résultats."""
-        self.progress.emit("Fusion", 95.0, "Attribution des locuteurs...")
+        self._emit_progress("Fusion", 95.0, "Attribution des locuteurs...")
 
         final_result = assign_speakers_to_transcription(transcription, diarization)
 
-        self.progress.emit(
+        self._emit_progress(
             "Terminé", 100.0,
             f"{len(final_result.segments)} segments, {diarization.num_speakers} locuteurs"
         )
@@ -327,6 +402,7 @@ class FullPipelineWorker(QObject):
 
     def _cleanup(self) -> None:
         """Libère la mémoire après le traitement."""
+        self._audio = None
         gc.collect()
 
 
@@ -336,6 +412,8 @@ class BatchWorker(QObject):
     started = Signal()
     progress = Signal(int, int, str, float)  # current, total, filename, percent
     item_completed = Signal(int, bool, str)  # index, success, message
+    item_finished = Signal(object)  # BatchItemEvent (durées, RTF, sorties)
+    eta = Signal(float, float)  # percent (secondes d'audio), secondes restantes (-1 si inconnu)
     finished = Signal(object)  # BatchResult
     error = Signal(str)
 
@@ -361,7 +439,7 @@ class BatchWorker(QObject):
 
     def run(self) -> None:
         try:
-            from ..core.batch_processor import BatchOptions, BatchProcessor
+            from ..core.batch_processor import BatchItemStatus, BatchOptions, BatchProcessor
 
             self.started.emit()
 
@@ -382,13 +460,27 @@ class BatchWorker(QObject):
             def progress_callback(current, total, filename, percent):
                 self.progress.emit(current, total, filename, percent)
 
-            result = self._processor.process(self.files, options, progress_callback)
-
-            for i, item in enumerate(result.items):
-                success = item.status.value == "completed"
-                msg = item.error_message or f"Terminé en {item.processing_time:.1f}s"
-                self.item_completed.emit(i, success, msg)
-
+            def eta_callback(batch_progress):
+                remaining = batch_progress.eta_seconds
+                self.eta.emit(batch_progress.percent, -1.0 if remaining is None else remaining)
+
+            def item_callback(event):
+                # Émis dès la fin de chaque fichier (thread d'écriture du batch)
+                self.item_finished.emit(event)
+                if event.status == BatchItemStatus.FAILED:
+                    self.item_completed.emit(event.index, False, event.error_message or "Échec")
+                elif event.status == BatchItemStatus.SKIPPED:
+                    self.item_completed.emit(event.index, True, "Ignoré")
+                else:
+                    rtf = event.real_time_factor
+                    msg = f"Terminé en {event.processing_time:.1f}s"
+                    if rtf is not None:
+                        msg += f" (RTF {rtf:.2f})"
+                    self.item_completed.emit(event.index, True, msg)
+
+            result = self._processor.process(
+                self.files, options, progress_callback, eta_callback, item_callback,
+            )
             self.finished.emit(result)
 
         except Exception as e:
@@ -396,6 +488,64 @@ class BatchWorker(QObject):
             self.error.emit(get_user_friendly_message(e))
 
 
+class DirectoryScanWorker(QObject):
+    """
+    Recherche des fichiers audio d'un dossier en arrière-plan.
+
+    Les fichiers sont transmis par paquets au fil du parcours: sur un
+    partage réseau de plusieurs dizaines de milliers de fichiers, la liste
+    se remplit progressivement sans bloquer l'UI.
+
+    Signals:
+        files_found: Paquet de fichiers découverts (list[Path])
+        finished: Nombre total de fichiers trouvés
+        error: Message d'erreur
+    """
+
+    files_found = Signal(list)
+    finished = Signal(int)
+    error = Signal(str)
+
+    # Un paquet part dès qu'il atteint cette taille ou cet âge
+    BATCH_SIZE = 500
+    BATCH_INTERVAL = 0.25
+
+    def __init__(self, directory: Path, recursive: bool = True):
+        super().__init__()
+        self.directory = directory
+        self.recursive = recursive
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def run(self) -> None:
+        try:
+            import time
+
+            from ..core.batch_processor import iter_audio_files
+
+            batch: list[Path] = []
+            total = 0
+            last_emit = time.monotonic()
+            for path in iter_audio_files(self.directory, self.recursive, lambda: self._cancelled):
+                batch.append(path)
+                now = time.monotonic()
+                if len(batch) >= self.BATCH_SIZE or now - last_emit >= self.BATCH_INTERVAL:
+                    total += len(batch)
+                    self.files_found.emit(batch)
+                    batch, last_emit = [], now
+
+            if batch:
+                total += len(batch)
+                self.files_found.emit(batch)
+            self.finished.emit(total)
+
+        except Exception as e:
+            logger.error(f"Erreur parcours de {self.directory}: {e}\n{traceback.format_exc()}")
+            self.error.emit(str(e))
+
+
 class WorkerThread:
     """
     Utilitaire pour lancer un worker dans un QThread.
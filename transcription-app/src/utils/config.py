@@ -1,12 +1,17 @@
 """
 Gestion de la configuration de l'application.
 """
+import logging
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
 
 import yaml
 
+logger = logging.getLogger(__name__)
+
+TRANSCRIPTION_MODES = ("sequential", "batched")
+
 
 @dataclass
 class TranscriptionConfig:
@@ -16,12 +21,29 @@ class TranscriptionConfig:
     cpu_threads: int = 0
     vad_filter: bool = True
     beam_size: int = 5
+    mode: str = "sequential"
+    batch_size: int = 8
+    parallel_workers: int = 1
+    num_workers: int = 1
+
+    def __post_init__(self):
+        if self.mode not in TRANSCRIPTION_MODES:
+            raise ValueError(
+                f"Mode de transcription inconnu: {self.mode!r}. Disponibles: {list(TRANSCRIPTION_MODES)}"
+            )
+        if self.mode == "batched" and not self.vad_filter:
+            # BatchedInferencePipeline découpe l'audio sur les segments VAD
+            logger.warning("Mode batched: filtrage VAD activé (vad_filter: false ignoré)")
+            self.vad_filter = True
 
 
 @dataclass
 class DiarizationConfig:
     min_speakers: int = 0
     max_speakers: int = 0
+    chunk_minutes: int = 0
+    chunk_overlap_seconds: float = 15.0
+    parallel_chunks: int = 1
 
 
 @dataclass
@@ -42,7 +64,19 @@ class PathsConfig:
 @dataclass
 class PerformanceConfig:
     chunk_size_minutes: int = 10
+    chunk_overlap_seconds: float = 2.0
     aggressive_gc: bool = True
+    pcm_cache_max_mb: int = 4096
+    concurrent_diarization: bool = True
+    batch_workers: int = 1
+    prefetch_files: int = 1
+    memory_budget_mb: int = 8192
+    model_cache_mb: int = 0
+    preload_models: bool = True
+    model_idle_unload_minutes: int = 15
+    model_host: bool = False
+    memory_reserve_mb: int = 512
+    allow_model_downgrade: bool = True
 
 
 @dataclass
@@ -107,10 +141,17 @@ class AppConfig:
                 "cpu_threads": self.transcription.cpu_threads,
                 "vad_filter": self.transcription.vad_filter,
                 "beam_size": self.transcription.beam_size,
+                "mode": self.transcription.mode,
+                "batch_size": self.transcription.batch_size,
+                "parallel_workers": self.transcription.parallel_workers,
+                "num_workers": self.transcription.num_workers,
             },
             "diarization": {
                 "min_speakers": self.diarization.min_speakers,
                 "max_speakers": self.diarization.max_speakers,
+                "chunk_minutes": self.diarization.chunk_minutes,
+                "chunk_overlap_seconds": self.diarization.chunk_overlap_seconds,
+                "parallel_chunks": self.diarization.parallel_chunks,
             },
             "audio": {
                 "sample_rate": self.audio.sample_rate,
@@ -125,7 +166,19 @@ class AppConfig:
             },
             "performance": {
                 "chunk_size_minutes": self.performance.chunk_size_minutes,
+                "chunk_overlap_seconds": self.performance.chunk_overlap_seconds,
                 "aggressive_gc": self.performance.aggressive_gc,
+                "pcm_cache_max_mb": self.performance.pcm_cache_max_mb,
+                "concurrent_diarization": self.performance.concurrent_diarization,
+                "batch_workers": self.performance.batch_workers,
+                "prefetch_files": self.performance.prefetch_files,
+                "memory_budget_mb": self.performance.memory_budget_mb,
+                "model_cache_mb": self.performance.model_cache_mb,
+                "preload_models": self.performance.preload_models,
+                "model_idle_unload_minutes": self.performance.model_idle_unload_minutes,
+                "model_host": self.performance.model_host,
+                "memory_reserve_mb": self.performance.memory_reserve_mb,
+                "allow_model_downgrade": self.performance.allow_model_downgrade,
             },
         }
 
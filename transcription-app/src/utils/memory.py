@@ -0,0 +1,326 @@
+"""
+Estimation de la mémoire disponible et de l'empreinte des modèles.
+
+Sert à dimensionner le nombre de processus de travail (batch parallèle)
+sans dépasser le budget RAM de NFR-PERF-02 (8 Go par défaut), et à décider
+avant un job quels modèles peuvent tenir en mémoire (core/memory_planner).
+"""
+import logging
+import os
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Empreinte RAM en inférence (Mo), modèles Whisper CTranslate2 int8
+WHISPER_FOOTPRINT_MB = {
+    "tiny": 300,
+    "base": 400,
+    "small": 900,
+    "medium": 2000,
+    "large-v2": 3500,
+    "large-v3": 3500,
+    "large-v3-french": 2500,
+}
+
+# Facteur d'empreinte selon la précision, relatif à int8
+COMPUTE_TYPE_FACTOR = {
+    "int8": 1.0,
+    "int8_float32": 1.0,
+    "int8_float16": 1.0,
+    "int8_bfloat16": 1.0,
+    "int16": 1.6,
+    "float16": 1.8,
+    "bfloat16": 1.8,
+    "float32": 3.2,
+}
+
+# NeMo Sortformer 4 locuteurs (PyTorch CPU), en inférence
+DIARIZATION_FOOTPRINT_MB = 1500
+
+# Mémoire de travail d'un job: PCM int16 + copie float32 d'un fichier de 2 h
+JOB_WORKING_SET_MB = 700
+
+# Threads minimum par processus pour que CTranslate2 reste efficace
+MIN_THREADS_PER_WORKER = 2
+
+# Hiérarchie cgroup (v2 unifiée, ou v1 avec un sous-dossier "memory")
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# Au-delà, une limite cgroup v1 signifie "illimité" (PAGE_COUNTER_MAX)
+_CGROUP_V1_UNLIMITED = 1 << 60
+
+# Empreintes mesurées au chargement dans ce processus (clé: voir measure_footprint)
+_measured_footprints: dict[tuple, int] = {}
+
+# Chargements en cours: la RSS d'un chargement concurrent fausserait la mesure
+_loads_lock = threading.Lock()
+_loads_in_flight = 0
+_loads_started = 0
+
+
+def _estimated_whisper_mb(model_name: str, compute_type: str) -> int:
+    base = WHISPER_FOOTPRINT_MB.get(model_name, WHISPER_FOOTPRINT_MB["large-v3"])
+    return int(base * COMPUTE_TYPE_FACTOR.get(compute_type, 1.0))
+
+
+def whisper_footprint_mb(model_name: str, compute_type: str = "int8") -> int:
+    """Empreinte d'un modèle Whisper: mesurée si déjà chargé, sinon estimée."""
+    measured = _measured_footprints.get(("whisper", model_name, compute_type))
+    if measured is not None:
+        return measured
+    return _estimated_whisper_mb(model_name, compute_type)
+
+
+def diarization_footprint_mb() -> int:
+    """Empreinte de Sortformer: mesurée si déjà chargé, sinon estimée."""
+    return _measured_footprints.get(("sortformer",), DIARIZATION_FOOTPRINT_MB)
+
+
+def process_rss_mb() -> int | None:
+    """Mémoire résidente du processus (Mo), ou None si indéterminable."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss // (1024 * 1024)
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+@contextmanager
+def measure_footprint(key: tuple) -> Iterator[None]:
+    """
+    Mesure l'augmentation de la mémoire résidente pendant un chargement de
+    modèle; les estimations suivantes utilisent la mesure.
+
+    La mesure n'est retenue que si aucun autre chargement n'a eu lieu en
+    même temps dans le processus, et jamais en dessous de l'estimation
+    statique (pages chargées à la demande, mémoire libérée pendant le
+    chargement).
+
+    Args:
+        key: ("whisper", nom, précision) ou ("sortformer",)
+    """
+    global _loads_in_flight, _loads_started
+    with _loads_lock:
+        _loads_in_flight += 1
+        _loads_started += 1
+        started = _loads_started
+        alone = _loads_in_flight == 1
+    before = process_rss_mb()
+    try:
+        yield
+        after = process_rss_mb()
+    finally:
+        with _loads_lock:
+            _loads_in_flight -= 1
+            alone = alone and _loads_started == started
+
+    if not alone:
+        logger.debug(f"Empreinte {key} non mesurée: chargements concurrents")
+    elif before is not None and after is not None:
+        estimate = _estimated_whisper_mb(*key[1:]) if key[0] == "whisper" else DIARIZATION_FOOTPRINT_MB
+        _measured_footprints[key] = max(after - before, estimate)
+        logger.info(f"Empreinte mesurée {key}: {after - before} Mo")
+
+
+def _read_cgroup_value(path: Path) -> int | None:
+    try:
+        value = path.read_text(encoding="ascii").strip()
+    except OSError:
+        return None
+    if not value or value == "max":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _read_cgroup_stat(path: Path, name: str) -> int:
+    try:
+        with open(path, encoding="ascii") as f:
+            for line in f:
+                key, _, value = line.partition(" ")
+                if key == name:
+                    return int(value)
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def _cgroup_v2_dir(root: Path) -> Path:
+    """Dossier cgroup v2 du processus (racine du namespace dans un conteneur)."""
+    try:
+        with open("/proc/self/cgroup", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    candidate = root / line[3:].strip().lstrip("/")
+                    if (candidate / "memory.max").exists():
+                        return candidate
+    except OSError:
+        pass
+    return root
+
+
+def cgroup_available_mb(root: Path = CGROUP_ROOT) -> int | None:
+    """
+    Mémoire encore disponible sous la limite cgroup (Mo), ou None sans limite.
+
+    Dans un conteneur, MemAvailable reflète l'hôte: c'est la limite du
+    cgroup qui déclenche l'OOM killer. Le cache de pages inactif est compté
+    comme récupérable, comme dans MemAvailable.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+
+    if (root / "cgroup.controllers").exists():
+        directory = _cgroup_v2_dir(root)
+        limit = _read_cgroup_value(directory / "memory.max")
+        usage = _read_cgroup_value(directory / "memory.current")
+        inactive = _read_cgroup_stat(directory / "memory.stat", "inactive_file")
+    else:
+        directory = root / "memory"
+        limit = _read_cgroup_value(directory / "memory.limit_in_bytes")
+        if limit is not None and limit >= _CGROUP_V1_UNLIMITED:
+            limit = None
+        usage = _read_cgroup_value(directory / "memory.usage_in_bytes")
+        inactive = _read_cgroup_stat(directory / "memory.stat", "total_inactive_file")
+
+    if limit is None or usage is None:
+        return None
+    return max(0, limit - usage + inactive) // (1024 * 1024)
+
+
+def available_memory_mb() -> int | None:
+    """
+    Mémoire physique disponible (Mo), ou None si indéterminable.
+
+    La plus petite de la mémoire de la machine et de la marge sous la
+    limite cgroup (conteneurs Linux).
+    """
+    host = _host_available_mb()
+    cgroup = cgroup_available_mb()
+    if host is None or cgroup is None:
+        return cgroup if host is None else host
+    return min(host, cgroup)
+
+
+def _host_available_mb() -> int | None:
+    """psutil si installé, sinon /proc/meminfo (Linux) ou GlobalMemoryStatusEx (Windows)."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available // (1024 * 1024)
+    except ImportError:
+        pass
+
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/meminfo", encoding="ascii") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) // 1024
+        except (OSError, ValueError):
+            return None
+
+    if sys.platform == "win32":
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys // (1024 * 1024)
+
+    return None
+
+
+def worker_footprint_mb(
+    model_name: str,
+    use_diarization: bool,
+    compute_type: str = "int8",
+    hosted: bool = False,
+) -> int:
+    """
+    Empreinte estimée d'un processus de travail (modèles + job en cours).
+    Modèles hébergés par le démon: le processus ne garde que son job.
+    """
+    if hosted:
+        return JOB_WORKING_SET_MB
+    footprint = whisper_footprint_mb(model_name, compute_type)
+    if use_diarization:
+        footprint += diarization_footprint_mb()
+    return footprint + JOB_WORKING_SET_MB
+
+
+def plan_worker_count(
+    model_name: str,
+    use_diarization: bool,
+    requested: int,
+    budget_mb: int,
+    cpu_threads: int | None = None,
+    compute_type: str = "int8",
+    hosted: bool = False,
+) -> int:
+    """
+    Nombre de processus de travail à lancer.
+
+    Le minimum de trois bornes: la demande (0 = automatique), les cœurs
+    (au moins MIN_THREADS_PER_WORKER threads par processus) et la mémoire
+    (budget du groupe et RAM disponible, divisés par l'empreinte d'un
+    processus). Toujours au moins 1.
+
+    Args:
+        model_name: Modèle Whisper chargé par chaque processus
+        use_diarization: Chaque processus charge aussi Sortformer
+        requested: Nombre demandé (0 = automatique)
+        budget_mb: Budget RAM total du groupe de processus
+        cpu_threads: Threads disponibles (défaut: cœurs physiques)
+        compute_type: Précision des modèles Whisper
+        hosted: Modèles résidents dans le démon (performance.model_host),
+            partagés par tous les processus
+    """
+    cpu_threads = cpu_threads or (os.cpu_count() or 2) // 2 or 1
+    footprint = worker_footprint_mb(model_name, use_diarization, compute_type, hosted)
+
+    memory_mb = budget_mb
+    available = available_memory_mb()
+    if available is not None:
+        memory_mb = min(memory_mb, available)
+
+    limits = {
+        "cpu": cpu_threads // MIN_THREADS_PER_WORKER,
+        "mémoire": memory_mb // footprint,
+    }
+    if requested > 0:
+        limits["demande"] = requested
+
+    workers = max(1, min(limits.values()))
+    logger.info(
+        f"Processus de travail: {workers} (limites {limits}, "
+        f"~{footprint} Mo par processus)"
+    )
+    return workers
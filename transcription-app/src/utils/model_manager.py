@@ -9,6 +9,7 @@ from pathlib import Path
 from huggingface_hub import snapshot_download
 
 from .config import get_config
+from .memory import diarization_footprint_mb, whisper_footprint_mb
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,13 @@ PYANNOTE_MODELS = {
 }
 
 
+def _format_mb(size_mb: int) -> str:
+    """Taille lisible: "900 Mo", "2.5 Go"."""
+    if size_mb < 1024:
+        return f"{size_mb} Mo"
+    return f"{size_mb / 1024:.1f} Go"
+
+
 class ModelManager:
     """Gestionnaire de téléchargement et chargement des modèles."""
 
@@ -114,15 +122,18 @@ class ModelManager:
         return token_path.exists()
 
     def get_model_sizes(self) -> dict:
-        """Retourne les tailles approximatives des modèles."""
-        return {
-            "tiny": "75 Mo",
-            "base": "150 Mo",
-            "small": "500 Mo",
-            "medium": "1.5 Go",
-            "large-v3": "3 Go",
-            "pyannote": "~500 Mo",
+        """
+        Retourne l'empreinte RAM des modèles en inférence (mesurée si le
+        modèle a déjà été chargé, sinon estimée) pour la précision configurée.
+        """
+        compute_type = get_config().transcription.compute_type
+        sizes = {
+            name: _format_mb(whisper_footprint_mb(name, compute_type))
+            for name in WHISPER_MODELS
         }
+        # Clé historique: modèle de diarization (NeMo Sortformer)
+        sizes["pyannote"] = _format_mb(diarization_footprint_mb())
+        return sizes
 
     def cleanup_temp_files(self) -> None:
         """Nettoie les fichiers temporaires de téléchargement."""
@@ -19,6 +19,25 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Fixtures de configuration
 # =============================================================================
 
+@pytest.fixture(autouse=True)
+def model_registry():
+    """Registre de modèles vierge pour chaque test (singleton du processus)."""
+    from src.core import model_registry
+
+    registry = model_registry.ModelRegistry(ceiling_mb=8192)
+    with patch.object(model_registry, "_registry", registry):
+        yield registry
+
+
+@pytest.fixture(autouse=True)
+def measured_footprints():
+    """Empreintes mesurées vierges (un chargement mocké mesure quelques Mo)."""
+    from src.utils import memory
+
+    with patch.object(memory, "_measured_footprints", {}) as footprints:
+        yield footprints
+
+
 @pytest.fixture
 def temp_dir():
     """Crée un répertoire temporaire pour les tests."""
@@ -10,7 +10,9 @@ from src.core.audio_processor import (
     AudioDevice,
     AudioRecorder,
     AudioProcessor,
+    DecodedAudio,
 )
+from src.core.exceptions import AudioCorruptedError, AudioFormatError
 
 
 class TestAudioDevice:
@@ -33,6 +35,45 @@ class TestAudioDevice:
         assert device.is_input is True
 
 
+class TestDecodedAudio:
+    """Tests pour la dataclass DecodedAudio."""
+
+    def test_duration(self):
+        """Vérifie le calcul de la durée à partir du nombre d'échantillons."""
+        audio = DecodedAudio(path=Path("a.wav"), pcm=np.zeros(32000, dtype=np.int16))
+
+        assert audio.num_samples == 32000
+        assert audio.duration == 2.0
+
+    def test_to_float32(self):
+        """Vérifie la conversion int16 -> float32 normalisé."""
+        pcm = np.array([0, 16384, -32768], dtype=np.int16)
+        audio = DecodedAudio(path=Path("a.wav"), pcm=pcm)
+
+        samples = audio.to_float32()
+
+        assert samples.dtype == np.float32
+        np.testing.assert_allclose(samples, [0.0, 0.5, -1.0])
+
+    def test_to_float32_range(self):
+        """Vérifie l'extraction d'une plage d'échantillons."""
+        audio = DecodedAudio(path=Path("a.wav"), pcm=np.arange(10, dtype=np.int16))
+
+        assert len(audio.to_float32(2, 5)) == 3
+
+    def test_write_wav(self, temp_dir):
+        """Vérifie l'écriture WAV sans redécodage."""
+        import soundfile as sf
+
+        audio = DecodedAudio(path=Path("a.wav"), pcm=np.zeros(1600, dtype=np.int16))
+        output = audio.write_wav(temp_dir / "out.wav")
+
+        info = sf.info(str(output))
+        assert info.samplerate == 16000
+        assert info.channels == 1
+        assert info.frames == 1600
+
+
 class TestAudioRecorder:
     """Tests pour la classe AudioRecorder."""
 
@@ -235,6 +276,37 @@ class TestAudioProcessor:
             assert info["channels"] == 1
             assert info["format"] == "wav"
 
+    def test_get_audio_info_uses_cache(self, mock_config, sample_audio_file):
+        """Vérifie que ffprobe n'est appelé qu'une fois pour un fichier inchangé."""
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+
+            with patch.object(
+                processor, "_probe_audio_info", wraps=processor._probe_audio_info
+            ) as mock_probe:
+                first = processor.get_audio_info(sample_audio_file)
+                second = processor.get_audio_info(sample_audio_file)
+
+            assert first == second
+            assert mock_probe.call_count == 1
+
+    def test_get_audio_info_falls_back_to_decode(self, mock_config, temp_dir, sample_audio_data):
+        """Vérifie le décodage complet si les métadonnées sont illisibles."""
+        import soundfile as sf
+
+        audio, sample_rate = sample_audio_data
+        path = temp_dir / "fallback.wav"
+        sf.write(str(path), audio, sample_rate)
+
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+
+            with patch.object(processor, "_probe_audio_info", return_value=None):
+                info = processor.get_audio_info(path)
+
+            assert info["sample_rate"] == 16000
+            assert info["duration"] == pytest.approx(1.0, abs=0.01)
+
     def test_get_audio_info_invalid_file(self, mock_config, temp_dir):
         """Vérifie l'erreur pour un fichier invalide."""
         with patch("src.core.audio_processor.get_config", return_value=mock_config):
@@ -244,6 +316,66 @@ class TestAudioProcessor:
             with pytest.raises(Exception):
                 processor.get_audio_info(invalid_path)
 
+    def test_decode(self, mock_config, sample_audio_file):
+        """Vérifie le décodage unique en PCM 16 kHz mono."""
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+            audio = processor.decode(sample_audio_file)
+
+            assert isinstance(audio, DecodedAudio)
+            assert audio.path == sample_audio_file
+            assert audio.sample_rate == 16000
+            assert audio.pcm.dtype == np.int16
+            assert audio.duration == pytest.approx(1.0, abs=0.01)
+            assert audio.info["format"] == "wav"
+
+    def test_iter_pcm_chunks_bounded(self, mock_config, longer_audio_file):
+        """Vérifie que le décodage streaming produit des chunks de taille bornée."""
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+
+            sizes = []
+            buffers = set()
+            for chunk in processor.iter_pcm_chunks(longer_audio_file, chunk_seconds=1.0):
+                assert chunk.dtype == np.int16
+                sizes.append(len(chunk))
+                buffers.add(chunk.__array_interface__["data"][0])
+
+            assert max(sizes) <= 16000
+            assert sum(sizes) == pytest.approx(5 * 16000, abs=160)
+            # Un seul buffer réutilisé pour tous les chunks
+            assert len(buffers) == 1
+
+    def test_iter_pcm_chunks_corrupted_file(self, mock_config, temp_dir):
+        """Vérifie l'erreur si FFmpeg ne peut pas décoder le fichier."""
+        corrupted = temp_dir / "corrupted.mp3"
+        corrupted.write_bytes(b"not audio at all")
+
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+
+            with pytest.raises(AudioCorruptedError):
+                list(processor.iter_pcm_chunks(corrupted))
+
+    def test_decode_unsupported_format(self, mock_config, temp_dir):
+        """Vérifie l'erreur pour un format non supporté."""
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+
+            with pytest.raises(AudioFormatError):
+                processor.decode(temp_dir / "test.xyz")
+
+    def test_decode_corrupted_file(self, mock_config, temp_dir):
+        """Vérifie l'erreur pour un fichier illisible."""
+        corrupted = temp_dir / "corrupted.wav"
+        corrupted.write_bytes(b"not audio at all")
+
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+
+            with pytest.raises(AudioCorruptedError):
+                processor.decode(corrupted)
+
     def test_convert_for_whisper(self, mock_config, sample_audio_file, temp_dir):
         """Vérifie la conversion au format Whisper."""
         mock_config.paths.temp = temp_dir / "temp"
@@ -323,6 +455,25 @@ class TestAudioProcessor:
             assert len(chunks) >= 1
             assert all(c.exists() for c in chunks)
 
+    def test_split_audio_multiple_chunks(self, mock_config, longer_audio_file, temp_dir):
+        """Vérifie la découpe en plusieurs chunks de durée fixe."""
+        import soundfile as sf
+
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+
+            # 2 secondes par chunk pour un fichier de 5 secondes
+            chunks = processor.split_audio(
+                longer_audio_file,
+                chunk_minutes=2 / 60,
+                output_dir=temp_dir / "chunks",
+            )
+
+            assert len(chunks) == 3
+            frames = [sf.info(str(c)).frames for c in chunks]
+            assert frames[:2] == [32000, 32000]
+            assert sf.info(str(chunks[0])).samplerate == 16000
+
     def test_cleanup_temp_files(self, mock_config, temp_dir):
         """Vérifie le nettoyage des fichiers temporaires."""
         mock_config.paths.temp = temp_dir / "temp"
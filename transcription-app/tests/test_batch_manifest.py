@@ -0,0 +1,86 @@
+"""
+Tests unitaires pour le module src/core/batch_manifest.py
+"""
+import pytest
+
+from src.core.batch_manifest import BatchManifest
+
+
+@pytest.fixture
+def manifest(temp_dir):
+    with BatchManifest("nightly", db_path=temp_dir / "batches.sqlite3") as m:
+        yield m
+
+
+class TestBatchManifest:
+    """Tests pour le manifeste SQLite des batchs."""
+
+    def test_open_and_load(self, manifest, temp_dir):
+        files = [temp_dir / "b.wav", temp_dir / "a.wav"]
+        manifest.open_batch(files, {"language": "fr"})
+
+        loaded, options = manifest.load()
+
+        assert loaded == [f.resolve() for f in files]
+        assert options == {"language": "fr"}
+        assert manifest.status_counts() == {"pending": 2}
+
+    def test_reopen_keeps_statuses(self, manifest, temp_dir):
+        """Vérifie qu'un second open_batch ne réinitialise pas les fichiers connus."""
+        path = temp_dir / "a.wav"
+        manifest.open_batch([path], {})
+        manifest.mark_running(path)
+        manifest.record(path, "completed", "h1", {"model": "tiny"}, 1.5, [])
+
+        manifest.open_batch([path, temp_dir / "b.wav"], {})
+
+        assert manifest.status_counts() == {"completed": 1, "pending": 1}
+        item = manifest.get_item(path)
+        assert item["attempts"] == 1
+        assert item["processing_time"] == 1.5
+
+    def test_is_done_requires_same_hash_params_and_outputs(self, manifest, temp_dir):
+        path = temp_dir / "a.wav"
+        output = temp_dir / "a.txt"
+        output.write_text("x", encoding="utf-8")
+        manifest.open_batch([path], {})
+        manifest.record(path, "completed", "h1", {"model": "tiny"}, 1.0, [output])
+
+        assert manifest.is_done(path, "h1", {"model": "tiny"})
+        assert not manifest.is_done(path, "h2", {"model": "tiny"})
+        assert not manifest.is_done(path, "h1", {"model": "medium"})
+
+        output.unlink()
+        assert not manifest.is_done(path, "h1", {"model": "tiny"})
+
+    def test_mark_pending(self, manifest, temp_dir):
+        path = temp_dir / "a.wav"
+        manifest.open_batch([path], {})
+        manifest.mark_running(path)
+
+        manifest.mark_pending([path])
+
+        assert manifest.status_counts() == {"pending": 1}
+        assert manifest.get_item(path)["attempts"] == 1
+
+    def test_failed_is_not_done(self, manifest, temp_dir):
+        path = temp_dir / "a.wav"
+        manifest.open_batch([path], {})
+        manifest.record(path, "failed", "h1", {}, 0.1, [], "boom")
+
+        assert not manifest.is_done(path, "h1", {})
+        assert manifest.get_item(path)["error"] == "boom"
+
+    def test_persists_across_connections(self, temp_dir):
+        db = temp_dir / "batches.sqlite3"
+        with BatchManifest("nightly", db_path=db) as m:
+            m.open_batch([temp_dir / "a.wav"], {})
+
+        with BatchManifest("nightly", db_path=db) as m:
+            assert m.exists()
+        with BatchManifest("other", db_path=db) as m:
+            assert not m.exists()
+
+    def test_load_unknown_batch(self, manifest):
+        with pytest.raises(KeyError):
+            manifest.load()
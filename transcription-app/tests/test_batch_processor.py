@@ -0,0 +1,755 @@
+"""
+Tests unitaires pour le module src/core/batch_processor.py
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.core import batch_processor
+from src.core.audio_processor import DecodedAudio
+from src.core.batch_manifest import BatchManifest
+from src.core.batch_processor import (
+    BatchItemStatus,
+    BatchOptions,
+    BatchProcessor,
+    BatchProgress,
+    get_audio_files_from_directory,
+    iter_audio_files,
+)
+from src.core.cancellation import CancellationToken
+from src.core.chunking import AudioChunk
+from src.core.diarizer import DiarizationResult, SpeakerSegment
+from src.core.transcriber import TranscriptionResult, TranscriptionSegment
+from src.utils.config import DiarizationConfig, TranscriptionConfig
+
+
+def _result(text: str) -> TranscriptionResult:
+    return TranscriptionResult(
+        segments=[TranscriptionSegment(start=0.0, end=1.0, text=text)],
+        language="fr",
+        language_probability=0.9,
+        duration=1.0,
+    )
+
+
+@pytest.fixture
+def transcriber():
+    transcriber = MagicMock()
+    transcriber.model_name = transcriber.preferred_model = "tiny"
+    transcriber.cpu_threads = 4
+    transcriber.config = TranscriptionConfig(model="tiny", cpu_threads=4)
+    transcriber.transcribe.side_effect = lambda audio, language=None, cancel_token=None: _result(audio.path.stem)
+    return transcriber
+
+
+@pytest.fixture
+def audio_files(temp_dir):
+    files = []
+    for name in ("a", "b", "c"):
+        path = temp_dir / f"{name}.wav"
+        path.write_bytes(b"RIFF" + name.encode())
+        files.append(path)
+    return files
+
+
+def _decode(path: Path):
+    audio = MagicMock()
+    audio.path = path
+    audio.duration = 1.0
+    return audio
+
+
+class TestBatchProcessor:
+    """Tests pour le traitement séquentiel et parallèle."""
+
+    def test_sequential(self, mock_config, transcriber, audio_files, temp_dir):
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            result = processor.process(
+                audio_files, BatchOptions(use_diarization=False, output_dir=temp_dir / "out"),
+            )
+
+        assert result.completed_count == 3
+        assert (temp_dir / "out" / "b.txt").read_text(encoding="utf-8").endswith("b")
+
+    def test_item_events_emitted_as_files_finish(self, mock_config, transcriber, audio_files, temp_dir):
+        processor = BatchProcessor(transcriber)
+        events = []
+        first_done = threading.Event()
+
+        def on_item(event):
+            events.append(event)
+            if event.index == 0:
+                first_done.set()
+
+        def transcribe(audio, language=None, cancel_token=None):
+            if audio.path.stem == "b":
+                raise RuntimeError("crash")
+            # L'événement de a est émis sans attendre la fin du batch
+            if audio.path.stem == "c":
+                assert first_done.wait(5)
+            return _result(audio.path.stem)
+
+        transcriber.transcribe.side_effect = transcribe
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode), \
+                patch.object(processor.audio_processor, "get_audio_info", return_value={"duration": 10.0}):
+            processor.process(
+                audio_files,
+                BatchOptions(use_diarization=False, output_dir=temp_dir / "out"),
+                item_callback=on_item,
+            )
+
+        events.sort(key=lambda e: e.index)
+        assert [(e.index, e.status) for e in events] == [
+            (0, BatchItemStatus.COMPLETED), (1, BatchItemStatus.FAILED), (2, BatchItemStatus.COMPLETED),
+        ]
+        assert events[0].output_paths == [temp_dir / "out" / "a.txt"]
+        assert events[0].real_time_factor == pytest.approx(events[0].processing_time / 10.0)
+        assert events[1].error_message == "crash"
+        assert events[1].real_time_factor is None
+
+    def test_cancel_mid_file_keeps_partial_result(self, mock_config, transcriber, audio_files, temp_dir):
+        processor = BatchProcessor(transcriber)
+
+        def transcribe(audio, language=None, cancel_token=None):
+            # Annulation pendant le décodage du premier fichier
+            processor.cancel()
+            result = _result(audio.path.stem)
+            result.is_partial = cancel_token.cancelled
+            return result
+
+        transcriber.transcribe.side_effect = transcribe
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            result = processor.process(
+                audio_files, BatchOptions(use_diarization=False, output_dir=temp_dir / "out"),
+            )
+
+        assert transcriber.transcribe.call_count == 1
+        assert all(item.status == BatchItemStatus.SKIPPED for item in result.items)
+        assert result.items[0].load_result().is_partial is True
+        assert not (temp_dir / "out" / "a.txt").exists()
+
+    def test_results_spilled_to_disk(self, mock_config, transcriber, audio_files, temp_dir):
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            result = processor.process(
+                audio_files, BatchOptions(use_diarization=False, output_dir=temp_dir / "out"),
+            )
+
+        item = result.items[1]
+        assert item.result is None
+        assert (item.language, item.segment_count) == ("fr", 1)
+        assert item.load_result().segments[0].text == "b"
+
+        result.discard_results()
+        assert not any((temp_dir / "temp").rglob("*.jsonl"))
+        assert result.items[1].load_result() is None
+
+    def test_next_file_decoded_during_transcription(self, mock_config, transcriber, audio_files):
+        """Vérifie que le fichier suivant est décodé pendant la transcription du courant."""
+        mock_config.performance.prefetch_files = 1
+        processor = BatchProcessor(transcriber)
+        second_decoded = threading.Event()
+
+        def decode(path):
+            if path.stem == "b":
+                second_decoded.set()
+            return _decode(path)
+
+        def transcribe(audio, language=None, cancel_token=None):
+            if audio.path.stem == "a":
+                assert second_decoded.wait(5), "b n'a pas été préchargé"
+            return _result(audio.path.stem)
+
+        transcriber.transcribe.side_effect = transcribe
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=decode):
+            result = processor.process(audio_files, BatchOptions(use_diarization=False))
+
+        assert result.completed_count == 3
+
+    def test_without_prefetch(self, mock_config, transcriber, audio_files, temp_dir):
+        mock_config.performance.prefetch_files = 0
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode) as mock_load:
+            result = processor.process(
+                audio_files, BatchOptions(use_diarization=False, output_dir=temp_dir),
+            )
+
+        assert result.completed_count == 3
+        assert [c.args[0].stem for c in mock_load.call_args_list] == ["a", "b", "c"]
+
+    def test_async_save_error_fails_item(self, mock_config, transcriber, audio_files):
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode), \
+                patch.object(processor, "_save_result", side_effect=OSError("disque plein")):
+            result = processor.process(audio_files, BatchOptions(use_diarization=False))
+
+        assert result.failed_count == 3
+        assert result.items[0].error_message == "disque plein"
+
+    def test_missing_file_fails_only_its_item(self, mock_config, transcriber, audio_files, temp_dir):
+        processor = BatchProcessor(transcriber)
+        files = [audio_files[0], temp_dir / "absent.wav", audio_files[1]]
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            result = processor.process(
+                files, BatchOptions(use_diarization=False, output_dir=temp_dir / "out"),
+            )
+
+        assert [item.status for item in result.items] == [
+            BatchItemStatus.COMPLETED, BatchItemStatus.FAILED, BatchItemStatus.COMPLETED,
+        ]
+
+    def test_parallel_streams_results(self, mock_config, transcriber, audio_files, temp_dir):
+        """Vérifie la répartition sur le pool et la remontée de chaque résultat."""
+        mock_config.performance.batch_workers = 2
+        processor = BatchProcessor(transcriber)
+
+        def worker_init(model_name, transcription_config, diarization_config, started, cancel_event):
+            batch_processor._worker_started = started
+            worker = BatchProcessor(transcriber)
+            worker._cancel_token = CancellationToken(cancel_event)
+            worker._load_file = _decode
+            batch_processor._worker_processor = worker
+
+        def thread_pool(workers, initargs):
+            assert initargs[1].cpu_threads == 2
+            return ThreadPoolExecutor(workers, initializer=worker_init, initargs=initargs)
+
+        progress = []
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.plan_worker_count", return_value=2), \
+                patch.object(processor, "_create_pool", side_effect=thread_pool):
+            result = processor.process(
+                audio_files,
+                BatchOptions(use_diarization=False, output_dir=temp_dir / "out"),
+                progress_callback=lambda *args: progress.append(args),
+            )
+
+        assert result.completed_count == 3
+        assert [item.load_result().segments[0].text for item in result.items] == ["a", "b", "c"]
+        assert sorted(p[0] for p in progress) == [1, 2, 3]
+        assert (temp_dir / "out" / "c.txt").exists()
+
+    def test_parallel_worker_crash_fails_item(self, mock_config, transcriber, audio_files):
+        mock_config.performance.batch_workers = 2
+        processor = BatchProcessor(transcriber)
+
+        def thread_pool(workers, initargs):
+            return ThreadPoolExecutor(workers)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.plan_worker_count", return_value=2), \
+                patch("src.core.batch_processor._process_batch_file", side_effect=RuntimeError("crash")), \
+                patch.object(processor, "_create_pool", side_effect=thread_pool):
+            result = processor.process(audio_files, BatchOptions(use_diarization=False))
+
+        assert result.failed_count == 3
+        assert all(item.status == BatchItemStatus.FAILED for item in result.items)
+
+
+class TestBatchScheduling:
+    """Tests pour l'ordonnancement par durée et l'ETA."""
+
+    @staticmethod
+    def _pool(transcriber, decode, max_workers=None):
+        def worker_init(model_name, transcription_config, diarization_config, started, cancel_event):
+            batch_processor._worker_started = started
+            worker = BatchProcessor(transcriber)
+            worker._cancel_token = CancellationToken(cancel_event)
+            worker._load_file = decode
+            batch_processor._worker_processor = worker
+
+        def create(workers, initargs):
+            return ThreadPoolExecutor(max_workers or workers, initializer=worker_init, initargs=initargs)
+        return create
+
+    def test_longest_files_submitted_first(self, mock_config, transcriber, audio_files):
+        mock_config.performance.batch_workers = 2
+        durations = {"a": 10.0, "b": 300.0, "c": 60.0}
+        processor = BatchProcessor(transcriber)
+        order = []
+
+        def transcribe(audio, language=None, cancel_token=None):
+            order.append(audio.path.stem)
+            return _result(audio.path.stem)
+
+        transcriber.transcribe.side_effect = transcribe
+        # Un seul thread: les tâches s'exécutent dans l'ordre de soumission
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.plan_worker_count", return_value=2), \
+                patch.object(processor.audio_processor, "get_audio_info",
+                             side_effect=lambda p: {"duration": durations[p.stem]}), \
+                patch.object(processor, "_create_pool",
+                             side_effect=self._pool(transcriber, _decode, max_workers=1)):
+            result = processor.process(audio_files, BatchOptions(use_diarization=False))
+
+        assert result.completed_count == 3
+        assert order == ["b", "c", "a"]
+
+    def test_long_file_split_across_workers(self, mock_config, transcriber, audio_files, temp_dir):
+        mock_config.performance.batch_workers = 2
+        mock_config.performance.chunk_size_minutes = 1
+        sr = 100
+        durations = {"a": 400.0, "b": 10.0, "c": 10.0}
+        processor = BatchProcessor(transcriber)
+
+        def decode(path):
+            return DecodedAudio(path, np.zeros(int(durations[path.stem] * sr), np.int16), sr)
+
+        transcriber.transcribe.side_effect = lambda audio, language=None, cancel_token=None: TranscriptionResult(
+            segments=[TranscriptionSegment(start=0.0, end=audio.duration, text=f"{audio.duration:.0f}")],
+            language="fr",
+            language_probability=0.9,
+            duration=audio.duration,
+        )
+        chunks = [
+            AudioChunk(0, 0, 210 * sr, 0.0, 200.0, sr),
+            AudioChunk(1, 190 * sr, 400 * sr, 200.0, float("inf"), sr),
+        ]
+        progress = []
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.plan_worker_count", return_value=2), \
+                patch("src.core.batch_processor.plan_chunks", return_value=chunks), \
+                patch.object(processor.audio_processor, "get_audio_info",
+                             side_effect=lambda p: {"duration": durations[p.stem]}), \
+                patch.object(processor, "_load_file", side_effect=decode), \
+                patch.object(processor, "_create_pool", side_effect=self._pool(transcriber, decode)):
+            result = processor.process(
+                audio_files,
+                BatchOptions(use_diarization=False, output_dir=temp_dir / "out"),
+                eta_callback=lambda p: progress.append((p.done_seconds, p.done_items)),
+            )
+
+        assert result.completed_count == 3
+        segments = result.items[0].load_result().segments
+        assert [(s.start, s.end, s.text) for s in segments] == [(0.0, 210.0, "210"), (190.0, 400.0, "210")]
+        assert (temp_dir / "out" / "a.txt").exists()
+        assert progress[-1] == (420.0, 3)
+
+    def test_long_file_language_detected_once(self, mock_config, transcriber, audio_files, temp_dir):
+        """En détection automatique, tous les chunks d'un fichier long reçoivent la même langue."""
+        mock_config.performance.batch_workers = 2
+        mock_config.performance.chunk_size_minutes = 1
+        transcriber.config.language = "auto"
+        sr = 100
+        durations = {"a": 400.0, "b": 10.0, "c": 10.0}
+        processor = BatchProcessor(transcriber)
+
+        def decode(path):
+            return DecodedAudio(path, np.zeros(int(durations[path.stem] * sr), np.int16), sr)
+
+        languages = []
+
+        def transcribe(audio, language=None, cancel_token=None):
+            languages.append((audio.duration, language))
+            return _result(audio.path.stem)
+
+        transcriber.transcribe.side_effect = transcribe
+        transcriber.detect_language.return_value = ("de", 0.8)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.plan_worker_count", return_value=2), \
+                patch("src.core.batch_processor.plan_chunks", side_effect=self._two_chunks), \
+                patch.object(processor.audio_processor, "get_audio_info",
+                             side_effect=lambda p: {"duration": durations[p.stem]}), \
+                patch.object(processor, "_load_file", side_effect=decode), \
+                patch.object(processor, "_create_pool", side_effect=self._pool(transcriber, decode)):
+            result = processor.process(audio_files, BatchOptions(use_diarization=False))
+
+        assert result.completed_count == 3
+        transcriber.detect_language.assert_called_once()
+        assert transcriber.detect_language.call_args.args[0].duration == 30.0
+        assert sorted(language for duration, language in languages if duration > 10.0) == ["de", "de"]
+        assert result.items[0].load_result().language_probability == 0.8
+
+    def test_progress_weighted_by_duration(self):
+        progress = BatchProgress(total_seconds=100.0, total_items=2)
+        assert progress.eta_seconds is None
+
+        progress.done_seconds = 75.0
+        progress.done_items = 1
+        progress.started_at -= 30.0
+
+        assert progress.percent == 75.0
+        assert progress.eta_seconds == pytest.approx(10.0, abs=0.5)
+
+    def test_progress_falls_back_to_item_count(self):
+        progress = BatchProgress(total_seconds=0.0, total_items=4, done_items=1)
+        assert progress.percent == 25.0
+
+    @staticmethod
+    def _two_chunks(audio, chunk_seconds, overlap_seconds):
+        sr, half = audio.sample_rate, audio.num_samples // 2
+        return [
+            AudioChunk(0, 0, half + 10 * sr, 0.0, half / sr, sr),
+            AudioChunk(1, half - 10 * sr, audio.num_samples, half / sr, float("inf"), sr),
+        ]
+
+    def test_long_files_split_one_at_a_time(self, mock_config, transcriber, audio_files):
+        """Vérifie qu'un fichier long n'est décodé qu'une fois le précédent traité."""
+        mock_config.performance.batch_workers = 4
+        mock_config.performance.chunk_size_minutes = 1
+        sr = 100
+        durations = {"a": 400.0, "b": 400.0, "c": 10.0}
+        processor = BatchProcessor(transcriber)
+        events = []
+
+        def decode(path):
+            events.append(f"decode {path.stem}")
+            return DecodedAudio(path, np.zeros(int(durations[path.stem] * sr), np.int16), sr)
+
+        def transcribe(audio, language=None, cancel_token=None):
+            events.append(f"transcribe {audio.path.stem}")
+            return _result(audio.path.stem)
+
+        transcriber.transcribe.side_effect = transcribe
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.plan_worker_count", return_value=4), \
+                patch("src.core.batch_processor.SPLIT_FILES_IN_FLIGHT", 1), \
+                patch("src.core.batch_processor.plan_chunks", side_effect=self._two_chunks), \
+                patch.object(processor.audio_processor, "get_audio_info",
+                             side_effect=lambda p: {"duration": durations[p.stem]}), \
+                patch.object(processor, "_load_file", side_effect=decode), \
+                patch.object(processor, "_create_pool",
+                             side_effect=self._pool(transcriber, decode, max_workers=1)):
+            result = processor.process(audio_files, BatchOptions(use_diarization=False))
+
+        assert result.completed_count == 3
+        last_a = max(i for i, e in enumerate(events) if e == "transcribe a")
+        assert events.index("decode b") > last_a
+
+    def test_long_file_diarized_in_one_task(self, mock_config, transcriber, audio_files):
+        """Vérifie que les chunks d'un fichier long partagent une seule diarization."""
+        mock_config.performance.batch_workers = 4
+        mock_config.performance.chunk_size_minutes = 1
+        sr = 100
+        durations = {"a": 400.0, "b": 100.0}
+        files = audio_files[:2]
+        diarizer = MagicMock()
+        diarizer.config = DiarizationConfig()
+        diarizer.diarize.side_effect = lambda audio, **kwargs: DiarizationResult(
+            segments=[SpeakerSegment(0.0, audio.duration, "SPEAKER_0")], num_speakers=1,
+        )
+        processor = BatchProcessor(transcriber, diarizer)
+
+        def decode(path):
+            return DecodedAudio(path, np.zeros(int(durations[path.stem] * sr), np.int16), sr)
+
+        def worker_init(model_name, transcription_config, diarization_config, started, cancel_event):
+            batch_processor._worker_started = started
+            worker = BatchProcessor(transcriber, diarizer)
+            worker._cancel_token = CancellationToken(cancel_event)
+            worker._load_file = decode
+            batch_processor._worker_processor = worker
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.plan_worker_count", return_value=4), \
+                patch("src.core.batch_processor.plan_chunks", side_effect=self._two_chunks), \
+                patch.object(processor.audio_processor, "get_audio_info",
+                             side_effect=lambda p: {"duration": durations[p.stem]}), \
+                patch.object(processor, "_load_file", side_effect=decode), \
+                patch.object(processor, "_create_pool", side_effect=lambda workers, initargs: ThreadPoolExecutor(
+                    1, initializer=worker_init, initargs=initargs)):
+            result = processor.process(files, BatchOptions(use_diarization=True))
+
+        assert result.completed_count == 2
+        # a (découpé): une tâche de diarization sur le fichier entier; b: traité d'un bloc
+        assert sorted(c.args[0].duration for c in diarizer.diarize.call_args_list) == [100.0, 400.0]
+        assert {s.speaker for s in result.items[0].load_result().segments} == {"SPEAKER_0"}
+
+
+class TestBatchDeduplication:
+    """Tests pour skip_existing et les doublons, par empreinte du contenu."""
+
+    def test_identical_files_transcribed_once(self, mock_config, transcriber, audio_files, temp_dir):
+        copy = temp_dir / "copie.wav"
+        copy.write_bytes(audio_files[0].read_bytes())
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            result = processor.process(
+                [*audio_files, copy], BatchOptions(use_diarization=False, output_dir=temp_dir / "out"),
+            )
+
+        assert transcriber.transcribe.call_count == 3
+        assert result.completed_count == 4
+        assert result.items[3].output_paths == [temp_dir / "out" / "copie.txt"]
+        assert (temp_dir / "out" / "copie.txt").read_text(encoding="utf-8").endswith("a")
+
+    def test_skip_existing_recognizes_renamed_copy(self, mock_config, transcriber, audio_files, temp_dir):
+        options = BatchOptions(use_diarization=False, output_dir=temp_dir / "out", skip_existing=True)
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            processor.process(audio_files[:1], options)
+            renamed = audio_files[0].rename(temp_dir / "renomme.wav")
+            transcriber.transcribe.reset_mock()
+            result = processor.process([renamed], options)
+
+        assert transcriber.transcribe.call_count == 0
+        assert result.items[0].status == BatchItemStatus.SKIPPED
+        assert (temp_dir / "out" / "renomme.txt").exists()
+
+    def test_skip_existing_ignores_outputs_from_other_settings(
+        self, mock_config, transcriber, audio_files, temp_dir,
+    ):
+        processor = BatchProcessor(transcriber)
+        stale = temp_dir / "out" / "a.txt"
+        stale.parent.mkdir()
+        stale.write_text("ancienne sortie", encoding="utf-8")
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            result = processor.process(
+                audio_files[:1],
+                BatchOptions(use_diarization=False, output_dir=temp_dir / "out", skip_existing=True),
+            )
+
+        assert result.items[0].status == BatchItemStatus.COMPLETED
+        assert stale.read_text(encoding="utf-8") != "ancienne sortie"
+
+    def test_skip_existing_reprocesses_after_decoding_change(
+        self, mock_config, transcriber, audio_files, temp_dir,
+    ):
+        options = BatchOptions(use_diarization=False, output_dir=temp_dir / "out", skip_existing=True)
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            processor.process(audio_files[:1], options)
+            transcriber.config.beam_size = 1
+            transcriber.transcribe.reset_mock()
+            result = processor.process(audio_files[:1], options)
+
+        assert transcriber.transcribe.call_count == 1
+        assert result.items[0].status == BatchItemStatus.COMPLETED
+
+    def test_sampled_hash_collision_not_deduplicated(
+        self, mock_config, transcriber, audio_files, temp_dir,
+    ):
+        """Deux contenus différents de même empreinte échantillonnée sont traités tous les deux."""
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.content_hash", return_value="meme-empreinte"), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            result = processor.process(
+                audio_files, BatchOptions(use_diarization=False, output_dir=temp_dir / "out"),
+            )
+
+        assert transcriber.transcribe.call_count == 3
+        assert result.completed_count == 3
+        assert (temp_dir / "out" / "c.txt").read_text(encoding="utf-8").endswith("c")
+
+    def test_skip_existing_confirms_full_content(self, mock_config, transcriber, audio_files, temp_dir):
+        options = BatchOptions(use_diarization=False, output_dir=temp_dir / "out", skip_existing=True)
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.content_hash", return_value="meme-empreinte"), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            processor.process(audio_files[:1], options)
+            transcriber.transcribe.reset_mock()
+            result = processor.process(audio_files[1:2], options)
+
+        assert transcriber.transcribe.call_count == 1
+        assert result.items[0].output_paths == [temp_dir / "out" / "b.txt"]
+        assert (temp_dir / "out" / "b.txt").read_text(encoding="utf-8").endswith("b")
+
+    def test_full_hash_read_only_when_index_consulted(
+        self, mock_config, transcriber, audio_files, temp_dir,
+    ):
+        """Sans skip_existing, l'empreinte complète n'est calculée qu'à la première consultation."""
+        processor = BatchProcessor(transcriber)
+        full_hash = MagicMock(side_effect=batch_processor.full_content_hash)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.full_content_hash", full_hash), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            processor.process(audio_files[:1], BatchOptions(use_diarization=False, output_dir=temp_dir / "out"))
+            assert full_hash.call_count == 0
+
+            transcriber.transcribe.reset_mock()
+            options = BatchOptions(use_diarization=False, output_dir=temp_dir / "out", skip_existing=True)
+            result = processor.process(audio_files[:1], options)
+
+        assert transcriber.transcribe.call_count == 0
+        assert result.items[0].status == BatchItemStatus.SKIPPED
+        # Source de l'entrée (même fichier) et fichier courant, lu une seule fois
+        assert full_hash.call_count == 2
+
+    def test_source_changed_before_first_lookup_is_reprocessed(
+        self, mock_config, transcriber, audio_files, temp_dir,
+    ):
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.content_hash", return_value="meme-empreinte"), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            processor.process(audio_files[:1], BatchOptions(use_diarization=False, output_dir=temp_dir / "out"))
+            audio_files[0].write_bytes(b"RIFF-modifie")
+            transcriber.transcribe.reset_mock()
+            options = BatchOptions(use_diarization=False, output_dir=temp_dir / "out", skip_existing=True)
+            result = processor.process(audio_files[:1], options)
+
+        assert transcriber.transcribe.call_count == 1
+        assert result.items[0].status == BatchItemStatus.COMPLETED
+
+    def test_params_keyed_on_admitted_model(self, transcriber, mock_config):
+        """Un modèle rétrogradé encore chargé ne change pas la clé: l'admission rechargera le modèle préféré."""
+        transcriber.model_name = "base"
+        transcriber.preferred_model = "small"
+        processor = BatchProcessor(transcriber)
+
+        with patch("src.core.batch_processor.get_config", return_value=mock_config):
+            params = processor._effective_params(BatchOptions(use_diarization=False))
+
+        assert params["model"] == "small"
+
+
+class TestBatchResume:
+    """Tests pour la reprise d'un batch nommé."""
+
+    def test_resume_skips_completed_and_retries_failures(
+        self, mock_config, transcriber, audio_files, temp_dir,
+    ):
+        mock_config.paths.output = temp_dir / "manifest"
+        options = BatchOptions(use_diarization=False, output_dir=temp_dir / "out", batch_name="nuit")
+        processor = BatchProcessor(transcriber)
+
+        def flaky(audio, language=None, cancel_token=None):
+            if audio.path.stem == "b":
+                raise RuntimeError("crash")
+            return _result(audio.path.stem)
+
+        transcriber.transcribe.side_effect = flaky
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_manifest.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            first = processor.process(audio_files, options)
+
+        assert first.completed_count == 2
+        assert first.failed_count == 1
+
+        transcriber.transcribe.side_effect = lambda audio, language=None, cancel_token=None: _result(audio.path.stem)
+        transcriber.transcribe.reset_mock()
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_manifest.get_config", return_value=mock_config), \
+                patch.object(processor, "_load_file", side_effect=_decode):
+            resumed = processor.resume("nuit")
+
+        assert [item.status for item in resumed.items] == [
+            BatchItemStatus.SKIPPED, BatchItemStatus.COMPLETED, BatchItemStatus.SKIPPED,
+        ]
+        assert transcriber.transcribe.call_count == 1
+        assert (temp_dir / "out" / "b.txt").exists()
+
+
+    def test_cancelled_parallel_batch_leaves_unfinished_pending(
+        self, mock_config, transcriber, audio_files, temp_dir,
+    ):
+        """Vérifie qu'aucun fichier ne reste « en cours » après une annulation."""
+        mock_config.paths.output = temp_dir / "manifest"
+        mock_config.performance.batch_workers = 2
+        options = BatchOptions(use_diarization=False, output_dir=temp_dir / "out", batch_name="nuit")
+        processor = BatchProcessor(transcriber)
+
+        def transcribe(audio, language=None, cancel_token=None):
+            processor.cancel()
+            return _result(audio.path.stem)
+
+        transcriber.transcribe.side_effect = transcribe
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_manifest.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.plan_worker_count", return_value=2), \
+                patch.object(processor, "_create_pool",
+                             side_effect=TestBatchScheduling._pool(transcriber, _decode, max_workers=1)):
+            result = processor.process(audio_files, options)
+
+        assert result.completed_count == 1
+        with BatchManifest("nuit", db_path=temp_dir / "manifest" / "batches.sqlite3") as manifest:
+            assert manifest.status_counts() == {"completed": 1, "pending": 2}
+
+    def test_cancel_reaches_running_workers(self, mock_config, transcriber, audio_files, temp_dir):
+        """Vérifie que l'annulation interrompt le fichier en cours dans un processus du pool."""
+        mock_config.paths.output = temp_dir / "manifest"
+        mock_config.performance.batch_workers = 2
+        options = BatchOptions(use_diarization=False, output_dir=temp_dir / "out", batch_name="nuit")
+        processor = BatchProcessor(transcriber)
+        observed = []
+
+        def transcribe(audio, language=None, cancel_token=None):
+            processor.cancel()
+            # Jeton du processus: levé par le parent, pas par cancel() lui-même
+            deadline = time.monotonic() + 5
+            while not cancel_token.cancelled and time.monotonic() < deadline:
+                time.sleep(0.01)
+            observed.append(cancel_token.cancelled)
+            result = _result(audio.path.stem)
+            result.is_partial = True
+            return result
+
+        transcriber.transcribe.side_effect = transcribe
+        with patch("src.core.batch_processor.get_config", return_value=mock_config), \
+                patch("src.core.batch_manifest.get_config", return_value=mock_config), \
+                patch("src.core.batch_processor.plan_worker_count", return_value=2), \
+                patch.object(processor, "_create_pool",
+                             side_effect=TestBatchScheduling._pool(transcriber, _decode, max_workers=1)):
+            result = processor.process(audio_files, options)
+
+        assert observed == [True]
+        assert result.completed_count == 0
+        assert not (temp_dir / "out").exists() or not list((temp_dir / "out").iterdir())
+        with BatchManifest("nuit", db_path=temp_dir / "manifest" / "batches.sqlite3") as manifest:
+            assert manifest.status_counts() == {"pending": 3}
+
+
+class TestAudioFileDiscovery:
+    """Tests pour le parcours des répertoires."""
+
+    @pytest.fixture
+    def tree(self, temp_dir):
+        for rel in ("b.wav", "A.MP3", "notes.txt", "sub/c.Flac", "sub/deep/d.m4a", "sub/image.png"):
+            path = temp_dir / "root" / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"x")
+        return temp_dir / "root"
+
+    def test_recursive_case_insensitive(self, tree):
+        files = get_audio_files_from_directory(tree, recursive=True)
+        assert [f.name for f in files] == ["A.MP3", "b.wav", "c.Flac", "d.m4a"]
+
+    def test_non_recursive(self, tree):
+        assert [f.name for f in get_audio_files_from_directory(tree)] == ["A.MP3", "b.wav"]
+
+    def test_symlink_loop_not_followed(self, tree):
+        (tree / "sub" / "loop").symlink_to(tree, target_is_directory=True)
+        assert len(get_audio_files_from_directory(tree, recursive=True)) == 4
+
+    def test_cancel_stops_walk(self, tree):
+        assert list(iter_audio_files(tree, recursive=True, cancelled=lambda: True)) == []
+
+    def test_missing_directory(self, temp_dir):
+        assert get_audio_files_from_directory(temp_dir / "absent") == []
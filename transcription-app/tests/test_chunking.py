@@ -0,0 +1,120 @@
+"""
+Tests unitaires pour le module src/core/chunking.py
+"""
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from src.core.audio_processor import DecodedAudio
+from src.core.chunking import (
+    AudioChunk,
+    find_cut_point,
+    plan_chunks,
+    shift_segment,
+    stitch_segments,
+)
+from src.core.transcriber import TranscriptionSegment
+
+
+def _speech_with_pauses(seconds: int, pause_every: int) -> DecodedAudio:
+    """Bruit continu avec une seconde de silence toutes les `pause_every` secondes."""
+    sr = 16000
+    np.random.seed(0)
+    pcm = (np.random.randn(seconds * sr) * 3000).astype(np.int16)
+    for t in range(pause_every, seconds, pause_every):
+        pcm[t * sr:(t + 1) * sr] = 0
+    return DecodedAudio(path=Path("long.wav"), pcm=pcm)
+
+
+class TestFindCutPoint:
+    """Tests pour la recherche d'un point de coupe."""
+
+    def test_cut_in_silence(self):
+        """Vérifie que la coupe tombe dans le silence le plus proche."""
+        audio = _speech_with_pauses(60, pause_every=20)
+
+        with patch("src.core.chunking._speech_gaps", side_effect=RuntimeError("no vad")):
+            cut = find_cut_point(audio, target=18 * 16000, search_seconds=10)
+
+        assert 20 * 16000 <= cut < 21 * 16000
+
+    def test_cut_uses_vad_gaps(self):
+        """Vérifie que les silences du VAD sont utilisés en priorité."""
+        audio = _speech_with_pauses(60, pause_every=20)
+
+        with patch("src.core.chunking._speech_gaps", return_value=[(0, 16000)]):
+            cut = find_cut_point(audio, target=30 * 16000, search_seconds=10)
+
+        # Fenêtre [25s, 35s]: le silence (0, 1s) relatif est centré sur 25.5s
+        assert cut == 25 * 16000 + 8000
+
+
+class TestPlanChunks:
+    """Tests pour le plan de découpage."""
+
+    def test_short_audio_single_chunk(self):
+        """Vérifie qu'un audio court n'est pas découpé."""
+        audio = DecodedAudio(path=Path("a.wav"), pcm=np.zeros(16000 * 5, dtype=np.int16))
+
+        chunks = plan_chunks(audio, chunk_seconds=10)
+
+        assert len(chunks) == 1
+        assert chunks[0].start == 0
+        assert chunks[0].end == audio.num_samples
+
+    def test_chunks_cover_audio_with_overlap(self):
+        """Vérifie la couverture complète, le recouvrement et les zones possédées."""
+        audio = _speech_with_pauses(100, pause_every=20)
+
+        with patch("src.core.chunking._speech_gaps", side_effect=RuntimeError("no vad")):
+            chunks = plan_chunks(audio, chunk_seconds=20, overlap_seconds=2.0)
+
+        assert len(chunks) > 1
+        assert chunks[0].start == 0
+        assert chunks[-1].end == audio.num_samples
+        assert chunks[0].keep_start == 0.0
+        assert chunks[-1].keep_end == float("inf")
+        for previous, current in zip(chunks, chunks[1:]):
+            # Les zones possédées se touchent et les chunks se recouvrent
+            assert previous.keep_end == current.keep_start
+            assert current.start < previous.end
+
+
+class TestStitchSegments:
+    """Tests pour le recollage des segments."""
+
+    def test_shift_segment(self):
+        """Vérifie le décalage des timestamps (segment et mots)."""
+        segment = TranscriptionSegment(
+            start=1.0, end=2.0, text="Bonjour",
+            words=[{"word": "Bonjour", "start": 1.0, "end": 2.0, "probability": 0.9}],
+        )
+
+        shifted = shift_segment(segment, 100.0)
+
+        assert shifted.start == 101.0
+        assert shifted.words[0]["end"] == 102.0
+        assert segment.start == 1.0  # original intact
+
+    def test_overlap_dedup(self):
+        """Vérifie qu'un segment de la zone de recouvrement n'est gardé qu'une fois."""
+        first = AudioChunk(index=0, start=0, end=12 * 16000, keep_start=0.0, keep_end=10.0)
+        second = AudioChunk(
+            index=1, start=8 * 16000, end=20 * 16000, keep_start=10.0, keep_end=float("inf")
+        )
+
+        stitched = stitch_segments([
+            (second, [
+                TranscriptionSegment(start=1.0, end=3.0, text="doublon"),
+                TranscriptionSegment(start=4.0, end=6.0, text="suite"),
+            ]),
+            (first, [
+                TranscriptionSegment(start=0.0, end=5.0, text="début"),
+                TranscriptionSegment(start=9.0, end=11.0, text="doublon"),
+            ]),
+        ])
+
+        assert [s.text for s in stitched] == ["début", "doublon", "suite"]
+        assert stitched[1].start == 9.0
+        assert stitched[2].start == 12.0
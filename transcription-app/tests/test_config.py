@@ -29,6 +29,10 @@ class TestTranscriptionConfig:
         assert config.cpu_threads == 0
         assert config.vad_filter is True
         assert config.beam_size == 5
+        assert config.mode == "sequential"
+        assert config.batch_size == 8
+        assert config.parallel_workers == 1
+        assert config.num_workers == 1
 
     def test_custom_values(self):
         """Vérifie l'initialisation avec valeurs personnalisées."""
@@ -48,6 +52,17 @@ class TestTranscriptionConfig:
         assert config.vad_filter is False
         assert config.beam_size == 10
 
+    def test_unknown_mode_rejected(self):
+        """Un mode de décodage inconnu est refusé au chargement."""
+        with pytest.raises(ValueError, match="batchd"):
+            TranscriptionConfig(mode="batchd")
+
+    def test_batched_mode_forces_vad(self):
+        """Le mode batched a besoin du VAD pour découper l'audio."""
+        config = TranscriptionConfig(mode="batched", vad_filter=False)
+
+        assert config.vad_filter is True
+
 
 class TestDiarizationConfig:
     """Tests pour DiarizationConfig dataclass."""
@@ -58,6 +73,8 @@ class TestDiarizationConfig:
 
         assert config.min_speakers == 0
         assert config.max_speakers == 0
+        assert config.chunk_minutes == 0
+        assert config.parallel_chunks == 1
 
     def test_custom_speakers(self):
         """Vérifie la configuration avec nombre de locuteurs personnalisé."""
@@ -118,6 +135,17 @@ class TestPerformanceConfig:
 
         assert config.chunk_size_minutes == 10
         assert config.aggressive_gc is True
+        assert config.pcm_cache_max_mb == 4096
+        assert config.concurrent_diarization is True
+        assert config.batch_workers == 1
+        assert config.prefetch_files == 1
+        assert config.memory_budget_mb == 8192
+        assert config.model_cache_mb == 0
+        assert config.preload_models is True
+        assert config.model_idle_unload_minutes == 15
+        assert config.model_host is False
+        assert config.memory_reserve_mb == 512
+        assert config.allow_model_downgrade is True
 
 
 class TestAppConfig:
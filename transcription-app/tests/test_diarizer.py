@@ -1,6 +1,7 @@
 """
 Tests unitaires pour le module src/core/diarizer.py
 """
+import numpy as np
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -10,6 +11,7 @@ from src.core.diarizer import (
     DiarizationResult,
     Diarizer,
     assign_speakers_to_transcription,
+    link_chunk_speakers,
 )
 from src.core.transcriber import TranscriptionResult, TranscriptionSegment
 
@@ -89,6 +91,95 @@ class TestDiarizationResult:
         assert speaker == "SPEAKER_00"
 
 
+class TestDiarizationResultIndex:
+    """Tests pour les recherches vectorisées de DiarizationResult."""
+
+    @staticmethod
+    def _random_diarization(num_segments, num_speakers=3, seed=0):
+        """Tours de parole aléatoires (qui se chevauchent entre locuteurs)."""
+        rng = np.random.default_rng(seed)
+        segments = []
+        for i in range(num_speakers):
+            t = rng.uniform(0, 2)
+            for _ in range(num_segments // num_speakers):
+                t += rng.uniform(0.1, 3)
+                end = t + rng.uniform(0.2, 5)
+                segments.append(SpeakerSegment(start=t, end=end, speaker=f"SPEAKER_{i:02d}"))
+                t = end
+        rng.shuffle(segments)
+        return DiarizationResult(segments=segments, num_speakers=num_speakers)
+
+    @staticmethod
+    def _linear_overlaps(diarization, start, end):
+        """Implémentation de référence (parcours linéaire)."""
+        overlaps = {}
+        for seg in diarization.segments:
+            overlap = min(end, seg.end) - max(start, seg.start)
+            if overlap > 0:
+                overlaps[seg.speaker] = overlaps.get(seg.speaker, 0) + overlap
+        return overlaps
+
+    def test_ranges_match_linear_scan(self):
+        """Vérifie que l'index choisit un locuteur majoritaire, comme le parcours linéaire."""
+        diarization = self._random_diarization(300)
+        rng = np.random.default_rng(1)
+        starts = rng.uniform(0, 400, 500)
+        ends = starts + rng.uniform(0.1, 10, 500)
+
+        speakers = diarization.speakers_for_ranges(starts, ends)
+
+        for s, e, speaker in zip(starts, ends, speakers):
+            overlaps = self._linear_overlaps(diarization, s, e)
+            if not overlaps:
+                assert speaker is None
+            else:
+                # Égalités possibles quand la plage est couverte par deux locuteurs
+                assert overlaps[speaker] == pytest.approx(max(overlaps.values()))
+
+    def test_speakers_at_matches_containing_segment(self):
+        """Vérifie que le locuteur retourné a bien un segment contenant l'instant."""
+        diarization = self._random_diarization(300)
+        times = np.random.default_rng(2).uniform(0, 400, 500)
+
+        for t, speaker in zip(times, diarization.speakers_at(times)):
+            containing = {s.speaker for s in diarization.segments if s.start <= t <= s.end}
+            if containing:
+                assert speaker in containing
+            else:
+                assert speaker is None
+
+    def test_same_speaker_overlaps_counted_once(self):
+        """Vérifie que des segments d'un même locuteur qui se chevauchent ne comptent qu'une fois."""
+        diarization = DiarizationResult(
+            segments=[
+                SpeakerSegment(start=0.0, end=4.0, speaker="SPEAKER_00"),
+                SpeakerSegment(start=1.0, end=3.0, speaker="SPEAKER_00"),
+                SpeakerSegment(start=0.0, end=3.5, speaker="SPEAKER_01"),
+            ],
+            num_speakers=2,
+        )
+
+        assert diarization.get_speaker_for_range(0.0, 4.0) == "SPEAKER_00"
+
+    def test_index_rebuilt_after_append(self):
+        """Vérifie que l'index suit l'ajout de segments."""
+        diarization = DiarizationResult(
+            segments=[SpeakerSegment(start=0.0, end=1.0, speaker="SPEAKER_00")],
+            num_speakers=1,
+        )
+        assert diarization.get_speaker_at(5.0) is None
+
+        diarization.segments.append(SpeakerSegment(start=4.0, end=6.0, speaker="SPEAKER_01"))
+
+        assert diarization.get_speaker_at(5.0) == "SPEAKER_01"
+
+    def test_empty_result(self):
+        diarization = DiarizationResult(segments=[], num_speakers=0)
+
+        assert diarization.speakers_for_ranges(np.array([0.0]), np.array([1.0])) == [None]
+        assert diarization.get_speaker_at(1.0) is None
+
+
 class TestDiarizer:
     """Tests pour la classe Diarizer (NeMo Sortformer)."""
 
@@ -183,6 +274,290 @@ class TestDiarizer:
             mock_diarize.assert_called_once()
             assert isinstance(result, DiarizationResult)
 
+    def test_diarize_restores_torch_threads(self, mock_diarizer_deps, sample_audio_file):
+        """Vérifie que num_threads ne bride pas les diarizations suivantes."""
+        diarizer = Diarizer()
+        diarizer.model = MagicMock()
+        torch = MagicMock()
+        torch.get_num_threads.return_value = 8
+
+        with patch.dict("sys.modules", {"torch": torch}), \
+                patch.object(diarizer, "_diarize_nemo", side_effect=RuntimeError("échec")):
+            with pytest.raises(RuntimeError):
+                diarizer.diarize(sample_audio_file, num_threads=2)
+
+        assert [c.args for c in torch.set_num_threads.call_args_list] == [(2,), (8,)]
+
+
+    def test_diarize_nemo_reuses_decoded_audio(self, mock_diarizer_deps):
+        """Vérifie qu'un DecodedAudio n'est pas redécodé avant Sortformer."""
+        import numpy as np
+        from src.core.audio_processor import DecodedAudio
+
+        diarizer = Diarizer()
+        diarizer.model = MagicMock()
+        diarizer.model.diarize.return_value = [["0.000 1.000 speaker_0"]]
+        audio = DecodedAudio(path=Path("meeting.m4a"), pcm=np.zeros(16000, dtype=np.int16))
+
+        with patch("src.core.diarizer.AudioProcessor") as mock_processor:
+            result = diarizer.diarize(audio)
+
+            mock_processor.return_value.decode.assert_not_called()
+
+        assert result.num_speakers == 1
+        assert result.segments[0].speaker == "SPEAKER_0"
+
+
+class TestInMemoryDiarization:
+    """Tests pour le passage de l'audio en mémoire à Sortformer."""
+
+    class _InMemoryModel:
+        """Modèle factice exposant la signature NeMo récente."""
+
+        def __init__(self):
+            self.calls = []
+
+        def diarize(self, audio, sample_rate=None, batch_size=1):
+            self.calls.append((audio, sample_rate))
+            return [["0.000 1.000 speaker_0"]]
+
+    @pytest.fixture
+    def audio(self):
+        from src.core.audio_processor import DecodedAudio
+        return DecodedAudio(path=Path("meeting.m4a"), pcm=np.full(16000, 16384, dtype=np.int16))
+
+    def test_float_samples_passed_without_temp_file(self, mock_config, audio):
+        """Vérifie qu'aucun WAV temporaire n'est écrit quand NeMo accepte un tableau."""
+        with patch("src.core.diarizer.get_config", return_value=mock_config):
+            diarizer = Diarizer()
+        diarizer.model = self._InMemoryModel()
+
+        with patch("src.core.diarizer.tempfile.NamedTemporaryFile") as mock_tmp:
+            result = diarizer.diarize(audio)
+
+            mock_tmp.assert_not_called()
+
+        samples, sample_rate = diarizer.model.calls[0]
+        assert sample_rate == 16000
+        assert samples.dtype == np.float32
+        assert samples[0] == pytest.approx(0.5)
+        assert result.num_speakers == 1
+
+    def test_path_decoded_once(self, mock_config, audio):
+        """Vérifie qu'un chemin est décodé une fois puis passé en mémoire."""
+        with patch("src.core.diarizer.get_config", return_value=mock_config):
+            diarizer = Diarizer()
+        diarizer.model = self._InMemoryModel()
+
+        with patch("src.core.diarizer.AudioProcessor") as mock_processor:
+            mock_processor.return_value.decode.return_value = audio
+            diarizer.diarize(Path("meeting.m4a"))
+
+            mock_processor.return_value.decode.assert_called_once()
+        assert len(diarizer.model.calls) == 1
+
+    def test_falls_back_to_temp_wav(self, mock_config, audio):
+        """Vérifie le repli WAV temporaire (supprimé ensuite) pour les anciens NeMo."""
+        with patch("src.core.diarizer.get_config", return_value=mock_config):
+            diarizer = Diarizer()
+
+        paths = []
+
+        class PathOnlyModel:
+            def diarize(self, audio, batch_size=1):
+                paths.append(Path(audio))
+                assert Path(audio).exists()
+                return [["0.000 1.000 speaker_0"]]
+
+        diarizer.model = PathOnlyModel()
+        diarizer.diarize(audio)
+
+        assert paths[0].suffix == ".wav"
+        assert not paths[0].exists()
+
+
+class TestChunkedDiarization:
+    """Tests pour la diarization par fenêtres des fichiers longs."""
+
+    @staticmethod
+    def _chunks():
+        from src.core.chunking import AudioChunk
+        sr = 16000
+        return [
+            AudioChunk(0, 0, 115 * sr, 0.0, 100.0, sr),
+            AudioChunk(1, 85 * sr, 200 * sr, 100.0, float("inf"), sr),
+        ]
+
+    def test_link_speakers_by_overlap_agreement(self):
+        """Vérifie le raccord des étiquettes locales via la zone de recouvrement."""
+        first, second = self._chunks()
+        result = link_chunk_speakers([
+            (second, [
+                SpeakerSegment(0.0, 20.0, "SPEAKER_0"),   # 85-105: suite de B
+                SpeakerSegment(20.0, 60.0, "SPEAKER_1"),  # 105-145: nouveau locuteur
+            ]),
+            (first, [
+                SpeakerSegment(0.0, 50.0, "SPEAKER_0"),
+                SpeakerSegment(50.0, 115.0, "SPEAKER_1"),
+            ]),
+        ])
+
+        assert [(s.start, s.end, s.speaker) for s in result] == [
+            (0.0, 50.0, "SPEAKER_0"),
+            (50.0, 105.0, "SPEAKER_1"),
+            (105.0, 145.0, "SPEAKER_2"),
+        ]
+
+    def test_link_speaker_silent_in_overlap_by_profile(self):
+        """Un locuteur muet dans le recouvrement est relié par son profil acoustique."""
+        from src.core.audio_processor import DecodedAudio
+
+        sr = 16000
+        rng = np.random.default_rng(0)
+
+        def voice(frequencies, seconds):
+            t = np.arange(int(seconds * sr)) / sr
+            tone = sum(np.sin(2 * np.pi * f * t) for f in frequencies)
+            return tone * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)) + 0.05 * rng.standard_normal(len(t))
+
+        low, high = (150, 300, 450), (1200, 2400, 3100)
+        # A: 0-50 s, B: 50-80 s, A: 80-120 s (seul dans le recouvrement 85-115), B: 125-200 s
+        pcm = np.concatenate([
+            voice(low, 50), voice(high, 30), voice(low, 40), np.zeros(5 * sr), voice(high, 75),
+        ])
+        audio = DecodedAudio(path=Path("long.wav"), pcm=(pcm / np.abs(pcm).max() * 16000).astype(np.int16))
+        first, second = self._chunks()
+        chunks = [
+            (first, [
+                SpeakerSegment(0.0, 50.0, "SPEAKER_0"),
+                SpeakerSegment(50.0, 80.0, "SPEAKER_1"),
+                SpeakerSegment(80.0, 115.0, "SPEAKER_0"),
+            ]),
+            (second, [
+                SpeakerSegment(0.0, 35.0, "SPEAKER_0"),
+                SpeakerSegment(40.0, 115.0, "SPEAKER_1"),
+            ]),
+        ]
+
+        without_audio = link_chunk_speakers(chunks)
+        result = link_chunk_speakers(chunks, audio=audio)
+
+        assert len({s.speaker for s in without_audio}) == 3
+        assert [(s.start, s.end, s.speaker) for s in result] == [
+            (0.0, 50.0, "SPEAKER_0"),
+            (50.0, 80.0, "SPEAKER_1"),
+            (80.0, 120.0, "SPEAKER_0"),
+            (125.0, 200.0, "SPEAKER_1"),
+        ]
+
+    def test_link_without_agreement_creates_new_speakers(self):
+        first, second = self._chunks()
+        result = link_chunk_speakers([
+            (first, [SpeakerSegment(0.0, 80.0, "SPEAKER_0")]),
+            (second, [SpeakerSegment(40.0, 100.0, "SPEAKER_0")]),
+        ])
+
+        assert [s.speaker for s in result] == ["SPEAKER_0", "SPEAKER_1"]
+
+    def test_long_audio_diarized_per_chunk(self, mock_config):
+        """Vérifie que chaque fenêtre est passée séparément à Sortformer."""
+        from src.core.audio_processor import DecodedAudio
+
+        mock_config.diarization.chunk_minutes = 1
+        mock_config.diarization.chunk_overlap_seconds = 5.0
+        with patch("src.core.diarizer.get_config", return_value=mock_config):
+            diarizer = Diarizer()
+
+        lengths = []
+
+        class Model:
+            def diarize(self, audio, sample_rate=None, batch_size=1):
+                lengths.append(len(audio))
+                return [[f"0.000 {len(audio) / 16000:.3f} speaker_0"]]
+
+        diarizer.model = Model()
+        audio = DecodedAudio(path=Path("long.wav"), pcm=np.zeros(150 * 16000, dtype=np.int16))
+
+        with patch("src.core.chunking._speech_gaps", return_value=[]):
+            result = diarizer.diarize(audio)
+
+        assert len(lengths) == 3
+        assert max(lengths) < audio.num_samples
+        # Un seul locuteur continu: fenêtres reliées et tours refusionnés
+        assert [(s.start, s.end, s.speaker) for s in result.segments] == [
+            (0.0, 150.0, "SPEAKER_0"),
+        ]
+
+    def test_cancel_stops_after_current_window(self, mock_config):
+        from src.core.audio_processor import DecodedAudio
+        from src.core.cancellation import CancellationToken
+
+        mock_config.diarization.chunk_minutes = 1
+        mock_config.diarization.chunk_overlap_seconds = 5.0
+        with patch("src.core.diarizer.get_config", return_value=mock_config):
+            diarizer = Diarizer()
+
+        token = CancellationToken()
+        calls = []
+
+        class Model:
+            def diarize(self, audio, sample_rate=None, batch_size=1):
+                calls.append(len(audio))
+                token.cancel()
+                return [[f"0.000 {len(audio) / 16000:.3f} speaker_0"]]
+
+        diarizer.model = Model()
+        audio = DecodedAudio(path=Path("long.wav"), pcm=np.zeros(150 * 16000, dtype=np.int16))
+
+        with patch("src.core.chunking._speech_gaps", return_value=[]):
+            result = diarizer.diarize(audio, cancel_token=token)
+
+        assert len(calls) == 1
+        assert result.is_partial is True
+        assert result.segments[0].start == 0.0
+
+
+    def test_parallel_windows_submitted_lazily(self, mock_config):
+        """Sans cache PCM, les fenêtres sont copiées vers le pool au fil des résultats, pas toutes d'emblée."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.core import diarizer as diarizer_module
+        from src.core.audio_processor import DecodedAudio
+        from src.core.chunking import AudioChunk
+
+        mock_config.diarization.parallel_chunks = 2
+        with patch("src.core.diarizer.get_config", return_value=mock_config):
+            diarizer = Diarizer()
+
+        sr = 16000
+        chunks = [AudioChunk(i, i * 10 * sr, (i + 1) * 10 * sr, 10.0 * i, 10.0 * (i + 1), sr) for i in range(10)]
+        audio = DecodedAudio(path=Path("long.wav"), pcm=np.zeros(100 * sr, dtype=np.int16))
+        lock = threading.Lock()
+        counts = {"built": 0, "done": 0, "max_ahead": 0}
+
+        def build(audio, chunk):
+            with lock:
+                counts["built"] += 1
+                counts["max_ahead"] = max(counts["max_ahead"], counts["built"] - counts["done"])
+            return np.zeros(1, dtype=np.int16)
+
+        def diarize_chunk(payload, sample_rate):
+            with lock:
+                counts["done"] += 1
+            return [SpeakerSegment(0.0, 1.0, "SPEAKER_0")]
+
+        def pool(max_workers, mp_context, initializer, initargs):
+            return ThreadPoolExecutor(max_workers)
+
+        with patch("src.core.chunking.chunk_payload", side_effect=build), \
+                patch.object(diarizer_module, "_diarize_chunk", side_effect=diarize_chunk), \
+                patch("concurrent.futures.ProcessPoolExecutor", side_effect=pool):
+            results = diarizer._diarize_chunks_parallel(audio, chunks, lambda done: None)
+
+        assert sorted(chunk.index for chunk, _ in results) == list(range(10))
+        assert counts["max_ahead"] <= 4
+
 
 class TestAssignSpeakersToTranscription:
     """Tests pour la fonction assign_speakers_to_transcription."""
@@ -289,3 +664,106 @@ class TestAssignSpeakersToTranscription:
 
         # Pas de locuteur trouvé
         assert result.segments[0].speaker is None
+
+
+class TestWordLevelAssignment:
+    """Tests pour l'attribution des locuteurs au niveau des mots."""
+
+    @staticmethod
+    def _words(*items):
+        return [{"word": w, "start": s, "end": e, "probability": 0.9} for w, s, e in items]
+
+    @pytest.fixture
+    def diarization(self):
+        return DiarizationResult(
+            segments=[
+                SpeakerSegment(start=0.0, end=2.0, speaker="SPEAKER_00"),
+                SpeakerSegment(start=2.0, end=5.0, speaker="SPEAKER_01"),
+            ],
+            num_speakers=2,
+        )
+
+    def test_segment_split_at_speaker_change(self, diarization):
+        """Vérifie qu'un segment couvrant deux tours de parole est redécoupé."""
+        transcription = TranscriptionResult(
+            segments=[
+                TranscriptionSegment(
+                    start=0.0, end=4.0, text=" Bonjour. Salut, ça va?",
+                    words=self._words(
+                        (" Bonjour.", 0.0, 1.5),
+                        (" Salut,", 2.1, 2.8),
+                        (" ça", 2.9, 3.2),
+                        (" va?", 3.3, 4.0),
+                    ),
+                    confidence=-0.2,
+                ),
+            ],
+            language="fr",
+            language_probability=0.9,
+            duration=4.0,
+        )
+
+        result = assign_speakers_to_transcription(transcription, diarization)
+
+        assert [s.speaker for s in result.segments] == ["SPEAKER_00", "SPEAKER_01"]
+        first, second = result.segments
+        assert (first.start, first.end, first.text) == (0.0, 1.5, " Bonjour.")
+        assert (second.start, second.end, second.text) == (2.1, 4.0, " Salut, ça va?")
+        assert len(second.words) == 3
+        assert second.confidence == -0.2
+
+    def test_single_speaker_segment_kept(self, diarization):
+        """Vérifie qu'un segment homogène n'est pas redécoupé."""
+        segment = TranscriptionSegment(
+            start=2.5, end=4.0, text=" Oui.", words=self._words((" Oui.", 2.5, 4.0)),
+        )
+        transcription = TranscriptionResult(
+            segments=[segment], language="fr", language_probability=0.9, duration=4.0,
+        )
+
+        result = assign_speakers_to_transcription(transcription, diarization)
+
+        assert result.segments == [segment]
+        assert segment.speaker == "SPEAKER_01"
+
+    def test_word_in_gap_uses_segment_speaker(self):
+        """Vérifie qu'un mot hors de tout tour de parole garde le locuteur du segment."""
+        diarization = DiarizationResult(
+            segments=[SpeakerSegment(start=0.0, end=2.0, speaker="SPEAKER_00")],
+            num_speakers=1,
+        )
+        transcription = TranscriptionResult(
+            segments=[
+                TranscriptionSegment(
+                    start=0.0, end=3.0, text=" Un deux",
+                    words=self._words((" Un", 0.0, 1.0), (" deux", 2.5, 3.0)),
+                ),
+            ],
+            language="fr",
+            language_probability=0.9,
+            duration=3.0,
+        )
+
+        result = assign_speakers_to_transcription(transcription, diarization)
+
+        assert len(result.segments) == 1
+        assert result.segments[0].speaker == "SPEAKER_00"
+
+    def test_split_disabled(self, diarization):
+        transcription = TranscriptionResult(
+            segments=[
+                TranscriptionSegment(
+                    start=0.0, end=4.0, text=" A B",
+                    words=self._words((" A", 0.0, 1.0), (" B", 2.5, 4.0)),
+                ),
+            ],
+            language="fr",
+            language_probability=0.9,
+            duration=4.0,
+        )
+
+        result = assign_speakers_to_transcription(
+            transcription, diarization, split_on_speaker_change=False,
+        )
+
+        assert len(result.segments) == 1
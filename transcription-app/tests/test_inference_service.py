@@ -0,0 +1,165 @@
+"""
+Tests unitaires pour le module src/core/inference_service.py
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.cancellation import CancellationToken
+from src.core.exceptions import TranscriptionCancelledError
+from src.core.inference_service import InferenceService, Priority
+
+
+class FakeTranscriber:
+    """Transcriber qui note l'ordre et la concurrence des appels."""
+
+    def __init__(self, num_workers=1, delay=0.0):
+        self.config = SimpleNamespace(num_workers=num_workers)
+        self.model_name = "tiny"
+        self.delay = delay
+        self.gate = threading.Event()
+        self.gate.set()
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.users = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            self.users += 1
+
+    def release(self):
+        with self._lock:
+            self.users -= 1
+
+    def transcribe(self, audio, language=None, progress_callback=None, cancel_token=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self.gate.wait()
+        time.sleep(self.delay)
+        if audio == "erreur":
+            raise ValueError("décodage impossible")
+        with self._lock:
+            self.active -= 1
+            self.calls.append(audio)
+        return audio
+
+
+class TestInferenceService:
+    """Tests de la file d'inférence."""
+
+    def test_interactive_jobs_before_batch(self):
+        transcriber = FakeTranscriber()
+        service = InferenceService(transcriber)
+        transcriber.gate.clear()
+
+        first = service.submit("en-cours")
+        while transcriber.active == 0:
+            time.sleep(0.005)
+        batch = [service.submit(f"lot-{i}") for i in range(2)]
+        interactive = service.submit("fichier", priority=Priority.INTERACTIVE)
+        transcriber.gate.set()
+
+        for future in (first, *batch, interactive):
+            future.result(timeout=2)
+        assert transcriber.calls == ["en-cours", "fichier", "lot-0", "lot-1"]
+        service.shutdown()
+
+    def test_concurrency_bounded_by_replicas(self):
+        transcriber = FakeTranscriber(num_workers=2, delay=0.02)
+        service = InferenceService(transcriber)
+
+        futures = [service.submit(i) for i in range(6)]
+
+        assert sorted(f.result(timeout=2) for f in futures) == list(range(6))
+        assert transcriber.max_active == 2
+        service.shutdown()
+
+    def test_cancelled_while_queued(self):
+        transcriber = FakeTranscriber()
+        service = InferenceService(transcriber)
+        token = CancellationToken()
+        token.cancel()
+
+        with pytest.raises(TranscriptionCancelledError):
+            service.transcribe("fichier", cancel_token=token)
+        assert transcriber.calls == []
+        service.shutdown()
+
+    def test_cancel_queued_job_behind_running_one(self):
+        """Vérifie qu'un job en file annulé rend la main sans attendre le job en cours."""
+        transcriber = FakeTranscriber()
+        service = InferenceService(transcriber)
+        transcriber.gate.clear()
+        running = service.submit("en-cours")
+        while transcriber.active == 0:
+            time.sleep(0.005)
+
+        token = CancellationToken()
+        errors = []
+
+        def wait_queued():
+            try:
+                service.transcribe("en-file", cancel_token=token)
+            except TranscriptionCancelledError as e:
+                errors.append(e)
+
+        caller = threading.Thread(target=wait_queued)
+        caller.start()
+        token.cancel()
+        caller.join(timeout=2)
+
+        assert not caller.is_alive()
+        assert len(errors) == 1
+        assert not running.done()
+
+        transcriber.gate.set()
+        assert running.result(timeout=2) == "en-cours"
+        service.shutdown()
+        assert transcriber.calls == ["en-cours"]
+
+    def test_queued_jobs_reserve_the_model(self):
+        """Vérifie que le modèle reste réservé du dépôt en file à la fin du job."""
+        transcriber = FakeTranscriber()
+        service = InferenceService(transcriber)
+        transcriber.gate.clear()
+
+        running = service.submit("en-cours")
+        queued = service.submit("en-file")
+        cancelled = service.submit("annulé")
+        assert transcriber.users == 3
+
+        cancelled.cancel()
+        assert transcriber.users == 2
+        transcriber.gate.set()
+        running.result(timeout=2)
+        queued.result(timeout=2)
+        service.shutdown()
+        assert transcriber.users == 0
+
+    def test_errors_reach_caller(self):
+        service = InferenceService(FakeTranscriber())
+
+        with pytest.raises(ValueError, match="décodage impossible"):
+            service.transcribe("erreur")
+        service.shutdown()
+
+    def test_client_delegates_to_shared_transcriber(self):
+        transcriber = FakeTranscriber()
+        service = InferenceService(transcriber)
+        client = service.client(Priority.INTERACTIVE)
+
+        assert client.model_name == "tiny"
+        assert client.transcribe("fichier", language="fr") == "fichier"
+        service.shutdown()
+
+    def test_submit_after_shutdown(self):
+        service = InferenceService(FakeTranscriber())
+        service.shutdown()
+
+        with pytest.raises(RuntimeError):
+            service.submit("fichier")
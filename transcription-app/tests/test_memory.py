@@ -0,0 +1,160 @@
+"""
+Tests unitaires pour le module src/utils/memory.py
+"""
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.memory import (
+    DIARIZATION_FOOTPRINT_MB,
+    JOB_WORKING_SET_MB,
+    WHISPER_FOOTPRINT_MB,
+    available_memory_mb,
+    cgroup_available_mb,
+    diarization_footprint_mb,
+    measure_footprint,
+    plan_worker_count,
+    whisper_footprint_mb,
+    worker_footprint_mb,
+)
+
+MB = 1024 * 1024
+
+
+class TestWorkerFootprint:
+    """Tests pour l'estimation de l'empreinte d'un processus."""
+
+    def test_transcription_only(self):
+        assert worker_footprint_mb("medium", False) == WHISPER_FOOTPRINT_MB["medium"] + JOB_WORKING_SET_MB
+
+    def test_with_diarization(self):
+        assert (
+            worker_footprint_mb("medium", True)
+            == worker_footprint_mb("medium", False) + DIARIZATION_FOOTPRINT_MB
+        )
+
+    def test_unknown_model_uses_largest(self):
+        assert worker_footprint_mb("custom", False) == worker_footprint_mb("large-v3", False)
+
+    def test_compute_type_scales_footprint(self):
+        assert whisper_footprint_mb("medium", "float32") > whisper_footprint_mb("medium", "int8")
+
+    def test_measured_footprint_replaces_estimate(self):
+        with patch("src.utils.memory.process_rss_mb", side_effect=[1000, 3600]):
+            with measure_footprint(("whisper", "medium", "int8")):
+                pass
+
+        assert whisper_footprint_mb("medium", "int8") == 2600
+
+    def test_measured_footprint_never_below_estimate(self):
+        with patch("src.utils.memory.process_rss_mb", side_effect=[1000, 1200]):
+            with measure_footprint(("whisper", "medium", "int8")):
+                pass
+
+        assert whisper_footprint_mb("medium", "int8") == WHISPER_FOOTPRINT_MB["medium"]
+
+    def test_concurrent_loads_not_measured(self):
+        """Vérifie qu'un chargement chevauché par un autre ne fixe aucune mesure."""
+        with patch("src.utils.memory.process_rss_mb", side_effect=[1000, 2000, 8000, 9000]):
+            with measure_footprint(("whisper", "medium", "int8")):
+                with measure_footprint(("sortformer",)):
+                    pass
+
+        assert whisper_footprint_mb("medium", "int8") == WHISPER_FOOTPRINT_MB["medium"]
+        assert diarization_footprint_mb() == DIARIZATION_FOOTPRINT_MB
+
+
+class TestPlanWorkerCount:
+    """Tests pour le dimensionnement du pool de processus."""
+
+    def test_limited_by_budget(self):
+        """Vérifie que le groupe de processus tient dans le budget RAM."""
+        with patch("src.utils.memory.available_memory_mb", return_value=64000):
+            workers = plan_worker_count("medium", True, requested=0, budget_mb=8192, cpu_threads=32)
+
+        assert workers == 8192 // worker_footprint_mb("medium", True)
+        assert workers * worker_footprint_mb("medium", True) <= 8192
+
+    def test_limited_by_available_memory(self):
+        with patch("src.utils.memory.available_memory_mb", return_value=2000):
+            workers = plan_worker_count("tiny", False, requested=0, budget_mb=8192, cpu_threads=32)
+
+        assert workers == 2
+
+    def test_limited_by_cores(self):
+        with patch("src.utils.memory.available_memory_mb", return_value=64000):
+            workers = plan_worker_count("tiny", False, requested=0, budget_mb=64000, cpu_threads=6)
+
+        assert workers == 3
+
+    def test_limited_by_request(self):
+        with patch("src.utils.memory.available_memory_mb", return_value=None):
+            workers = plan_worker_count("tiny", False, requested=2, budget_mb=8192, cpu_threads=16)
+
+        assert workers == 2
+
+    def test_hosted_models_budget_only_the_job(self):
+        """Modèles dans le démon: chaque processus ne compte que sa mémoire de travail."""
+        with patch("src.utils.memory.available_memory_mb", return_value=64000):
+            local = plan_worker_count("medium", True, requested=0, budget_mb=8192, cpu_threads=32)
+            hosted = plan_worker_count("medium", True, requested=0, budget_mb=8192, cpu_threads=32, hosted=True)
+
+        assert local == 8192 // worker_footprint_mb("medium", True)
+        assert hosted == 8192 // JOB_WORKING_SET_MB
+
+    def test_at_least_one(self):
+        with patch("src.utils.memory.available_memory_mb", return_value=100):
+            assert plan_worker_count("large-v3", True, requested=4, budget_mb=8192, cpu_threads=1) == 1
+
+
+class TestAvailableMemory:
+    """Tests pour la lecture de la mémoire disponible."""
+
+    def test_returns_positive_or_none(self):
+        available = available_memory_mb()
+        assert available is None or available > 0
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="cgroups: Linux uniquement")
+class TestCgroupMemory:
+    """Tests pour la lecture des limites cgroup (conteneurs)."""
+
+    def test_cgroup_v2(self, temp_dir):
+        (temp_dir / "cgroup.controllers").write_text("memory")
+        (temp_dir / "memory.max").write_text(f"{8192 * MB}\n")
+        (temp_dir / "memory.current").write_text(f"{6144 * MB}\n")
+        (temp_dir / "memory.stat").write_text(f"anon 1\ninactive_file {512 * MB}\n")
+
+        with patch("src.utils.memory._cgroup_v2_dir", return_value=temp_dir):
+            assert cgroup_available_mb(temp_dir) == 2048 + 512
+
+    def test_cgroup_v2_unlimited(self, temp_dir):
+        (temp_dir / "cgroup.controllers").write_text("memory")
+        (temp_dir / "memory.max").write_text("max\n")
+        (temp_dir / "memory.current").write_text(f"{6144 * MB}\n")
+
+        with patch("src.utils.memory._cgroup_v2_dir", return_value=temp_dir):
+            assert cgroup_available_mb(temp_dir) is None
+
+    def test_cgroup_v1(self, temp_dir):
+        memory = temp_dir / "memory"
+        memory.mkdir()
+        (memory / "memory.limit_in_bytes").write_text(f"{4096 * MB}\n")
+        (memory / "memory.usage_in_bytes").write_text(f"{3072 * MB}\n")
+        (memory / "memory.stat").write_text(f"total_inactive_file {256 * MB}\n")
+
+        assert cgroup_available_mb(temp_dir) == 1024 + 256
+
+    def test_cgroup_v1_unlimited(self, temp_dir):
+        memory = temp_dir / "memory"
+        memory.mkdir()
+        (memory / "memory.limit_in_bytes").write_text("9223372036854771712\n")
+        (memory / "memory.usage_in_bytes").write_text(f"{3072 * MB}\n")
+
+        assert cgroup_available_mb(temp_dir) is None
+
+    def test_available_memory_uses_smallest(self):
+        with patch("src.utils.memory._host_available_mb", return_value=12000), \
+             patch("src.utils.memory.cgroup_available_mb", return_value=3000):
+            assert available_memory_mb() == 3000
@@ -0,0 +1,145 @@
+"""
+Tests unitaires pour le module src/core/memory_planner.py
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.exceptions import InsufficientMemoryError, ModelInUseError
+from src.core.memory_planner import MemoryPlanner
+from src.utils.config import TranscriptionConfig
+from src.utils.memory import JOB_WORKING_SET_MB, diarization_footprint_mb, whisper_footprint_mb
+
+
+@pytest.fixture
+def transcriber():
+    transcriber = MagicMock()
+    transcriber.loads_locally = True
+    transcriber.model_name = transcriber.preferred_model = "large-v3"
+    transcriber.config = TranscriptionConfig(model="large-v3", compute_type="int8")
+    transcriber._model_key = None
+    transcriber.busy = False
+    return transcriber
+
+
+@pytest.fixture
+def diarizer():
+    diarizer = MagicMock()
+    diarizer.loads_locally = True
+    diarizer.model = None
+    diarizer._model_key = None
+    return diarizer
+
+
+@pytest.fixture
+def available():
+    """Mémoire disponible simulée (Mo)."""
+    with patch("src.core.memory_planner.available_memory_mb") as mock:
+        yield mock
+
+
+@pytest.fixture
+def planner():
+    return MemoryPlanner(reserve_mb=0, allow_downgrade=True)
+
+
+class TestMemoryPlanner:
+    """Tests du contrôle d'admission mémoire."""
+
+    def test_both_models_fit(self, planner, available, transcriber, diarizer):
+        available.return_value = 64000
+
+        plan = planner.admit(transcriber, diarizer, use_diarization=True)
+
+        assert not plan.sequential
+        assert not plan.downgraded
+        transcriber.switch_model.assert_not_called()
+
+    def test_sequential_when_only_one_fits(self, planner, available, transcriber, diarizer):
+        whisper = whisper_footprint_mb("large-v3")
+        available.return_value = whisper + JOB_WORKING_SET_MB + 100
+
+        plan = planner.admit(transcriber, diarizer, use_diarization=True)
+
+        assert plan.sequential
+        assert plan.model_name == "large-v3"
+
+    def test_downgrade_when_requested_model_does_not_fit(self, planner, available, transcriber):
+        available.return_value = whisper_footprint_mb("medium") + JOB_WORKING_SET_MB
+
+        plan = planner.admit(transcriber, None, use_diarization=False)
+
+        assert plan.downgraded
+        assert plan.model_name == "medium"
+        transcriber.switch_model.assert_called_once_with("medium")
+
+    def test_downgrade_only_to_downloaded_models(self, planner, available, transcriber):
+        transcriber.model_manager.is_whisper_downloaded.side_effect = lambda name: name in ("small", "tiny")
+        available.return_value = whisper_footprint_mb("medium") + JOB_WORKING_SET_MB
+
+        plan = planner.admit(transcriber, None, use_diarization=False)
+
+        assert plan.model_name == "small"
+
+    def test_downgrade_skips_specialized_model(self, planner, available, transcriber):
+        available.return_value = whisper_footprint_mb("large-v3-french") + JOB_WORKING_SET_MB
+
+        plan = planner.admit(transcriber, None, use_diarization=False)
+
+        assert plan.model_name == "medium"
+
+    def test_no_downgrade_raises(self, transcriber):
+        planner = MemoryPlanner(reserve_mb=0, allow_downgrade=False)
+        with patch("src.core.memory_planner.available_memory_mb", return_value=1000):
+            with pytest.raises(InsufficientMemoryError):
+                planner.admit(transcriber, None, use_diarization=False)
+
+    def test_resident_models_count_as_reclaimable(self, planner, available, transcriber, diarizer, model_registry):
+        whisper = whisper_footprint_mb("large-v3")
+        model_registry.acquire("whisper-key", object, whisper)
+        model_registry.acquire("sortformer-key", object, diarization_footprint_mb())
+        transcriber._model_key = "whisper-key"
+        diarizer._model_key = "sortformer-key"
+        diarizer.model = object()
+        available.return_value = JOB_WORKING_SET_MB
+
+        plan = planner.admit(transcriber, diarizer, use_diarization=True)
+
+        assert not plan.sequential
+        diarizer.unload.assert_not_called()
+
+    def test_busy_model_neither_switched_nor_unloaded(self, planner, available, transcriber, diarizer):
+        """Un autre job attend Whisper: pas de rétrogradation ni de plan séquentiel."""
+        transcriber.busy = True
+        transcriber.model = None  # Chargé par le job en file
+        available.return_value = whisper_footprint_mb("large-v3") + JOB_WORKING_SET_MB
+
+        with pytest.raises(InsufficientMemoryError):
+            planner.admit(transcriber, diarizer, use_diarization=True)
+        transcriber.switch_model.assert_not_called()
+
+    def test_busy_model_already_counted_as_used(self, planner, available, transcriber, diarizer):
+        transcriber.busy = True
+        available.return_value = diarization_footprint_mb() + JOB_WORKING_SET_MB
+
+        plan = planner.admit(transcriber, diarizer, use_diarization=True)
+
+        assert plan.model_name == "large-v3"
+        assert not plan.sequential
+
+    def test_busy_downgraded_model_refused_without_downgrade(self, transcriber):
+        transcriber.busy = True
+        transcriber.model_name = "medium"
+        planner = MemoryPlanner(reserve_mb=0, allow_downgrade=False)
+
+        with pytest.raises(ModelInUseError):
+            planner.admit(transcriber, None, use_diarization=False)
+
+    def test_hosted_models_skip_admission(self, transcriber):
+        transcriber.loads_locally = False
+        planner = MemoryPlanner(reserve_mb=0, allow_downgrade=False)
+
+        with patch("src.core.memory_planner.available_memory_mb", return_value=10):
+            plan = planner.admit(transcriber, None, use_diarization=False)
+
+        assert not plan.downgraded
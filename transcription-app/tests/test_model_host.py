@@ -0,0 +1,127 @@
+"""
+Tests unitaires pour le module src/core/model_host.py
+"""
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.core.audio_processor import DecodedAudio
+from src.core.cancellation import CancellationToken
+from src.core.exceptions import ModelHostError, TranscriptionFailedError
+from src.core.model_host import HostedTranscriber, ModelHostClient, ModelHostServer
+from src.core.transcriber import TranscriptionResult, TranscriptionSegment
+
+
+class FakeTranscriber:
+    """Transcriber sans modèle: résume le PCM reçu."""
+
+    instances = 0
+
+    def __init__(self, model_name=None, config=None):
+        FakeTranscriber.instances += 1
+        self.model_name = model_name
+
+    def load_model(self, progress_callback=None, cpu_threads=None):
+        pass
+
+    def transcribe(self, audio, language=None, progress_callback=None, cancel_token=None):
+        if language == "erreur":
+            raise TranscriptionFailedError("modèle en panne")
+        if language == "lent":
+            while not cancel_token.cancelled:
+                time.sleep(0.01)
+            return TranscriptionResult([], "fr", 1.0, 0.0, is_partial=True)
+
+        text = f"{int(audio.pcm.sum())} échantillons={audio.num_samples}"
+        if progress_callback:
+            progress_callback(0, text)
+        return TranscriptionResult(
+            segments=[TranscriptionSegment(0.0, audio.duration, text)],
+            language=language or "fr",
+            language_probability=1.0,
+            duration=audio.duration,
+        )
+
+
+@pytest.fixture
+def model_host(mock_config):
+    """Démon servi par un thread, sur un socket Unix de test."""
+    # Chemin court: les sockets Unix sont limités à ~100 caractères
+    address = str(Path(tempfile.mkdtemp(prefix="mh")) / "host.sock")
+    with patch("src.core.model_host.get_config", return_value=mock_config), \
+         patch("src.core.model_host.Transcriber", FakeTranscriber):
+        FakeTranscriber.instances = 0
+        server = ModelHostServer(address, "AF_UNIX")
+        server.start()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield ModelHostClient(address, "AF_UNIX")
+        server.shutdown()
+        thread.join(timeout=2)
+
+
+@pytest.fixture
+def decoded_audio():
+    pcm = np.arange(16000, dtype=np.int16)
+    return DecodedAudio(path=Path("memo.wav"), pcm=pcm)
+
+
+class TestModelHost:
+    """Tests du démon des modèles et de son client."""
+
+    def test_transcribe_through_shared_memory(self, model_host, decoded_audio):
+        segments = []
+
+        result = model_host.transcribe(
+            decoded_audio,
+            language="fr",
+            progress_callback=lambda i, text: segments.append(text),
+        )
+
+        expected = f"{int(decoded_audio.pcm.sum())} échantillons=16000"
+        assert result.segments[0].text == expected
+        assert result.duration == 1.0
+        assert segments == [expected]
+
+    def test_model_stays_resident_across_clients(self, model_host, decoded_audio):
+        model_host.transcribe(decoded_audio)
+        ModelHostClient(model_host.address, model_host.family).transcribe(decoded_audio)
+
+        assert FakeTranscriber.instances == 1
+
+    def test_job_error_reported_to_client(self, model_host, decoded_audio):
+        with pytest.raises(ModelHostError, match="modèle en panne"):
+            model_host.transcribe(decoded_audio, language="erreur")
+
+        assert model_host.available()
+
+    def test_cancel_returns_partial_result(self, model_host, decoded_audio):
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+
+        result = model_host.transcribe(decoded_audio, language="lent", cancel_token=token)
+
+        assert result.is_partial
+
+    def test_hosted_transcriber(self, model_host, decoded_audio, mock_config):
+        with patch("src.core.transcriber.get_config", return_value=mock_config):
+            transcriber = HostedTranscriber(model_host)
+        transcriber.load_model()
+
+        result = transcriber.transcribe(decoded_audio)
+
+        assert transcriber.model is not None
+        assert result.language == "fr"
+
+    def test_unreachable_host(self, temp_dir, mock_config):
+        client = ModelHostClient(str(temp_dir / "absent.sock"), "AF_UNIX")
+
+        with patch("src.core.model_host.get_config", return_value=mock_config):
+            assert not client.available()
+            with pytest.raises(ModelHostError):
+                client.ping()
@@ -0,0 +1,84 @@
+"""
+Tests unitaires pour le module src/core/model_lifecycle.py
+"""
+import time
+from unittest.mock import MagicMock
+
+from src.core.model_lifecycle import ModelLifecycle
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestModelLifecycle:
+    """Tests du préchargement et du déchargement sur inactivité."""
+
+    def test_preload_in_background(self):
+        transcriber, diarizer = MagicMock(), MagicMock()
+        lifecycle = ModelLifecycle(transcriber, diarizer)
+
+        lifecycle.preload().join(timeout=2)
+
+        transcriber.load_model.assert_called_once()
+        diarizer.load.assert_called_once()
+
+    def test_preload_without_diarization(self):
+        transcriber, diarizer = MagicMock(), MagicMock()
+        lifecycle = ModelLifecycle(transcriber, diarizer)
+
+        lifecycle.preload(diarization=False).join(timeout=2)
+
+        diarizer.load.assert_not_called()
+
+    def test_preload_failure_is_not_raised(self):
+        transcriber = MagicMock()
+        transcriber.load_model.side_effect = RuntimeError("modèle absent")
+        lifecycle = ModelLifecycle(transcriber, idle_seconds=0.05)
+
+        lifecycle.preload().join(timeout=2)
+
+        assert lifecycle._timer is None
+
+    def test_unload_after_idle_period(self):
+        transcriber, diarizer = MagicMock(), MagicMock()
+        lifecycle = ModelLifecycle(transcriber, diarizer, idle_seconds=0.05)
+
+        lifecycle.preload().join(timeout=2)
+
+        assert wait_until(lambda: transcriber.unload_model.called)
+        diarizer.unload.assert_called_once()
+
+    def test_no_unload_while_in_use(self):
+        transcriber = MagicMock()
+        lifecycle = ModelLifecycle(transcriber, idle_seconds=0.05)
+
+        with lifecycle.in_use():
+            lifecycle._touch()
+            time.sleep(0.15)
+            transcriber.unload_model.assert_not_called()
+
+        assert wait_until(lambda: transcriber.unload_model.called)
+
+    def test_idle_disabled(self):
+        transcriber = MagicMock()
+        lifecycle = ModelLifecycle(transcriber, idle_seconds=0)
+
+        lifecycle.preload().join(timeout=2)
+
+        assert lifecycle._timer is None
+
+    def test_shutdown_cancels_timer(self):
+        transcriber = MagicMock()
+        lifecycle = ModelLifecycle(transcriber, idle_seconds=60)
+        lifecycle.release()
+
+        lifecycle.shutdown()
+
+        assert lifecycle._timer is None
+        transcriber.unload_model.assert_called_once()
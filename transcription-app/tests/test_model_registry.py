@@ -0,0 +1,76 @@
+"""
+Tests unitaires pour le module src/core/model_registry.py
+"""
+import threading
+import time
+from unittest.mock import MagicMock
+
+from src.core.model_registry import ModelRegistry
+
+
+class TestModelRegistry:
+    """Tests pour le registre des modèles."""
+
+    def test_same_key_shares_instance(self):
+        registry = ModelRegistry(ceiling_mb=4000)
+        loader = MagicMock(side_effect=lambda: object())
+
+        first = registry.acquire("medium", loader, 2000)
+        second = registry.acquire("medium", loader, 2000)
+
+        assert first is second
+        assert loader.call_count == 1
+        assert registry.refcount("medium") == 2
+
+    def test_lru_eviction_under_ceiling(self):
+        registry = ModelRegistry(ceiling_mb=4000)
+        for key in ("a", "b"):
+            registry.acquire(key, object, 2000)
+            registry.release(key)
+        registry.acquire("a", object, 2000)  # a redevient le plus récent
+        registry.release("a")
+
+        registry.acquire("c", object, 2000)
+
+        assert registry.loaded() == ["a", "c"]
+        assert registry.used_mb == 4000
+
+    def test_borrowed_models_never_evicted(self):
+        registry = ModelRegistry(ceiling_mb=3000)
+        registry.acquire("medium", object, 2000)
+
+        registry.acquire("large-v3-french", object, 2500)
+
+        assert registry.loaded() == ["medium", "large-v3-french"]
+
+    def test_concurrent_acquire_loads_once(self):
+        registry = ModelRegistry(ceiling_mb=4000)
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        models = []
+        threads = [
+            threading.Thread(target=lambda: models.append(registry.acquire("k", slow_loader, 100)))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert len({id(m) for m in models}) == 1
+        assert registry.refcount("k") == 4
+
+    def test_evict_idle(self):
+        registry = ModelRegistry(ceiling_mb=4000)
+        registry.acquire("a", object, 100)
+        registry.acquire("b", object, 100)
+        registry.release("b")
+
+        assert registry.evict_idle() == 1
+        assert registry.loaded() == ["a"]
@@ -0,0 +1,33 @@
+"""
+Tests unitaires pour le module src/core/output_index.py
+"""
+from src.core.output_index import INDEX_FILENAME, OutputIndex, output_key
+
+
+class TestOutputIndex:
+    """Tests pour l'index des sorties."""
+
+    def test_key_depends_on_params(self):
+        assert output_key("abc", {"model": "tiny"}) == output_key("abc", {"model": "tiny"})
+        assert output_key("abc", {"model": "tiny"}) != output_key("abc", {"model": "small"})
+
+    def test_persisted_and_reloaded(self, temp_dir):
+        output = temp_dir / "a.txt"
+        output.write_text("texte", encoding="utf-8")
+        OutputIndex(temp_dir).add("cle", temp_dir / "a.wav", [output])
+
+        assert (temp_dir / INDEX_FILENAME).exists()
+        assert OutputIndex(temp_dir).lookup("cle") == [output]
+
+    def test_missing_output_invalidates_entry(self, temp_dir):
+        output = temp_dir / "a.txt"
+        output.write_text("texte", encoding="utf-8")
+        index = OutputIndex(temp_dir)
+        index.add("cle", temp_dir / "a.wav", [output])
+        output.unlink()
+
+        assert index.lookup("cle") is None
+
+    def test_corrupt_index_ignored(self, temp_dir):
+        (temp_dir / INDEX_FILENAME).write_text("{pas du json", encoding="utf-8")
+        assert OutputIndex(temp_dir).lookup("cle") is None
@@ -0,0 +1,165 @@
+"""
+Tests unitaires pour le module src/core/pcm_cache.py
+"""
+import os
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.core.audio_processor import AudioProcessor, DecodedAudio
+from src.core.pcm_cache import PCMCache, content_hash, full_content_hash
+
+
+class TestContentHash:
+    """Tests pour l'empreinte rapide de contenu."""
+
+    def test_same_content_same_hash(self, temp_dir):
+        """Vérifie que le hash dépend du contenu, pas du nom."""
+        a = temp_dir / "a.wav"
+        b = temp_dir / "copie renommée.wav"
+        a.write_bytes(b"x" * 5000)
+        b.write_bytes(b"x" * 5000)
+
+        assert content_hash(a) == content_hash(b)
+
+    def test_different_content_different_hash(self, temp_dir):
+        """Vérifie que deux contenus différents donnent deux hash."""
+        a = temp_dir / "a.wav"
+        b = temp_dir / "b.wav"
+        a.write_bytes(b"x" * 5000)
+        b.write_bytes(b"y" * 5000)
+
+        assert content_hash(a) != content_hash(b)
+
+    def test_large_file_sampled(self, temp_dir):
+        """Vérifie le hash d'un fichier plus grand que les blocs échantillonnés."""
+        path = temp_dir / "big.bin"
+        path.write_bytes(os.urandom(4 * 1024 * 1024))
+
+        assert len(content_hash(path)) == 32
+
+    def test_full_hash_sees_unsampled_bytes(self, temp_dir):
+        """Vérifie que l'empreinte complète distingue ce que l'échantillonnage ignore."""
+        data = bytearray(os.urandom(8 * 1024 * 1024))
+        a = temp_dir / "a.bin"
+        b = temp_dir / "b.bin"
+        a.write_bytes(bytes(data))
+        data[2 * 1024 * 1024] ^= 0xFF  # Hors des blocs début, milieu, fin
+        b.write_bytes(bytes(data))
+
+        assert content_hash(a) == content_hash(b)
+        assert full_content_hash(a) != full_content_hash(b)
+
+
+class TestPCMCache:
+    """Tests pour la classe PCMCache."""
+
+    @pytest.fixture
+    def cache(self, mock_config, temp_dir):
+        with patch("src.core.pcm_cache.get_config", return_value=mock_config):
+            yield PCMCache(cache_dir=temp_dir / "pcm_cache", max_size_mb=100)
+
+    def test_get_missing(self, cache, sample_audio_file):
+        """Vérifie qu'une entrée absente retourne None."""
+        assert cache.get(sample_audio_file) is None
+
+    def test_get_or_decode_stores_memmap(self, cache, mock_config, sample_audio_file):
+        """Vérifie le décodage au premier accès puis la relecture en memmap."""
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+            first = cache.get_or_decode(sample_audio_file, processor)
+
+            with patch.object(processor, "iter_pcm_chunks") as mock_iter:
+                second = cache.get_or_decode(sample_audio_file, processor)
+                mock_iter.assert_not_called()
+
+        assert isinstance(second, DecodedAudio)
+        assert isinstance(second.pcm, np.memmap)
+        assert second.num_samples == first.num_samples
+        assert second.info["format"] == "wav"
+
+    def test_edit_outside_sampled_blocks_is_a_miss(self, cache, mock_config, sample_audio_file):
+        """Vérifie qu'un fichier modifié sans changer de clé est redécodé."""
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+            cache.get_or_decode(sample_audio_file, processor)
+
+            with patch("src.core.pcm_cache.content_hash", return_value=content_hash(sample_audio_file)):
+                data = bytearray(sample_audio_file.read_bytes())
+                data[-1] ^= 0xFF
+                sample_audio_file.write_bytes(bytes(data))
+
+                assert cache.get(sample_audio_file) is None
+                with patch.object(processor, "iter_pcm_chunks", wraps=processor.iter_pcm_chunks) as mock_iter:
+                    cache.get_or_decode(sample_audio_file, processor)
+                    mock_iter.assert_called_once()
+
+    def test_renamed_copy_confirmed_by_full_hash(self, cache, mock_config, sample_audio_file, temp_dir):
+        copy = temp_dir / "copie.wav"
+        copy.write_bytes(sample_audio_file.read_bytes())
+
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+            cache.get_or_decode(sample_audio_file, processor)
+
+            with patch("src.core.pcm_cache.full_content_hash", wraps=full_content_hash) as mock_full:
+                assert cache.get(copy) is not None
+                assert cache.get(copy) is not None
+                mock_full.assert_called_once()  # Seconde lecture: taille et date suffisent
+
+    def test_evict_lru(self, temp_dir):
+        """Vérifie que les entrées les moins récemment utilisées partent en premier."""
+        cache = PCMCache(cache_dir=temp_dir / "pcm_cache", max_size_mb=1)
+        cache.cache_dir.mkdir(parents=True)
+
+        now = time.time()
+        for i, key in enumerate(["old", "mid", "new"]):
+            pcm_path = cache.cache_dir / f"{key}.pcm"
+            pcm_path.write_bytes(b"\0" * (600 * 1024))
+            (cache.cache_dir / f"{key}.json").write_text("{}")
+            os.utime(pcm_path, (now + i, now + i))
+
+        removed = cache.evict()
+
+        assert removed == 2
+        assert not (cache.cache_dir / "old.pcm").exists()
+        assert not (cache.cache_dir / "mid.json").exists()
+        assert (cache.cache_dir / "new.pcm").exists()
+
+    def test_evict_keeps_protected_keys(self, temp_dir):
+        """Vérifie qu'une entrée protégée n'est pas évincée."""
+        cache = PCMCache(cache_dir=temp_dir / "pcm_cache", max_size_mb=0)
+        cache.cache_dir.mkdir(parents=True)
+        (cache.cache_dir / "current.pcm").write_bytes(b"\0" * 1024)
+
+        assert cache.evict(keep={"current"}) == 0
+        assert (cache.cache_dir / "current.pcm").exists()
+
+
+class TestDecodeWithCache:
+    """Tests de l'intégration du cache dans AudioProcessor.decode."""
+
+    def test_decode_uses_cache(self, mock_config, sample_audio_file):
+        """Vérifie qu'un second décodage relit le cache."""
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            processor = AudioProcessor()
+            processor.decode(sample_audio_file)
+
+            with patch.object(processor, "iter_pcm_chunks") as mock_iter:
+                audio = processor.decode(sample_audio_file)
+                mock_iter.assert_not_called()
+
+        assert isinstance(audio.pcm, np.memmap)
+        assert (mock_config.paths.temp / "pcm_cache").exists()
+
+    def test_decode_without_cache(self, mock_config, sample_audio_file):
+        """Vérifie le décodage en mémoire si le cache est désactivé."""
+        mock_config.performance.pcm_cache_max_mb = 0
+
+        with patch("src.core.audio_processor.get_config", return_value=mock_config):
+            audio = AudioProcessor().decode(sample_audio_file)
+
+        assert not isinstance(audio.pcm, np.memmap)
+        assert not (mock_config.paths.temp / "pcm_cache").exists()
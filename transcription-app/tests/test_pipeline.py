@@ -0,0 +1,149 @@
+"""
+Tests unitaires pour le module src/core/pipeline.py
+"""
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.diarizer import DiarizationResult
+from src.core.pipeline import (
+    concurrent_thread_split,
+    run_transcription_and_diarization,
+    split_cpu_threads,
+    use_concurrent_pipeline,
+)
+from src.core.transcriber import TranscriptionResult
+
+
+def _config(cpu_threads=0, concurrent=True):
+    config = MagicMock()
+    config.transcription.cpu_threads = cpu_threads
+    config.performance.concurrent_diarization = concurrent
+    return config
+
+
+class TestSplitCpuThreads:
+    """Tests pour la répartition des threads CPU."""
+
+    @pytest.mark.parametrize("total,expected", [
+        (1, (1, 1)),
+        (4, (3, 1)),
+        (8, (6, 2)),
+        (12, (8, 4)),
+    ])
+    def test_split(self, total, expected):
+        """Vérifie que la transcription garde la plus grosse part."""
+        assert split_cpu_threads(total) == expected
+
+    def test_uses_configured_threads(self):
+        """Vérifie que le budget par défaut vient de la configuration."""
+        with patch("src.core.pipeline.get_config", return_value=_config(cpu_threads=6)):
+            assert split_cpu_threads() == (4, 2)
+
+
+class TestUseConcurrentPipeline:
+    """Tests pour l'activation du mode concurrent."""
+
+    def test_enabled_with_enough_threads(self):
+        with patch("src.core.pipeline.get_config", return_value=_config(cpu_threads=8)):
+            assert use_concurrent_pipeline() is True
+
+    def test_disabled_on_small_machines(self):
+        with patch("src.core.pipeline.get_config", return_value=_config(cpu_threads=2)):
+            assert use_concurrent_pipeline() is False
+
+    def test_disabled_by_config(self):
+        with patch("src.core.pipeline.get_config", return_value=_config(8, concurrent=False)):
+            assert use_concurrent_pipeline() is False
+
+
+class TestConcurrentThreadSplit:
+    """Tests pour la répartition selon le modèle Whisper déjà chargé."""
+
+    def test_split_when_model_not_loaded(self):
+        transcriber = MagicMock(loaded_cpu_threads=None)
+        with patch("src.core.pipeline.get_config", return_value=_config(cpu_threads=6)):
+            assert concurrent_thread_split(transcriber) == (4, 2)
+
+    def test_split_when_model_loaded_with_asr_share(self):
+        transcriber = MagicMock(loaded_cpu_threads=4)
+        with patch("src.core.pipeline.get_config", return_value=_config(cpu_threads=6)):
+            assert concurrent_thread_split(transcriber) == (4, 2)
+
+    def test_sequential_when_model_keeps_all_threads(self):
+        """Un modèle chargé avec tous les threads ne peut plus être restreint."""
+        transcriber = MagicMock(loaded_cpu_threads=6)
+        with patch("src.core.pipeline.get_config", return_value=_config(cpu_threads=6)):
+            assert concurrent_thread_split(transcriber) is None
+
+
+class TestRunTranscriptionAndDiarization:
+    """Tests pour l'exécution des deux étapes."""
+
+    def _results(self):
+        return (
+            TranscriptionResult(segments=[], language="fr", language_probability=1.0, duration=0.0),
+            DiarizationResult(segments=[], num_speakers=0),
+        )
+
+    def test_sequential(self):
+        transcription, diarization = self._results()
+        order = []
+
+        def transcribe():
+            order.append("transcription")
+            return transcription
+
+        def diarize():
+            order.append("diarization")
+            return diarization
+
+        result = run_transcription_and_diarization(transcribe, diarize, concurrent=False)
+
+        assert result == (transcription, diarization)
+        assert order == ["transcription", "diarization"]
+
+    def test_concurrent_stages_overlap(self):
+        """Vérifie que les deux étapes tournent réellement en même temps."""
+        transcription, diarization = self._results()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def transcribe():
+            barrier.wait()
+            return transcription
+
+        def diarize():
+            barrier.wait()
+            return diarization
+
+        result = run_transcription_and_diarization(transcribe, diarize, concurrent=True)
+
+        assert result == (transcription, diarization)
+
+    def test_concurrent_diarization_error_propagates(self):
+        transcription, _ = self._results()
+
+        def diarize():
+            raise RuntimeError("sortformer")
+
+        with pytest.raises(RuntimeError, match="sortformer"):
+            run_transcription_and_diarization(lambda: transcription, diarize, concurrent=True)
+
+    def test_concurrent_waits_for_diarization_on_transcription_error(self):
+        """Vérifie qu'une erreur de transcription n'abandonne pas le thread de diarization."""
+        _, diarization = self._results()
+        finished = threading.Event()
+
+        def transcribe():
+            raise ValueError("whisper")
+
+        def diarize():
+            finished.wait(0.1)
+            finished.set()
+            return diarization
+
+        with pytest.raises(ValueError, match="whisper"):
+            run_transcription_and_diarization(transcribe, diarize, concurrent=True)
+
+        assert finished.is_set()
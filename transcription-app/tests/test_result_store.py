@@ -0,0 +1,42 @@
+"""
+Tests unitaires pour le module src/core/result_store.py
+"""
+import os
+import time
+
+from src.core.result_store import STALE_SECONDS, ResultStore
+from src.core.transcriber import TranscriptionResult, TranscriptionSegment
+
+
+def _result(text: str) -> TranscriptionResult:
+    return TranscriptionResult(
+        segments=[TranscriptionSegment(
+            start=0.0, end=1.5, text=text, speaker="SPEAKER_0",
+            words=[{"word": text, "start": 0.0, "end": 1.5, "probability": 0.9}],
+        )],
+        language="fr",
+        language_probability=0.98,
+        duration=1.5,
+    )
+
+
+class TestResultStore:
+    """Tests pour le stockage des résultats de batch."""
+
+    def test_round_trip(self, temp_dir):
+        store = ResultStore(temp_dir)
+        refs = [store.append(_result(text)) for text in ("été", "deux", "trois")]
+        store.close()
+
+        assert refs[0].load() == _result("été")
+        assert refs[2].load().segments[0].words[0]["word"] == "trois"
+
+    def test_stale_files_pruned(self, temp_dir):
+        stale = temp_dir / "batch-ancien.jsonl"
+        stale.write_text("{}\n", encoding="utf-8")
+        old = time.time() - STALE_SECONDS - 60
+        os.utime(stale, (old, old))
+
+        ResultStore(temp_dir).close()
+
+        assert not stale.exists()
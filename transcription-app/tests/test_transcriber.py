@@ -1,6 +1,7 @@
 """
 Tests unitaires pour le module src/core/transcriber.py
 """
+import numpy as np
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -223,6 +224,21 @@ class TestTranscriber:
         mock_whisper_class.assert_called_once()
         assert transcriber.model is not None
 
+    @patch("src.core.transcriber.WhisperModel")
+    def test_transcribers_share_registry_model(self, mock_whisper_class, mock_transcriber_deps, model_registry, temp_dir):
+        """Vérifie que deux Transcriber de même configuration partagent le modèle."""
+        mock_config, mock_mm = mock_transcriber_deps
+        mock_mm.download_whisper_model.return_value = temp_dir
+        first, second = Transcriber(), Transcriber()
+        first.load_model()
+        second.load_model()
+
+        assert first.model is second.model
+        assert mock_whisper_class.call_count == 1
+
+        first.unload_model()
+        assert model_registry.refcount(second._model_key) == 1
+
     @patch("src.core.transcriber.WhisperModel")
     def test_load_model_already_loaded(self, mock_whisper_class, mock_transcriber_deps):
         """Vérifie qu'on ne recharge pas un modèle déjà chargé."""
@@ -255,6 +271,25 @@ class TestTranscriber:
         # Ne doit pas lever d'erreur
         transcriber.unload_model()
 
+    def test_model_kept_while_in_use(self, mock_transcriber_deps):
+        """Vérifie qu'un autre demandeur ne peut ni changer ni décharger un modèle utilisé."""
+        from src.core.exceptions import ModelInUseError
+
+        transcriber = Transcriber()
+        transcriber.model = MagicMock()
+
+        with transcriber.in_use():
+            assert transcriber.busy
+            transcriber.unload_model()
+            assert transcriber.model is not None
+            with pytest.raises(ModelInUseError):
+                transcriber.switch_model("small")
+
+        assert not transcriber.busy
+        transcriber.switch_model("small")
+        assert transcriber.model is None
+        assert transcriber.model_name == "small"
+
     @patch("src.core.transcriber.WhisperModel")
     def test_transcribe(
         self, mock_whisper_class, mock_transcriber_deps, mock_whisper_model, sample_audio_file
@@ -357,3 +392,182 @@ class TestTranscriber:
 
         assert len(segments) == 1
         assert isinstance(segments[0], TranscriptionSegment)
+
+    def test_transcribe_decoded_audio(self, mock_transcriber_deps, mock_whisper_model):
+        """Vérifie qu'un DecodedAudio est passé tel quel (buffer numpy) au modèle."""
+        from src.core.audio_processor import DecodedAudio
+
+        transcriber = Transcriber()
+        transcriber.model = mock_whisper_model
+        audio = DecodedAudio(path=Path("meeting.m4a"), pcm=np.zeros(16000, dtype=np.int16))
+
+        result = transcriber.transcribe(audio)
+
+        audio_arg = mock_whisper_model.transcribe.call_args[0][0]
+        assert isinstance(audio_arg, np.ndarray)
+        assert audio_arg.dtype == np.float32
+        assert len(result.segments) == 1
+
+    def test_cancel_stops_decoding_and_returns_partial(
+        self, mock_transcriber_deps, mock_whisper_model, sample_audio_file
+    ):
+        """Vérifie que l'annulation arrête le générateur et conserve les segments produits."""
+        from src.core.cancellation import CancellationToken
+
+        template = mock_whisper_model.transcribe.return_value[0].__next__()
+        info = mock_whisper_model.transcribe.return_value[1]
+        decoded = []
+
+        def windows():
+            for i in range(5):
+                decoded.append(i)
+                yield template
+
+        mock_whisper_model.transcribe.return_value = (windows(), info)
+        token = CancellationToken()
+
+        transcriber = Transcriber()
+        transcriber.model = mock_whisper_model
+        result = transcriber.transcribe(
+            sample_audio_file,
+            progress_callback=lambda idx, text: token.cancel() if idx == 1 else None,
+            cancel_token=token,
+        )
+
+        assert len(result.segments) == 2
+        assert result.is_partial is True
+        assert decoded == [0, 1]
+
+    def test_transcribe_stream_stops_on_cancel(
+        self, mock_transcriber_deps, mock_whisper_model, sample_audio_file
+    ):
+        from src.core.cancellation import CancellationToken
+
+        template = mock_whisper_model.transcribe.return_value[0].__next__()
+        info = mock_whisper_model.transcribe.return_value[1]
+        mock_whisper_model.transcribe.return_value = (iter([template] * 5), info)
+        token = CancellationToken()
+
+        transcriber = Transcriber()
+        transcriber.model = mock_whisper_model
+        stream = transcriber.transcribe_stream(sample_audio_file, cancel_token=token)
+        next(stream)
+        token.cancel()
+
+        assert list(stream) == []
+
+    def test_chunk_worker_stops_on_shared_event(self, mock_whisper_model):
+        """Vérifie qu'un processus du pool de chunks suit l'annulation du parent."""
+        import multiprocessing
+
+        from src.core import transcriber as transcriber_module
+
+        template = mock_whisper_model.transcribe.return_value[0].__next__()
+        info = mock_whisper_model.transcribe.return_value[1]
+        event = multiprocessing.get_context("spawn").Event()
+
+        def windows():
+            event.set()  # Le parent annule pendant la première fenêtre
+            yield from [template] * 5
+
+        mock_whisper_model.transcribe.return_value = (windows(), info)
+        payload = np.zeros(16000, dtype=np.int16)
+        with patch.object(transcriber_module, "WhisperModel", return_value=mock_whisper_model):
+            transcriber_module._init_chunk_worker("model", "int8", 1, event)
+            segments, _, _ = transcriber_module._transcribe_chunk(payload, {})
+            # Chunk pas encore démarré: abandonné sans décodage
+            assert transcriber_module._transcribe_chunk(payload, {}) is None
+
+        assert len(segments) == 1
+
+    def test_long_file_uses_parallel_mode(self, mock_transcriber_deps):
+        """Vérifie le passage en mode chunks parallèles pour un fichier long."""
+        from src.core.audio_processor import DecodedAudio
+
+        mock_config, mock_mm = mock_transcriber_deps
+        mock_config.transcription.parallel_workers = 4
+        mock_config.performance.chunk_size_minutes = 1
+
+        transcriber = Transcriber()
+        long_audio = DecodedAudio(path=Path("long.wav"), pcm=np.zeros(16000 * 180, dtype=np.int16))
+        short_audio = DecodedAudio(path=Path("short.wav"), pcm=np.zeros(16000 * 60, dtype=np.int16))
+
+        assert transcriber._use_parallel(long_audio) is True
+        assert transcriber._use_parallel(short_audio) is False
+        assert transcriber._use_parallel(Path("long.wav")) is False
+
+        with patch.object(transcriber, "_transcribe_parallel") as mock_parallel:
+            transcriber.transcribe(long_audio, language="fr")
+            mock_parallel.assert_called_once_with(long_audio, "fr", None, None)
+
+    @patch("src.core.transcriber.BatchedInferencePipeline")
+    def test_parallel_chunks_share_detected_language(
+        self, mock_pipeline_class, mock_transcriber_deps, mock_whisper_model,
+    ):
+        """Vérifie que la langue est détectée une fois et imposée à chaque chunk, en mode batched."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.core.audio_processor import DecodedAudio
+
+        mock_config, mock_mm = mock_transcriber_deps
+        mock_config.transcription.parallel_workers = 2
+        mock_config.transcription.language = "auto"
+        mock_config.transcription.mode = "batched"
+        mock_config.performance.chunk_size_minutes = 1
+        mock_pipeline = mock_pipeline_class.return_value
+        template = mock_whisper_model.transcribe.return_value[0].__next__()
+        info = mock_whisper_model.transcribe.return_value[1]
+        mock_pipeline.transcribe.side_effect = lambda *args, **kwargs: (iter([template]), info)
+        mock_whisper_model.detect_language.return_value = ("de", 0.7, [])
+
+        def pool(max_workers, mp_context, initializer, initargs):
+            return ThreadPoolExecutor(max_workers, initializer=initializer, initargs=initargs)
+
+        transcriber = Transcriber()
+        audio = DecodedAudio(path=Path("long.wav"), pcm=np.zeros(16000 * 180, dtype=np.int16))
+        with patch("src.core.transcriber.WhisperModel", return_value=mock_whisper_model), \
+                patch("concurrent.futures.ProcessPoolExecutor", side_effect=pool):
+            result = transcriber.transcribe(audio)
+
+        mock_whisper_model.detect_language.assert_called_once()
+        assert len(mock_whisper_model.detect_language.call_args.args[0]) == 16000 * 30
+        calls = mock_pipeline.transcribe.call_args_list
+        assert len(calls) > 1
+        assert {c.kwargs["language"] for c in calls} == {"de"}
+        assert {c.kwargs["batch_size"] for c in calls} == {mock_config.transcription.batch_size}
+        mock_whisper_model.transcribe.assert_not_called()
+        assert result.language_probability == 0.7
+
+    @patch("src.core.transcriber.BatchedInferencePipeline")
+    def test_transcribe_batched_mode(
+        self, mock_pipeline_class, mock_transcriber_deps, mock_whisper_model, sample_audio_file
+    ):
+        """Vérifie que le mode batched passe par BatchedInferencePipeline."""
+        mock_config, mock_mm = mock_transcriber_deps
+        mock_config.transcription.mode = "batched"
+        mock_config.transcription.batch_size = 16
+        mock_pipeline = mock_pipeline_class.return_value
+        mock_pipeline.transcribe.return_value = mock_whisper_model.transcribe.return_value
+
+        transcriber = Transcriber()
+        transcriber.model = mock_whisper_model
+
+        result = transcriber.transcribe(sample_audio_file)
+
+        mock_pipeline_class.assert_called_once_with(model=mock_whisper_model)
+        assert mock_pipeline.transcribe.call_args[1]["batch_size"] == 16
+        mock_whisper_model.transcribe.assert_not_called()
+        assert len(result.segments) == 1
+
+    @patch("src.core.transcriber.BatchedInferencePipeline")
+    def test_transcribe_sequential_mode(
+        self, mock_pipeline_class, mock_transcriber_deps, mock_whisper_model, sample_audio_file
+    ):
+        """Vérifie que le mode séquentiel (défaut) n'utilise pas le pipeline batched."""
+        transcriber = Transcriber()
+        transcriber.model = mock_whisper_model
+
+        transcriber.transcribe(sample_audio_file)
+
+        mock_pipeline_class.assert_not_called()
+        mock_whisper_model.transcribe.assert_called_once()